@@ -1,36 +1,539 @@
 #!/usr/bin/env python3
 
 import argparse
+import copy
+import functools
 import importlib
+import inspect
 from pathlib import Path
+import re
 import sys
+import time
+from types import ModuleType
+from typing import Any, Callable, NamedTuple
 
+from common import checkpoint, counters, engines, memo
+from runner import cache, limits, memory, metrics, profiling
+from runner.memory import MemoryStats
 
-def run_puzzle(day: int, input_path: Path, part1: bool, **kwargs) -> int | str:
-    day_module = importlib.import_module(f"day{day:02}.day{day:02}")
-    data = day_module.load(input_path)
-    if part1:
-        return day_module.part1(data, **kwargs)
+TOP_DIR = Path(__file__).resolve().parent
+
+# Subcommands, and the module implementing each. Each module provides a main(argv) function.
+COMMANDS = {
+    "bench": "runner.bench",
+    "compare": "runner.history",
+    "cache": "runner.cache",
+    "gen": "runner.gen",
+    "scale": "runner.scale",
+    "serve": "runner.serve",
+    "client": "runner.client",
+    "watch": "runner.watch",
+}
+
+
+class Budget(NamedTuple):
+    """Limits on the resources a puzzle case may use, each None if unlimited."""
+    # Wall-clock time to load the input and solve the part, in seconds.
+    time: float | None
+    # Peak traced memory of loading the input or of solving the part, in bytes (see runner/memory.py).
+    memory: int | None
+
+
+class PuzzleCase(NamedTuple):
+    """A puzzle part to solve with a specific input file and extra arguments, its expected answer if known, and its
+    performance budget if it has one."""
+    day: int
+    input_path: Path
+    part1: bool
+    answer: int | str | None
+    extra_args: dict[str, int | str]
+    budget: Budget | None = None
+
+    @property
+    def part(self) -> int:
+        return 1 if self.part1 else 2
+
+    @property
+    def name(self) -> str:
+        input_name = "main" if self.input_path.name == "input" else self.input_path.name
+        return f"day{self.day:02} part{self.part}: {input_name}" + \
+            (" " + str(self.extra_args) if self.extra_args else "")
+
+
+class PhaseStats(NamedTuple):
+    """Measurements of one phase of a puzzle run: the wall-clock time and process CPU time it took in seconds, the
+    peak memory it used if memory measurement is enabled (see runner/memory.py), and the counts the solution added
+    during it if counting is enabled (see common/counters.py)."""
+    wall: float
+    cpu: float
+    memory: MemoryStats | None = None
+    counters: dict[str, int] | None = None
+
+
+class PuzzleTimings(NamedTuple):
+    """Measurements of each phase of a puzzle run."""
+    load: PhaseStats
+    solve: PhaseStats
+
+
+class BothPartsTimings(NamedTuple):
+    """Measurements of loading the input once, then solving each part from it."""
+    load: PhaseStats
+    part1: PhaseStats
+    part2: PhaseStats
+
+
+def puzzle_days() -> list[int]:
+    """Return the days for which a dayNN solution directory exists, in ascending order."""
+    day_regex = re.compile(r"day(\d{2})")
+    return [int(day_match.group(1)) for p in sorted(TOP_DIR.iterdir()) if (day_match := day_regex.fullmatch(p.name))]
+
+
+def day_input_path(day: int, input_name: str = "input") -> Path:
+    """Path of the named input file in the data directory for the given day."""
+    return TOP_DIR / f"day{day:02}" / "data" / input_name
+
+
+def try_convert_int(s: str) -> int | str:
+    """If s contains only digits, return the integer it represents, otherwise just return s."""
+    if s.isdigit():
+        return int(s)
+    return s
+
+
+def read_case_file(path: Path) -> list[tuple[dict[str, int | str], str]]:
+    """Read an answer or budget file, returning (extra_args, value) for each line. Each line is either a value for the
+    default arguments, or of the form "arg_name=value,arg_name=value: value"."""
+    result = []
+    with open(path) as f:
+        for line in f.readlines():
+            line = line.strip()
+            if ": " in line:
+                extra_args = {extra_arg.split("=")[0]: try_convert_int(extra_arg.split("=")[1])
+                              for extra_arg in line.split(": ")[0].split(",")}
+                value = line.split(": ")[1]
+            else:
+                extra_args = {}
+                value = line
+            result.append((extra_args, value))
+    return result
+
+
+def parse_budget(text: str) -> Budget:
+    """Parse a budget of the form "time=SECONDS,memory=MIB", where either limit may be left out."""
+    values = dict(item.split("=") for item in text.split(","))
+    if not values.keys() <= {"time", "memory"}:
+        raise ValueError(f"Unknown limit in budget '{text}'.")
+    return Budget(float(values["time"]) if "time" in values else None,
+                  int(float(values["memory"]) * memory.MIB) if "memory" in values else None)
+
+
+def find_cases(days: list[int] | None = None, require_answers: bool = True) -> list[PuzzleCase]:
+    """Find the puzzle cases given by the sample and main input files in each day's data directory, and their
+    answer and budget files (see README.md).
+    If require_answers is False, parts of the main input that have no answer file are also included, with an answer of
+    None."""
+    sample_regex = re.compile(r"sample\d+")
+
+    # Dictionary from case name to case.
+    cases: dict[str, PuzzleCase] = {}
+
+    for day in days if days is not None else puzzle_days():
+        data_dir = TOP_DIR / f"day{day:02}" / "data"
+
+        test_inputs = sorted([p for p in data_dir.iterdir() if sample_regex.fullmatch(p.name)]) + \
+            [data_dir / "input"]
+        for test_input in test_inputs:
+            for part in [1, 2]:
+                answer_file = test_input.parent / f"{test_input.name}.answer{part}"
+                budget_file = test_input.parent / f"{test_input.name}.budget{part}"
+                # Budgets, keyed by their extra arguments.
+                budgets = {tuple(sorted(extra_args.items())): parse_budget(budget)
+                           for extra_args, budget in read_case_file(budget_file)} if budget_file.exists() else {}
+                if answer_file.exists():
+                    for extra_args, answer in read_case_file(answer_file):
+                        case = PuzzleCase(day, test_input, part == 1, try_convert_int(answer), extra_args,
+                                          budgets.get(tuple(sorted(extra_args.items()))))
+                        cases[case.name] = case
+                elif not require_answers and test_input.name == "input" and test_input.exists():
+                    case = PuzzleCase(day, test_input, part == 1, None, {}, budgets.get(()))
+                    cases[case.name] = case
+
+    return list(cases.values())
+
+
+def import_day(day: int) -> ModuleType:
+    return importlib.import_module(f"day{day:02}.day{day:02}")
+
+
+def part_function(day_module: ModuleType, part1: bool) -> Callable[..., int | str]:
+    """The implementation of a part to solve it with: the selected engine if it has one (see common/engines.py),
+    otherwise the day's part1 or part2 function."""
+    return engines.implementations(day_module, part1)[engines.selected(day_module, part1)]
+
+
+def accepted_kwargs(function: Callable, kwargs: dict[str, int | str]) -> dict[str, int | str]:
+    """Return the subset of kwargs that are parameters of function."""
+    parameters = inspect.signature(function).parameters
+    return {k: v for k, v in kwargs.items() if k in parameters}
+
+
+def own_input(day_module: ModuleType, data: Any) -> Any:
+    """Parsed input data to give a solve that shares it with other solves: a copy if the day module sets
+    MUTATES_INPUT = True to declare that its solutions modify their input, otherwise data itself."""
+    return copy.deepcopy(data) if getattr(day_module, "MUTATES_INPUT", False) else data
+
+
+def load_input(day: int, day_module: ModuleType, input_path: Path) -> Any:
+    """Parse the input file using the day's load function. If the in-memory or on-disk input cache is enabled (see
+    runner/cache.py), reuse the parsed input stored by an earlier run instead, if there is one.
+    Parsed inputs in the in-memory cache are shared between runs, unless the day module sets MUTATES_INPUT = True to
+    declare that its solutions modify their input, in which case each run is given a copy."""
+    memory_cache = cache.memory_input_cache()
+    if memory_cache is not None:
+        memory_key = cache.memory_input_key(day, input_path)
+        hit, data = memory_cache.get(memory_key)
+        if hit:
+            # A solution that modifies its input data must be given its own copy.
+            return own_input(day_module, data)
+
+    input_cache = cache.from_environment(cache.INPUT_CACHE_ENV_VAR)
+    if input_cache is None:
+        data = day_module.load(input_path)
+    else:
+        key = cache.input_key(day, input_path)
+        hit, data = cache.get_input(input_cache, key)
+        if not hit:
+            data = day_module.load(input_path)
+            cache.put_input(input_cache, key, data)
+
+    if memory_cache is not None:
+        memory_cache.put(memory_key, own_input(day_module, data))
+    return data
+
+
+def run_phase(label: str, function: Callable, *args, **kwargs) -> tuple[Any, PhaseStats]:
+    """Call function as one phase of a puzzle run, under any instrumentation that is enabled, and return its result
+    and measurements of the call.
+    label identifies the phase in instrumentation output, e.g. day16_input_part2."""
+    if (profile_dir := profiling.output_dir()) is not None:
+        function = functools.partial(profiling.run_profiled, profile_dir / f"{label}.prof", function)
+    if (sample_dir := profiling.sample_output_dir()) is not None:
+        function = functools.partial(profiling.run_sampled, sample_dir / f"{label}.folded", function)
+
+    memory_stats = None
+    counting = counters.enabled()
+    if counting:
+        # Discard counts added outside any phase.
+        counters.take()
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+    if memory.enabled():
+        result, memory_stats = memory.run_measured(function, *args, **kwargs)
     else:
-        return day_module.part2(data, **kwargs)
+        result = function(*args, **kwargs)
+    stats = PhaseStats(time.perf_counter() - start, time.process_time() - start_cpu, memory_stats,
+                       counters.take() if counting else None)
+
+    if memory_stats is not None:
+        memory.check_budget(label, memory_stats)
+    return result, stats
+
+
+def phase_label(day: int, input_path: Path, phase: str, kwargs: dict[str, int | str] | None = None) -> str:
+    return f"day{day:02}_{input_path.name}_{phase}" + "".join(f"_{k}={v}" for k, v in (kwargs or {}).items())
+
+
+def checkpoint_path(day: int, day_module: ModuleType, input_path: Path, part1: bool,
+                    kwargs: dict[str, int | str]) -> Path | None:
+    """Checkpoint file for solving a part (see common/checkpoint.py), or None if checkpointing isn't enabled."""
+    directory = checkpoint.directory()
+    if directory is None:
+        return None
+    key = cache.checkpoint_key(day, input_path, part1, kwargs, engines.selected(day_module, part1))
+    return directory / f"{phase_label(day, input_path, 'part1' if part1 else 'part2')}_{key[:16]}.checkpoint"
+
+
+def verify_engines(label: str, day_module: ModuleType, part1: bool, data: Any, answer: int | str,
+                   **kwargs) -> None:
+    """If engine verification is enabled, solve the part from the same parsed data with every implementation other than
+    the one that found answer, and raise EngineMismatch if any gives a different answer.
+    data must not have been modified by the solve that found answer (see own_input)."""
+    if not engines.verify_enabled():
+        return
+    used = engines.selected(day_module, part1)
+    for name, function in engines.implementations(day_module, part1).items():
+        if name != used and (other_answer := function(own_input(day_module, data), **kwargs)) != answer:
+            raise engines.EngineMismatch(label, used, answer, name, other_answer)
+
+
+def run_puzzle_timed(day: int, input_path: Path, part1: bool, **kwargs) -> tuple[int | str, PuzzleTimings]:
+    """As run_puzzle, but also return measurements of loading the input and of solving the puzzle part.
+    If limits are enabled (see runner/limits.py), the puzzle is run in a child process within them."""
+    # Imported before any child process is started, so the child inherits the module instead of importing it within
+    # its time limit.
+    day_module = import_day(day)
+    if limits.enabled():
+        return limits.run_limited(phase_label(day, input_path, "part1" if part1 else "part2", kwargs),
+                                  run_puzzle_timed, day, input_path, part1, **kwargs)
+    label = phase_label(day, input_path, "part1" if part1 else "part2", kwargs)
+    data, load_stats = run_phase(phase_label(day, input_path, "load"), load_input, day, day_module, input_path)
+    with checkpoint.session(checkpoint_path(day, day_module, input_path, part1, kwargs)):
+        # Verifying engines afterwards needs the data unmodified.
+        result, solve_stats = run_phase(label, part_function(day_module, part1),
+                                        own_input(day_module, data) if engines.verify_enabled() else data, **kwargs)
+    verify_engines(label, day_module, part1, data, result, **kwargs)
+    metrics.emit(day, 1 if part1 else 2, input_path, kwargs, result, {"load": load_stats, "solve": solve_stats})
+    return result, PuzzleTimings(load_stats, solve_stats)
+
+
+def run_puzzle_both_timed(day: int, input_path: Path,
+                          **kwargs) -> tuple[tuple[int | str, int | str], BothPartsTimings]:
+    """Load the input once, then solve both parts from the same parsed data. Each extra argument is only passed to
+    the parts that accept it.
+    If the day's solutions modify their input data (MUTATES_INPUT), each solve is given its own copy, made outside the
+    timed phases."""
+    day_module = import_day(day)
+    if limits.enabled():
+        return limits.run_limited(phase_label(day, input_path, "both", kwargs), run_puzzle_both_timed, day, input_path,
+                                  **kwargs)
+    kwargs1 = accepted_kwargs(day_module.part1, kwargs)
+    kwargs2 = accepted_kwargs(day_module.part2, kwargs)
+    label1 = phase_label(day, input_path, "part1", kwargs1)
+    label2 = phase_label(day, input_path, "part2", kwargs2)
+    data, load_stats = run_phase(phase_label(day, input_path, "load"), load_input, day, day_module, input_path)
+    with checkpoint.session(checkpoint_path(day, day_module, input_path, True, kwargs1)):
+        result1, part1_stats = run_phase(label1, part_function(day_module, True), own_input(day_module, data),
+                                         **kwargs1)
+    verify_engines(label1, day_module, True, data, result1, **kwargs1)
+    with checkpoint.session(checkpoint_path(day, day_module, input_path, False, kwargs2)):
+        result2, part2_stats = run_phase(label2, part_function(day_module, False),
+                                         own_input(day_module, data) if engines.verify_enabled() else data, **kwargs2)
+    verify_engines(label2, day_module, False, data, result2, **kwargs2)
+    # The shared load phase is only reported with part 1.
+    metrics.emit(day, 1, input_path, kwargs1, result1, {"load": load_stats, "solve": part1_stats})
+    metrics.emit(day, 2, input_path, kwargs2, result2, {"solve": part2_stats})
+    return (result1, result2), BothPartsTimings(load_stats, part1_stats, part2_stats)
+
+
+def run_puzzle_both(day: int, input_path: Path, **kwargs) -> tuple[int | str, int | str]:
+    return run_puzzle_both_timed(day, input_path, **kwargs)[0]
+
+
+def run_puzzle_cached(day: int, input_path: Path, part1: bool,
+                      **kwargs) -> tuple[int | str, PuzzleTimings | None]:
+    """As run_puzzle_timed, but if the answer cache is enabled (see runner/cache.py), return the stored answer when
+    there is one, with timings of None. The answer cache isn't used while engines are being verified, as verifying
+    needs every engine to run."""
+    answer_cache = cache.from_environment()
+    if answer_cache is None or engines.verify_enabled():
+        return run_puzzle_timed(day, input_path, part1, **kwargs)
+    key = cache.answer_key(day, input_path, part1, kwargs, engines.selected(import_day(day), part1))
+    hit, answer = cache.get_answer(answer_cache, key)
+    if hit:
+        return answer, None
+    answer, timings = run_puzzle_timed(day, input_path, part1, **kwargs)
+    cache.put_answer(answer_cache, key, answer)
+    return answer, timings
+
+
+def over_budget(budget: Budget, timings: PuzzleTimings) -> list[str]:
+    """Describe each way in which a puzzle run's measurements exceed its budget. Memory can only be checked if it was
+    measured."""
+    problems = []
+    total = timings.load.wall + timings.solve.wall
+    if budget.time is not None and total > budget.time:
+        problems.append(f"took {total:.3f} s (load {timings.load.wall:.3f} s, solve {timings.solve.wall:.3f} s), "
+                        f"over its budget of {budget.time:g} s")
+    if budget.memory is not None and timings.load.memory is not None and timings.solve.memory is not None:
+        peak = max(timings.load.memory.traced_peak, timings.solve.memory.traced_peak)
+        if peak > budget.memory:
+            problems.append(f"used {peak / memory.MIB:.1f} MiB (load {timings.load.memory}; solve "
+                            f"{timings.solve.memory}), over its budget of {budget.memory / memory.MIB:g} MiB")
+    return problems
+
+
+def run_puzzle_budgeted(day: int, input_path: Path, part1: bool, budget: Budget,
+                        **kwargs) -> tuple[int | str, list[str]]:
+    """As run_puzzle, but also return the ways in which the run exceeded the budget (see over_budget).
+    If the budget limits memory and memory measurement isn't enabled, the puzzle is run a second time to measure its
+    memory, as memory measurement would slow down the timed run. If the answer cache is enabled and holds the answer,
+    the puzzle isn't run, so nothing is reported as over budget.
+    The input is always parsed afresh rather than taken from the in-memory input cache, so loading it is measured."""
+    with cache.memory_inputs_suspended():
+        answer, timings = run_puzzle_cached(day, input_path, part1, **kwargs)
+        if timings is None:
+            return answer, []
+        problems = over_budget(budget, timings)
+        if budget.memory is not None and not memory.enabled():
+            memory.enable()
+            try:
+                problems += over_budget(budget._replace(time=None),
+                                        run_puzzle_timed(day, input_path, part1, **kwargs)[1])
+            finally:
+                memory.disable()
+    return answer, problems
+
+
+def run_puzzle(day: int, input_path: Path, part1: bool, **kwargs) -> int | str:
+    return run_puzzle_cached(day, input_path, part1, **kwargs)[0]
+
+
+def parse_extra_args(extra_args: list[str]) -> dict[str, int | str]:
+    """Convert a list of arg_name=value strings to keyword arguments for a puzzle part.
+    Exits with an error message if any string isn't of the correct form."""
+    for ea in extra_args:
+        if "=" not in ea:
+            sys.exit(f"Extra argument '{ea}' isn't of the form arg_name=value.")
+    return {k: try_convert_int(v) for k, v in [i.split("=", 1) for i in extra_args]}
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        importlib.import_module(COMMANDS[sys.argv[1]]).main(sys.argv[2:])
+        sys.exit()
+
+    parser = argparse.ArgumentParser(epilog=f"Other commands: {', '.join(COMMANDS)}. "
+                                            "Run 'aoc2024.py COMMAND --help' for their usage.")
     parser.add_argument("-1", "--part1", action="store_true")
     parser.add_argument("-2", "--part2", action="store_true")
-    parser.add_argument("day", type=int, help="A number from 1-25 indicating the day of the puzzle to run")
-    parser.add_argument("input", type=Path, help="Path to the file containing puzzle input")
+    parser.add_argument("-b", "--both", action="store_true",
+                        help="Solve both parts, loading the input only once. Extra arguments are passed to each part "
+                             "that accepts them.")
+    parser.add_argument("day", type=int, nargs="?",
+                        help="A number from 1-25 indicating the day of the puzzle to run")
+    parser.add_argument("input", type=Path, nargs="?",
+                        help="Path to the file containing puzzle input, or a directory or quoted glob pattern of "
+                             "input files to solve as a batch in parallel")
     parser.add_argument("-e", "--extra-arg", type=str,
                         help="An extra argument for the puzzle, in the form arg_name=value",
                         action="append", default=[])
-    args = parser.parse_args()
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse answers stored in the answer cache, and store new answers in it")
+    parser.add_argument("--cache-inputs", action="store_true",
+                        help="Reuse parsed inputs stored in the input cache instead of parsing input files, and store "
+                             "newly parsed inputs in it")
+    parser.add_argument("--profile", type=Path, metavar="DIR",
+                        help="Profile loading the input and solving each part with cProfile, writing a .prof file "
+                             "for each to DIR, and printing a summary of each to stderr")
+    parser.add_argument("--profile-top", type=int, default=profiling.DEFAULT_TOP, metavar="N",
+                        help=f"Number of functions to show in each profile summary (default: {profiling.DEFAULT_TOP})")
+    parser.add_argument("--sample", type=Path, metavar="DIR",
+                        help="Profile loading the input and solving each part by sampling their call stacks, writing "
+                             "a .folded file of collapsed stacks for flame graph tools for each to DIR, and printing "
+                             "the functions most often running to stderr")
+    parser.add_argument("--sample-interval", type=float, default=profiling.DEFAULT_SAMPLE_INTERVAL, metavar="MS",
+                        help="Milliseconds between stack samples "
+                             f"(default: {profiling.DEFAULT_SAMPLE_INTERVAL})")
+    parser.add_argument("--memory", action="store_true",
+                        help="Measure the peak memory used loading the input and solving each part, and print it to "
+                             "stderr")
+    parser.add_argument("--memory-budget", type=float, metavar="MIB",
+                        help="Fail any puzzle whose input loading or solving allocates more than MIB mebibytes at "
+                             "its peak. Implies --memory.")
+    parser.add_argument("--time-limit", type=float, metavar="SECONDS",
+                        help="Run each puzzle in a child process, and stop any that takes longer than SECONDS")
+    parser.add_argument("--memory-limit", type=float, metavar="MIB",
+                        help="Run each puzzle in a child process, and stop any whose process grows larger than MIB "
+                             "mebibytes")
+    parser.add_argument("--counters", action="store_true",
+                        help="Report the counts of work done that solutions add while loading the input and solving "
+                             "each part, such as search nodes expanded or memo hits, to stderr")
+    parser.add_argument("--engine", type=str, metavar="NAME",
+                        help="Solve with the engine called NAME, an alternative implementation a day may register "
+                             "for a part (see common/engines.py). Parts without one use the reference implementation.")
+    parser.add_argument("--verify", action="store_true",
+                        help="After solving, also solve with every other implementation of the part from the same "
+                             "parsed input, and fail if any answer differs")
+    parser.add_argument("--checkpoint", type=Path, nargs="?", const=TOP_DIR / ".aoc_checkpoints", metavar="DIR",
+                        help="Let long-running searches save their progress to DIR (default: .aoc_checkpoints/), and "
+                             "resume from it if a solve is stopped and run again")
+    parser.add_argument("--checkpoint-interval", type=float, metavar="SECONDS",
+                        help=f"With --checkpoint, the time between saves (default: {checkpoint.DEFAULT_INTERVAL})")
+    parser.add_argument("--persist-memos", action="store_true",
+                        help="Keep solutions' persistent memos between solves in the same process, e.g. between the "
+                             "parts with --both, instead of starting each solve with them empty")
+    parser.add_argument("--metrics", type=Path, metavar="PATH",
+                        help="Append a record of each puzzle run to PATH, as JSON lines, or if PATH ends in .prom, "
+                             "update a Prometheus textfile with the latest measurements")
+    parser.add_argument("-a", "--all", action="store_true",
+                        help="Instead of a single puzzle, solve every day's main input in parallel. "
+                             "Solves both parts, unless --part1 or --part2 is given.")
+    parser.add_argument("--samples", action="store_true",
+                        help="With --all, also solve sample inputs that have answer files")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="With --all or a batch of inputs, the number of worker processes "
+                             "(default: number of CPUs)")
+    parser.add_argument("--completion-order", action="store_true",
+                        help="With a batch of inputs, print results as they finish, instead of in input order")
+    args = parser.parse_intermixed_args()
 
-    if args.part1 == args.part2:
-        sys.exit("Exactly one of --part1 or --part2 must be specified.")
-    for ea in args.extra_arg:
-        if "=" not in ea:
-            sys.exit(f"Extra argument '{ea}' isn't of the form arg_name=value.")
-    extra_args = {k: int(v) if v.isdigit() else v for k, v in [i.split("=", 1) for i in args.extra_arg]}
+    if args.cache:
+        cache.enable(cache.CACHE_ENV_VAR)
+    if args.cache_inputs:
+        cache.enable(cache.INPUT_CACHE_ENV_VAR)
+    if args.profile is not None:
+        profiling.enable(args.profile, args.profile_top)
+    if args.counters:
+        counters.enable()
+    if args.persist_memos:
+        memo.enable_persistence()
+    if args.engine is not None:
+        engines.select(args.engine)
+    if args.checkpoint is not None:
+        checkpoint.enable(args.checkpoint, args.checkpoint_interval)
+    if args.verify:
+        engines.enable_verify()
+    if args.sample is not None:
+        profiling.enable_sampling(args.sample, args.sample_interval)
+    if args.metrics is not None:
+        metrics.enable(args.metrics)
+    if args.time_limit is not None or args.memory_limit is not None:
+        limits.enable(args.time_limit,
+                      int(args.memory_limit * limits.MIB) if args.memory_limit is not None else None)
+    if args.memory or args.memory_budget is not None:
+        memory.enable(int(args.memory_budget * memory.MIB) if args.memory_budget is not None else None)
+
+    from runner import pool
+    if args.all:
+        if args.day is not None or args.extra_arg:
+            sys.exit("A day, input, or extra arguments can't be given with --all.")
+        sys.exit(pool.main_all([1, 2] if args.part1 == args.part2 else [1] if args.part1 else [2],
+                               args.samples, args.jobs))
+
+    if args.day is None or args.input is None:
+        parser.error("the following arguments are required: day, input")
+    if [args.part1, args.part2, args.both].count(True) != 1:
+        sys.exit("Exactly one of --part1, --part2, or --both must be specified.")
+    extra_args = parse_extra_args(args.extra_arg)
+
+    if args.engine is not None and args.engine != engines.REFERENCE:
+        day_module = import_day(args.day)
+        available = {name for part1 in (True, False) for name in engines.implementations(day_module, part1)}
+        if args.engine not in available:
+            sys.exit(f"Day {args.day} has no engine called {args.engine}. Its engines are: "
+                     f"{', '.join(sorted(available))}.")
+
+    if pool.is_batch(str(args.input)):
+        sys.exit(pool.main_batch(args.day, str(args.input), [1, 2] if args.both else [1] if args.part1 else [2],
+                                 extra_args, args.jobs, not args.completion_order))
+
+    try:
+        if args.both:
+            results, timings = run_puzzle_both_timed(args.day, args.input, **extra_args)
+            print("\n".join(str(result) for result in results))
+            phase_stats = timings._asdict()
+        else:
+            result, timings = run_puzzle_cached(args.day, args.input, args.part1, **extra_args)
+            print(str(result))
+            phase_stats = {"load": timings.load, "part1" if args.part1 else "part2": timings.solve} \
+                if timings is not None else {}
+    except (memory.MemoryBudgetExceeded, limits.LimitExceeded, engines.EngineMismatch) as e:
+        sys.exit(str(e))
 
-    print(str(run_puzzle(args.day, args.input, args.part1, **extra_args)))
+    for phase, stats in phase_stats.items():
+        if stats.memory is not None:
+            print(f"{phase}: {stats.memory}", file=sys.stderr)
+        if stats.counters:
+            print(f"{phase}: " + ", ".join(f"{name}={count}" for name, count in sorted(stats.counters.items())),
+                  file=sys.stderr)
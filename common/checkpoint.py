@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+# Checkpoints of long-running searches, so a solve that is killed part way through resumes from where it got to instead
+# of starting again.
+# Checkpointing is enabled when the AOC2024_CHECKPOINT environment variable is set to a directory, which the
+# --checkpoint option of aoc2024.py does, so it also applies to --all and batch worker processes, and to children run
+# within limits (see runner/limits.py). The runner gives each solve its own checkpoint file in that directory, named by
+# a hash of the day's solution source, the input file, the part and the extra arguments (see runner/cache.py), so a
+# checkpoint is only resumed by the same search. The file is removed once the solve finishes.
+# A solution first loads the state saved by an earlier run, if any, then saves its state, e.g. a search frontier or an
+# enumeration cursor, whenever a save is due: every AOC2024_CHECKPOINT_INTERVAL seconds (set by --checkpoint-interval),
+# and on SIGTERM, after which it stops. Solutions that don't checkpoint are stopped by SIGTERM as usual.
+# Checking whether a save is due costs a call, so solutions only check once per iteration of a loop that does much more
+# work than that.
+# Usage:
+#     tested = checkpoint.load() or 0
+#     for candidate in itertools.islice(candidates, tested, None):
+#         ...
+#         tested += 1
+#         if checkpoint.due():
+#             checkpoint.save(tested)
+
+import contextlib
+import os
+from pathlib import Path
+import pickle
+import signal
+import threading
+import time
+from typing import Any, Iterator
+
+CHECKPOINT_ENV_VAR = "AOC2024_CHECKPOINT"
+INTERVAL_ENV_VAR = "AOC2024_CHECKPOINT_INTERVAL"
+DEFAULT_INTERVAL = 60
+
+# Checkpoint file of the solve in progress, or None if it isn't checkpointed.
+_path: Path | None = None
+_next_save = 0.0
+_stop_requested = False
+# Whether SIGTERM is handled by requesting a stop, as the solve loaded its checkpoint from the main thread, and the
+# handler to restore at the end of the solve.
+_handling_sigterm = False
+_previous_handler: Any = None
+
+
+def enable(directory: Path, interval: float | None = None) -> None:
+    """Checkpoint solves to files in directory, saving every interval seconds, in this process and any worker processes
+    it starts."""
+    os.environ[CHECKPOINT_ENV_VAR] = str(directory.resolve())
+    if interval is not None:
+        os.environ[INTERVAL_ENV_VAR] = str(interval)
+
+
+def directory() -> Path | None:
+    value = os.environ.get(CHECKPOINT_ENV_VAR)
+    return Path(value) if value else None
+
+
+def interval() -> float:
+    return float(os.environ.get(INTERVAL_ENV_VAR) or DEFAULT_INTERVAL)
+
+
+def _request_stop(signum: int, frame: Any) -> None:
+    global _stop_requested
+    _stop_requested = True
+
+
+@contextlib.contextmanager
+def session(path: Path | None) -> Iterator[None]:
+    """Checkpoint the solve run inside the block to path, if it isn't None. The checkpoint file is removed if the solve
+    finishes, and kept if it fails or is stopped, so a later run can resume it."""
+    global _path, _next_save, _stop_requested, _handling_sigterm
+    if path is None:
+        yield
+        return
+    _path = path
+    _next_save = time.monotonic() + interval()
+    _stop_requested = False
+    try:
+        yield
+    finally:
+        _path = None
+        if _handling_sigterm:
+            signal.signal(signal.SIGTERM, _previous_handler)
+            _handling_sigterm = False
+    path.unlink(missing_ok=True)
+
+
+def load() -> Any | None:
+    """The state last saved by an earlier run of the solve in progress, or None if there is none.
+    From then until the solve ends, SIGTERM makes the solve's next save its last, then raises SystemExit."""
+    global _handling_sigterm, _previous_handler
+    if _path is None:
+        return None
+    # Signal handlers can only be set from the main thread.
+    if not _handling_sigterm and threading.current_thread() is threading.main_thread():
+        _previous_handler = signal.signal(signal.SIGTERM, _request_stop)
+        _handling_sigterm = True
+    if not _path.exists():
+        return None
+    with open(_path, "rb") as f:
+        return pickle.load(f)
+
+
+def due() -> bool:
+    """Whether the solve in progress should save its state now."""
+    return _path is not None and (_stop_requested or time.monotonic() >= _next_save)
+
+
+def save(state: Any) -> None:
+    """Save the state of the solve in progress, replacing its previous checkpoint. If the process has been asked to
+    stop, exits afterwards."""
+    global _next_save
+    if _path is None:
+        return
+    _path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first, so a checkpoint is never left half written.
+    temporary_path = _path.with_name(_path.name + ".tmp")
+    with open(temporary_path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, _path)
+    _next_save = time.monotonic() + interval()
+    if _stop_requested:
+        raise SystemExit(f"Stopped, with a checkpoint saved to {_path}.")
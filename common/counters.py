@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+# Counters of the work done inside solutions, such as search nodes expanded or memo hits, reported by the runner with
+# each phase's measurements to explain why a run was slow, not just that it was.
+# Counting is enabled when the AOC2024_COUNTERS environment variable is set, which the --counters option of aoc2024.py
+# does, so it also applies to --all and batch worker processes. The variable is read once, when this module is imported,
+# and add is bound to a function that does nothing unless counting is enabled. As enable rebinds add, it must be
+# called as counters.add, not imported by name.
+# Even a call that does nothing costs time in a hot loop, so solutions never count inside one. Instead, they add counts
+# once a loop or search has finished: from sizes they already know (e.g. the number of nodes a search reached), from a
+# cache's statistics, or from a local tally of something rarer than the loop's iterations.
+# Usage:
+#     counters.add("dijkstra.expanded", len(dist))
+#     if counters.enabled():
+#         counters.add("day11.stones.memo_hits", total_stones.cache_info().hits)
+
+from collections import Counter
+import os
+
+COUNTERS_ENV_VAR = "AOC2024_COUNTERS"
+
+_counts: Counter[str] = Counter()
+
+
+def _count(name: str, n: int = 1) -> None:
+    """Add n to the counter called name. Names are of the form "day11.stones.memo_hits", or "dijkstra.expanded" for
+    shared code."""
+    _counts[name] += n
+
+
+def _ignore(name: str, n: int = 1) -> None:
+    pass
+
+
+_enabled = bool(os.environ.get(COUNTERS_ENV_VAR))
+# Add n to the counter called name, if counting is enabled.
+add = _count if _enabled else _ignore
+
+
+def enable() -> None:
+    """Enable counting for this process, and any worker processes it starts."""
+    global _enabled, add
+    os.environ[COUNTERS_ENV_VAR] = "1"
+    _enabled = True
+    add = _count
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def take() -> dict[str, int]:
+    """Return the counts added since the last call, and reset them."""
+    result = dict(_counts)
+    _counts.clear()
+    return result
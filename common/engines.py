@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+# Alternative implementations of puzzle parts ("engines"), such as aggressively optimised versions of a day's part1 and
+# part2 functions, which stay as the simple reference implementations the engines are checked against.
+# A day module registers an engine for a part with the engine decorator. The runner solves each part with the engine
+# named by the AOC2024_ENGINE environment variable, which the --engine option of aoc2024.py sets, so it also applies to
+# --all and batch worker processes; parts without an engine of that name use the reference.
+# If the AOC2024_VERIFY environment variable is set, which --verify does, every other implementation of the part is
+# also run on the same parsed input after the timed solve, and EngineMismatch raised if any answer differs.
+# Every implementation of a part takes the same arguments as the reference.
+# Usage:
+#     @engine("part2", "counts")
+#     def part2_counts(input_data: InputType, blinks: int = 75) -> ResultType: ...
+#
+#     python3 aoc2024.py 11 -2 day11/data/input --engine counts --verify
+
+import contextlib
+import os
+from types import ModuleType
+from typing import Any, Callable, Iterator
+
+ENGINE_ENV_VAR = "AOC2024_ENGINE"
+VERIFY_ENV_VAR = "AOC2024_VERIFY"
+REFERENCE = "reference"
+
+# {(module name, "part1" or "part2"): {engine name: function}}
+_engines: dict[tuple[str, str], dict[str, Callable[..., Any]]] = {}
+
+
+class EngineMismatch(Exception):
+    """Two implementations of a puzzle part gave different answers for the same input.
+
+    label -- The run that was checked, e.g. day11_input_part2.
+    engine -- The engine that was timed, and its answer.
+    other -- The implementation it was checked against, and its answer.
+    """
+
+    def __init__(self, label: str, engine: str, answer: Any, other: str, other_answer: Any):
+        self.label = label
+        self.engine = engine
+        self.answer = answer
+        self.other = other
+        self.other_answer = other_answer
+        super().__init__(f"{label}: the {engine} engine answered {answer!r}, but the {other} engine answered "
+                         f"{other_answer!r}.")
+
+    def __reduce__(self):
+        return EngineMismatch, (self.label, self.engine, self.answer, self.other, self.other_answer)
+
+
+def engine(part: str, name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator registering a function as the engine called name for part ("part1" or "part2") of the day module
+    defining it."""
+    assert part in ("part1", "part2") and name != REFERENCE
+
+    def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+        _engines.setdefault((function.__module__, part), {})[name] = function
+        return function
+    return decorator
+
+
+def implementations(day_module: ModuleType, part1: bool) -> dict[str, Callable[..., Any]]:
+    """Every implementation of a part of a day, by engine name, starting with the reference."""
+    part = "part1" if part1 else "part2"
+    return {REFERENCE: getattr(day_module, part)} | _engines.get((day_module.__name__, part), {})
+
+
+def select(name: str) -> None:
+    """Solve parts with the engine called name, in this process and any worker processes it starts."""
+    os.environ[ENGINE_ENV_VAR] = name
+
+
+@contextlib.contextmanager
+def selection(name: str) -> Iterator[None]:
+    """Solve parts with the engine called name within the block, then restore the previous selection."""
+    previous = os.environ.get(ENGINE_ENV_VAR)
+    select(name)
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ[ENGINE_ENV_VAR]
+        else:
+            os.environ[ENGINE_ENV_VAR] = previous
+
+
+def requested() -> str:
+    """Name of the selected engine, whether or not a given part has one of that name."""
+    return os.environ.get(ENGINE_ENV_VAR) or REFERENCE
+
+
+def selected(day_module: ModuleType, part1: bool) -> str:
+    """Name of the engine to solve a part of a day with: the selected engine if the part has one of that name, otherwise
+    the reference."""
+    name = requested()
+    return name if name in implementations(day_module, part1) else REFERENCE
+
+
+def enable_verify() -> None:
+    """Check each solve's answer against every other implementation of the part, in this process and any worker
+    processes it starts."""
+    os.environ[VERIFY_ENV_VAR] = "1"
+
+
+def verify_enabled() -> bool:
+    return bool(os.environ.get(VERIFY_ENV_VAR))
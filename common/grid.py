@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+# A compact 2D grid of byte-sized cells, shared by the grid-based days.
+# Cells are stored row by row in a single flat bytearray, and identified by packed integer ids (r * width + c) rather
+# than (r, c) tuples, so moving to a neighbouring cell is a single addition of one of the grid's offsets.
+# Surrounding a grid with a border of sentinel cells (see Grid.padded) lets hot loops step between neighbours without
+# bounds checks, as a walk always reaches the border before it could leave the grid.
+# Usage:
+#     grid = Grid.load(input_path)                        # Cells hold the input's bytes, e.g. ord("#").
+#     grid = Grid.load(input_path, translation({".": 255, **{str(d): d for d in range(10)}}))
+#     grid = grid.padded(ord("#"))
+#     for i in grid.find_all(ord("S")):
+#         for n in grid.neighbours(i): ...
+
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping
+
+# Indices into Grid.offsets. Turning right is (direction + 1) % 4, and turning left (direction + 3) % 4.
+UP = 0
+RIGHT = 1
+DOWN = 2
+LEFT = 3
+
+
+def translation(mapping: Mapping[str, int]) -> bytes:
+    """Translation table for Grid.parse, mapping each of the given characters to a cell value, and leaving any other
+    byte unchanged."""
+    table = bytearray(range(256))
+    for char, value in mapping.items():
+        table[ord(char)] = value
+    return bytes(table)
+
+
+class Grid:
+    """A width x height grid of cells, each holding an integer from 0 to 255."""
+    # __weakref__ lets grids be used with common/precompute.py.
+    __slots__ = ("width", "height", "cells", "offsets", "__weakref__")
+
+    def __init__(self, width: int, height: int, cells: bytearray | None = None, fill: int = 0):
+        if cells is None:
+            cells = bytearray([fill]) * (width * height)
+        assert len(cells) == width * height
+        self.width = width
+        self.height = height
+        self.cells = cells
+        # Id offsets to the neighbouring cell in each direction: UP, RIGHT, DOWN, LEFT.
+        self.offsets = (-width, 1, width, -1)
+
+    @classmethod
+    def parse(cls, lines: Iterable[bytes | str], table: bytes | None = None) -> "Grid":
+        """Create a grid from rows of equal length, translating each byte through table if given (see translation).
+        Trailing whitespace is ignored, and parsing stops at the first blank line."""
+        rows = []
+        for line in lines:
+            line = (line.encode() if isinstance(line, str) else line).rstrip()
+            if not line:
+                break
+            rows.append(line)
+        width = len(rows[0]) if rows else 0
+        assert all(len(row) == width for row in rows)
+        cells = bytearray(b"".join(rows))
+        if table is not None:
+            cells = cells.translate(table)
+        return cls(width, len(rows), cells)
+
+    @classmethod
+    def load(cls, input_path: Path, table: bytes | None = None) -> "Grid":
+        with open(input_path, "rb") as f:
+            return cls.parse(f.read().splitlines(), table)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, i: int) -> int:
+        return self.cells[i]
+
+    def __setitem__(self, i: int, value: int) -> None:
+        self.cells[i] = value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Grid) and (self.width, self.height, self.cells) == \
+            (other.width, other.height, other.cells)
+
+    def __getstate__(self) -> tuple[int, int, bytearray]:
+        return self.width, self.height, self.cells
+
+    def __setstate__(self, state: tuple[int, int, bytearray]) -> None:
+        self.__init__(*state)
+
+    def id(self, r: int, c: int) -> int:
+        return r * self.width + c
+
+    def row_col(self, i: int) -> tuple[int, int]:
+        return divmod(i, self.width)
+
+    def in_bounds(self, r: int, c: int) -> bool:
+        return 0 <= r < self.height and 0 <= c < self.width
+
+    def neighbours(self, i: int) -> Iterator[int]:
+        """Ids of the cells above, right of, below and left of cell i, skipping any outside the grid."""
+        r, c = divmod(i, self.width)
+        if r > 0:
+            yield i - self.width
+        if c < self.width - 1:
+            yield i + 1
+        if r < self.height - 1:
+            yield i + self.width
+        if c > 0:
+            yield i - 1
+
+    def find(self, value: int) -> int:
+        """Id of the first cell holding value. Raises ValueError if there is none."""
+        return self.cells.index(value)
+
+    def find_all(self, value: int) -> list[int]:
+        result = []
+        i = self.cells.find(value)
+        while i != -1:
+            result.append(i)
+            i = self.cells.find(value, i + 1)
+        return result
+
+    def only_contains(self, values: Iterable[int]) -> bool:
+        """Whether every cell holds one of values."""
+        return not self.cells.translate(None, bytes(values))
+
+    def copy(self) -> "Grid":
+        return Grid(self.width, self.height, self.cells.copy())
+
+    def padded(self, fill: int, border: int = 1) -> "Grid":
+        """A new grid holding this grid's cells, surrounded by a border of cells holding fill.
+        Cell ids differ between the two grids."""
+        width = self.width + 2 * border
+        cells = bytearray([fill]) * (width * border)
+        side = bytes([fill]) * border
+        for r in range(self.height):
+            cells += side + self.cells[r * self.width:(r + 1) * self.width] + side
+        cells += bytearray([fill]) * (width * border)
+        return Grid(width, self.height + 2 * border, cells)
+
+    def rows(self) -> list[bytes]:
+        """The rows of the grid, e.g. for printing with b"\\n".join(grid.rows()).decode()."""
+        return [bytes(self.cells[r * self.width:(r + 1) * self.width]) for r in range(self.height)]
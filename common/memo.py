@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# Memoisation for solutions, with optional bounds, statistics, and results kept between solves.
+# memoize wraps a function with functools.lru_cache, so cached calls stay as fast as a hand-written dict memo, and can
+# be bounded to a number of entries, evicting the least recently used. A function with a single int or str argument is
+# cached under that argument itself, so packing several small arguments into one int gives the most compact keys.
+# Each solve should run its memoised functions in a session, which by default starts them empty, so every solve does
+# the same work (e.g. for benchmarks), and reports their hits and misses to common/counters.py when it ends.
+# If the AOC2024_PERSIST_MEMOS environment variable is set, which the --persist-memos option of aoc2024.py and
+# `aoc2024.py serve` do, sessions keep the entries of memos marked persistent, so later solves in the same process reuse
+# them. Only mark a memo persistent if its function's results depend on nothing but its arguments.
+# Usage:
+#     @memoize("day21.dir_pad_table", persistent=True)
+#     def dir_pad_table(robot_index: int) -> DirPadTable: ...
+#
+#     with session(dir_pad_table):
+#         ...
+
+import contextlib
+import functools
+import os
+from typing import Any, Callable, Iterator
+
+from common import counters
+
+PERSIST_ENV_VAR = "AOC2024_PERSIST_MEMOS"
+
+
+def enable_persistence() -> None:
+    """Keep persistent memos' entries between sessions, in this process and any worker processes it starts."""
+    os.environ[PERSIST_ENV_VAR] = "1"
+
+
+def persistence_enabled() -> bool:
+    return bool(os.environ.get(PERSIST_ENV_VAR))
+
+
+def memoize(name: str, maxsize: int | None = None,
+            persistent: bool = False) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator memoising a function, keeping at most maxsize entries if given. name identifies the memo in counters,
+    e.g. "day11.stones"."""
+    def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+        cached = functools.lru_cache(maxsize)(function)
+        cached.memo_name = name
+        cached.memo_persistent = persistent
+        return cached
+    return decorator
+
+
+@contextlib.contextmanager
+def session(*memos: Callable[..., Any]) -> Iterator[None]:
+    """Use memoised functions for one solve. Each starts empty, unless it is persistent and persistence is enabled, and
+    its hits, misses, and final number of entries are added to the counters at the end."""
+    start = {}
+    for memo in memos:
+        if not (memo.memo_persistent and persistence_enabled()):
+            memo.cache_clear()
+        start[memo] = memo.cache_info()
+    try:
+        yield
+    finally:
+        for memo in memos:
+            info = memo.cache_info()
+            counters.add(f"{memo.memo_name}.memo_hits", info.hits - start[memo].hits)
+            counters.add(f"{memo.memo_name}.memo_misses", info.misses - start[memo].misses)
+            counters.add(f"{memo.memo_name}.memo_entries", info.currsize)
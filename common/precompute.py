@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+
+# Share expensive precomputation on a parsed input between runs that use the same parsed input object, e.g. both parts
+# solved from one load (--both), or every test of an input in a pytest session, which parses each input only once.
+# Results are kept for as long as the input object exists, so the input must support weak references, and the results
+# must not refer back to it. Results are shared, so must not be modified.
+# Usage:
+#     honest_time, dists = shared(input_data, race_distances)
+#     table = shared(input_data, build_table, 25)       # Cached separately for each set of extra arguments.
+
+from typing import Any, Callable
+import weakref
+
+# {id(input_data): {(function, args): result}}
+_results: dict[int, dict[tuple, Any]] = {}
+
+
+def shared(input_data: Any, function: Callable[..., Any], *args: Any) -> Any:
+    """Return function(input_data, *args), computing it only the first time it is needed for this input object."""
+    input_id = id(input_data)
+    results = _results.get(input_id)
+    if results is None:
+        results = _results[input_id] = {}
+        # Forget the results once the input is freed, as its id may then be reused.
+        weakref.finalize(input_data, _results.pop, input_id, None)
+    key = (function, args)
+    if key not in results:
+        results[key] = function(input_data, *args)
+    return results[key]
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+# Shortest path searches over implicit graphs, shared by the days that need them.
+# A graph is given by a neighbours function, so nodes can be any hashable value: packed grid cell ids (see
+# common/grid.py), tuples of search state, etc.
+# dijkstra uses a heapq priority queue with lazy deletion (outdated queue entries are skipped when popped, rather than
+# removed when a node's cost improves), so runs in O(E log V), and optionally searches as A* given a heuristic.
+# bfs is a faster alternative for graphs where every edge costs 1.
+# Both accept several sources, and can record every node's predecessors on all of its shortest paths.
+# Usage:
+#     result = bfs([start], lambda i: (i + o for o in grid.offsets if grid[i + o] != WALL), is_target=end.__eq__)
+#     result.dist[end]
+#     result = dijkstra({start: 0}, lambda n: [(next_n, cost), ...], is_target=..., heuristic=..., predecessors=True)
+#     on_best_paths = dag_nodes(result.predecessors, result.targets)
+
+from collections.abc import Callable, Hashable, Iterable, Mapping
+import heapq
+import itertools
+from typing import NamedTuple
+
+from common import counters
+
+Node = Hashable
+
+
+class SearchResult(NamedTuple):
+    # Cost of the shortest path to each node reached by the search.
+    dist: dict[Node, int]
+    # If predecessors were requested, the nodes that precede each reached node on any of its shortest paths.
+    predecessors: dict[Node, list[Node]] | None
+    # The targets reached, in the order they were reached, i.e. in order of increasing cost.
+    targets: list[Node]
+
+
+def dijkstra(sources: Iterable[Node] | Mapping[Node, int],
+             neighbours: Callable[[Node], Iterable[tuple[Node, int]]],
+             is_target: Callable[[Node], bool] | None = None,
+             heuristic: Callable[[Node], int] | None = None,
+             max_cost: int | None = None,
+             predecessors: bool = False) -> SearchResult:
+    """Find the shortest paths from the sources to other nodes.
+
+    sources -- Nodes to start from at cost 0, or a map from each start node to its initial cost.
+    neighbours -- Function giving (next_node, edge_cost) for each edge leaving a node. Edge costs must not be negative.
+    is_target -- If given, the search stops once the nearest target is reached, after also reaching any other nodes
+        (including targets) of equal cost. Otherwise, all nodes reachable from the sources are searched.
+    heuristic -- If given, search as A*, prioritising nodes by cost plus heuristic(node). The heuristic must never
+        overestimate the remaining cost to a target, and must be consistent, i.e. a node's heuristic must be no more
+        than the cost of an edge leaving it plus the heuristic of the edge's destination.
+    max_cost -- If given, nodes costing more than this to reach are not searched.
+    predecessors -- Whether to record the predecessors of each node on all of its shortest paths.
+    """
+    if not isinstance(sources, Mapping):
+        sources = dict.fromkeys(sources, 0)
+    # Costs of nodes whose shortest path is known.
+    dist: dict[Node, int] = {}
+    # Lowest cost found so far for each node in the queue.
+    queued: dict[Node, int] = dict(sources)
+    preds: dict[Node, list[Node]] | None = {node: [] for node in sources} if predecessors else None
+    targets: list[Node] = []
+    # Queue entries are (priority, tie_breaker, cost, node). The tie breaker avoids comparing nodes, which may not be
+    # comparable.
+    tie_breaker = itertools.count()
+    queue = [(cost + (heuristic(node) if heuristic is not None else 0), next(tie_breaker), cost, node)
+             for node, cost in sources.items()]
+    heapq.heapify(queue)
+    # Once a target is reached, the priority after which to stop.
+    stop_priority = None
+
+    while queue:
+        priority, _, cost, node = heapq.heappop(queue)
+        if stop_priority is not None and priority > stop_priority:
+            break
+        if node in dist or cost > queued[node]:
+            # Outdated entry, for a node since queued with a lower cost.
+            continue
+        dist[node] = cost
+        if is_target is not None and is_target(node):
+            targets.append(node)
+            if stop_priority is None:
+                stop_priority = priority
+
+        for next_node, edge_cost in neighbours(node):
+            next_cost = cost + edge_cost
+            if next_node in dist or (max_cost is not None and next_cost > max_cost):
+                continue
+            queued_cost = queued.get(next_node)
+            if queued_cost is None or next_cost < queued_cost:
+                queued[next_node] = next_cost
+                heapq.heappush(queue, (next_cost + (heuristic(next_node) if heuristic is not None else 0),
+                                       next(tie_breaker), next_cost, next_node))
+                if preds is not None:
+                    preds[next_node] = [node]
+            elif next_cost == queued_cost and preds is not None:
+                preds[next_node].append(node)
+
+    if preds is not None:
+        preds = {node: preds[node] for node in dist}
+    counters.add("dijkstra.expanded", len(dist))
+    # The tie breaker has counted every node pushed onto the queue.
+    counters.add("dijkstra.queued", next(tie_breaker))
+    return SearchResult(dist, preds, targets)
+
+
+def bfs(sources: Iterable[Node],
+        neighbours: Callable[[Node], Iterable[Node]],
+        is_target: Callable[[Node], bool] | None = None,
+        max_cost: int | None = None,
+        predecessors: bool = False) -> SearchResult:
+    """As dijkstra, for graphs where every edge costs 1. neighbours gives just the next nodes."""
+    dist: dict[Node, int] = dict.fromkeys(sources, 0)
+    preds: dict[Node, list[Node]] | None = {node: [] for node in dist} if predecessors else None
+    targets: list[Node] = []
+    # Search one cost level at a time.
+    level = list(dist)
+    cost = 0
+    while level:
+        if is_target is not None:
+            targets = [node for node in level if is_target(node)]
+            if targets:
+                break
+        if max_cost is not None and cost >= max_cost:
+            break
+        cost += 1
+        next_level = []
+        for node in level:
+            for next_node in neighbours(node):
+                if next_node not in dist:
+                    dist[next_node] = cost
+                    next_level.append(next_node)
+                    if preds is not None:
+                        preds[next_node] = [node]
+                elif preds is not None and dist[next_node] == cost:
+                    preds[next_node].append(node)
+        level = next_level
+    counters.add("bfs.reached", len(dist))
+    return SearchResult(dist, preds, targets)
+
+
+def dag_nodes(predecessors: Mapping[Node, Iterable[Node]], ends: Iterable[Node]) -> set[Node]:
+    """All nodes on any shortest path to the given end nodes, from a search's predecessors."""
+    result = set(ends)
+    to_check = list(result)
+    while to_check:
+        for predecessor in predecessors[to_check.pop()]:
+            if predecessor not in result:
+                result.add(predecessor)
+                to_check.append(predecessor)
+    return result
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with size pairs of location IDs.
+
+import random
+
+DEFAULT_SIZE = 1000
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    # Draw IDs from a limited pool, so some appear in both lists, as the similarity score in part 2 requires.
+    pool = [rng.randrange(10000, 100000) for _ in range(max(size // 2, 1))]
+    return "".join(f"{rng.choice(pool)}   {rng.choice(pool)}\n" for _ in range(size))
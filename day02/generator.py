@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with size reports.
+
+import random
+
+DEFAULT_SIZE = 1000
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        # Start with a safe report, then make some unsafe with a single bad level, and others with several.
+        direction = rng.choice([-1, 1])
+        levels = [rng.randint(10, 90)]
+        for _ in range(rng.randint(4, 7)):
+            levels.append(levels[-1] + direction * rng.randint(1, 3))
+        for _ in range(rng.choice([0, 0, 1, 1, 2])):
+            levels[rng.randrange(len(levels))] = rng.randint(1, 99)
+        lines.append(" ".join(map(str, levels)) + "\n")
+    return "".join(lines)
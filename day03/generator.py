@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, of about size characters of corrupted memory.
+
+import random
+
+DEFAULT_SIZE = 20000
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    noise = "mul(,)don't()do()select()when()from()[]{}<>'?!@#$%^&*+- 0123456789\n"
+    parts = []
+    length = 0
+    while length < size:
+        match rng.randrange(10):
+            case 0 | 1 | 2:
+                part = f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+            case 3:
+                part = rng.choice(["do()", "don't()"])
+            case _:
+                part = "".join(rng.choice(noise) for _ in range(rng.randint(1, 12)))
+        parts.append(part)
+        length += len(part)
+    return "".join(parts).rstrip() + "\n"
@@ -2,29 +2,33 @@
 
 from pathlib import Path
 
-InputType = list[str]
+from common.grid import Grid
+
+InputType = Grid
 ResultType = int
 
 
 def load(input_path: Path) -> InputType:
-    with open(input_path) as f:
-        return [line.strip() for line in f.readlines()]
+    return Grid.load(input_path)
 
 
 def part1(input_data: InputType) -> ResultType:
-    def is_xmas(r, c, dr, dc) -> bool:
-        return "".join([input_data[r + i * dr][c + i * dc] for i in range(4)]) == "XMAS"
-
-    height = len(input_data)
-    width = len(input_data[0])
+    # Pad the grid so that words starting at any cell and running in any direction stay inside it.
+    grid = input_data.padded(ord("."), 3)
+    cells = grid.cells
+    width = grid.width
+    offsets = [dr * width + dc for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]]
+    x, m, a, s = b"XMAS"
 
-    return [is_xmas(r, c, dr, dc) for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
-            for r in range(height) for c in range(width)
-            if 0 <= c + 3 * dc < width and 0 <= r + 3 * dr < height].count(True)
+    return sum(1 for i in grid.find_all(x) for o in offsets
+               if cells[i + o] == m and cells[i + 2 * o] == a and cells[i + 3 * o] == s)
 
 
 def part2(input_data: InputType) -> ResultType:
-    return ["".join([input_data[r + dr][c + dc] for dr, dc in [(-1, -1), (-1, 1), (0, 0), (1, -1), (1, 1)]])
-            in ["MMASS", "SMASM", "SSAMM", "MSAMS"]
-            for r in range(1, len(input_data) - 1) for c in range(1, len(input_data[0]) - 1)
-            ].count(True)
+    grid = input_data.padded(ord("."))
+    cells = grid.cells
+    width = grid.width
+    diagonals = [-width - 1, -width + 1, width - 1, width + 1]
+
+    return sum(1 for i in grid.find_all(ord("A"))
+               if bytes(cells[i + o] for o in diagonals) in [b"MMSS", b"SMSM", b"SSMM", b"MSMS"])
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with a word search grid of size x size letters.
+
+import random
+
+DEFAULT_SIZE = 140
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    return "".join("".join(rng.choice("XMAS") for _ in range(size)) + "\n" for _ in range(size))
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with size updates.
+
+import random
+
+DEFAULT_SIZE = 200
+PAGE_COUNT = 49
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    # Order the pages, and give a rule for every pair of them, so any update can be put in order.
+    pages = rng.sample(range(10, 100), PAGE_COUNT)
+    rules = [f"{a}|{b}\n" for i, a in enumerate(pages) for b in pages[i + 1:]]
+    rng.shuffle(rules)
+
+    updates = []
+    for _ in range(size):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            # Make roughly half of the updates correctly ordered.
+            update.sort(key=pages.index)
+        updates.append(",".join(map(str, update)) + "\n")
+    return "".join(rules) + "\n" + "".join(updates)
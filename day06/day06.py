@@ -3,54 +3,58 @@
 from enum import IntEnum
 from pathlib import Path
 
+from common import counters
+from common.grid import Grid, translation
+
 class Direction(IntEnum):
     UP = 0
     RIGHT = 1
     DOWN = 2
     LEFT = 3
-FloorMapType = list[list[bool]]  # True: blocked, False: open space.
-GuardType = tuple[int, int, Direction]  # The guard's starting row, starting column, and initial direction.
+# Cell values of the floor map.
+OPEN = 0
+BLOCKED = 1
+OUTSIDE = 2  # Only used in the border added around the map while walking.
+# Input characters to floor map cell values; the guard stands on open floor.
+FLOOR_TABLE = translation({".": OPEN, "#": BLOCKED, "^": OPEN, ">": OPEN, "v": OPEN, "<": OPEN})
+FloorMapType = Grid
+GuardType = tuple[int, Direction]  # The guard's starting cell id, and initial direction.
 InputType = tuple[FloorMapType, GuardType]
 ResultType = int
 
 
 def load(input_path: Path) -> InputType:
-    floor_map = []
-    guard = None
+    grid = Grid.load(input_path)
     direction_map = {"^": Direction.UP, ">": Direction.RIGHT, "v": Direction.DOWN, "<": Direction.LEFT}
+    guards = [(i, direction_map[d]) for d in direction_map.keys() for i in grid.find_all(ord(d))]
+    assert len(guards) == 1
+
+    floor_map = Grid(grid.width, grid.height, grid.cells.translate(FLOOR_TABLE))
+    assert floor_map.only_contains((OPEN, BLOCKED))
+    return floor_map, guards[0]
 
-    with open(input_path) as f:
-        for row, line in enumerate(f.readlines()):
-            line = line.strip()
-            for d in direction_map.keys():
-                if d in line:
-                    assert guard is None
-                    guard = (row, line.index(d), direction_map[d])
-            floor_map.append([c == "#" for c in line])
 
-    assert guard is not None
-    return floor_map, guard
+def padded_walk_start(input_data: InputType) -> tuple[bytearray, tuple[int, ...], int]:
+    """The map's cells surrounded by OUTSIDE cells, their neighbour offsets, and the guard's cell id in the result."""
+    floor_map, (guard, _) = input_data
+    padded = floor_map.padded(OUTSIDE)
+    r, c = floor_map.row_col(guard)
+    return padded.cells, padded.offsets, padded.id(r + 1, c + 1)
 
 
-def visited_positions(input_data: InputType) -> set[tuple[int, int]]:
+def visited_positions(input_data: InputType) -> set[int]:
+    """Cell ids of the padded map (see padded_walk_start) visited by the guard."""
     result = set()
+    cells, offsets, guard = padded_walk_start(input_data)
+    d = input_data[1][1]
 
-    floor_map, (guard_r, guard_c, guard_dir) = input_data
-    dr, dc = {Direction.UP: (-1, 0),
-              Direction.RIGHT: (0, 1),
-              Direction.DOWN: (1, 0),
-              Direction.LEFT: (0, -1)
-              }[guard_dir]
-
-    while 0 <= guard_r < len(floor_map) and 0 <= guard_c < len(floor_map[0]):
-        result.add((guard_r, guard_c))
-        if 0 <= guard_r + dr < len(floor_map) and 0 <= guard_c + dc < len(floor_map[0]) \
-                and floor_map[guard_r + dr][guard_c + dc]:
+    while cells[guard] != OUTSIDE:
+        result.add(guard)
+        if cells[guard + offsets[d]] == BLOCKED:
             # Turn 90 degrees to the right.
-            dr, dc = dc, dr * -1
+            d = (d + 1) % 4
         else:
-            guard_r += dr
-            guard_c += dc
+            guard += offsets[d]
 
     return result
 
@@ -61,32 +65,40 @@ def part1(input_data: InputType) -> ResultType:
 
 
 def part2(input_data: InputType) -> ResultType:
-    floor_map, (guard_r, guard_c, guard_dir) = input_data
+    cells, offsets, guard_start = padded_walk_start(input_data)
+    guard_dir = input_data[1][1]
     # Only try putting the obstacle in a position that the original path would collide with.
-    trial_obstacles = visited_positions(input_data) - {(guard_r, guard_c)}
-
-    def creates_loop(obs: tuple[int, int]) -> bool:
-        previous_positions = set()
-        r = guard_r
-        c = guard_c
-        dr, dc = {Direction.UP: (-1, 0),
-                  Direction.RIGHT: (0, 1),
-                  Direction.DOWN: (1, 0),
-                  Direction.LEFT: (0, -1)
-                  }[guard_dir]
-
-        while 0 <= r < len(floor_map) and 0 <= c < len(floor_map[0]):
-            if (r, c, dr ,dc) in previous_positions:
-                return True
-            previous_positions.add((r, c, dr, dc))
-            if 0 <= r + dr < len(floor_map) and 0 <= c + dc < len(floor_map[0]) \
-                    and (floor_map[r + dr][c + dc] or (r + dr, c + dc) == obs):
+    trial_obstacles = visited_positions(input_data) - {guard_start}
+
+    def creates_loop(turns: set[int]) -> bool:
+        # The guard is in a loop once they turn at the same position in the same direction twice.
+        # Pack the position and direction of each turn into a single int, and record it in turns.
+        guard = guard_start
+        d = guard_dir
+
+        while True:
+            next_cell = cells[guard + offsets[d]]
+            if next_cell == BLOCKED:
+                if guard * 4 + d in turns:
+                    return True
+                turns.add(guard * 4 + d)
                 # Turn 90 degrees to the right.
-                dr, dc = dc, dr * -1
+                d = (d + 1) % 4
+            elif next_cell == OUTSIDE:
+                return False
             else:
-                r += dr
-                c += dc
-
-        return False
-
-    return len([obstacle for obstacle in trial_obstacles if creates_loop(obstacle)])
+                guard += offsets[d]
+
+    result = 0
+    turns_simulated = 0
+    for obstacle in trial_obstacles:
+        # The padded cells are a copy of the input, so can be temporarily modified.
+        cells[obstacle] = BLOCKED
+        turns: set[int] = set()
+        result += creates_loop(turns)
+        turns_simulated += len(turns)
+        cells[obstacle] = OPEN
+    counters.add("day06.loops_checked", len(trial_obstacles))
+    # Counting each step would slow down the walk, so count the turns between its straight runs instead.
+    counters.add("day06.turns_simulated", turns_simulated)
+    return result
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with a lab map of size x size positions.
+# Random obstacles alone make the guard leave the map, or walk into a loop, within a few dozen steps, however large
+# the map is. Instead, the guard's route is laid out first, as a rough outward spiral: it walks straight, then an
+# obstacle is placed in front of it to turn it right, with each straight run 2 or 3 positions longer than the run two
+# before it, so the route never meets itself, until it leaves the map. Starting in the middle third of the map, the
+# route passes through over a quarter of the positions, as in the real input, whatever the size. The remaining
+# positions are then blocked at random, with the real input's density, which doesn't change the route, as the guard
+# never walks into or looks at them.
+
+import random
+
+DEFAULT_SIZE = 130
+# Fraction of positions blocked, as in the real input.
+OBSTACLE_DENSITY = 0.045
+
+
+def guard_leaves(blocked: list[list[bool]], r: int, c: int) -> bool:
+    """Whether a guard starting at (r, c) facing up eventually leaves the map, rather than walking in a loop."""
+    size = len(blocked)
+    dr, dc = -1, 0
+    seen = set()
+    while 0 <= r < size and 0 <= c < size:
+        if (r, c, dr, dc) in seen:
+            return False
+        seen.add((r, c, dr, dc))
+        if 0 <= r + dr < size and 0 <= c + dc < size and blocked[r + dr][c + dc]:
+            dr, dc = dc, -dr
+        else:
+            r += dr
+            c += dc
+    return True
+
+
+def lay_route(size: int, rng: random.Random, r: int, c: int) -> tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+    """Lay out a guard's route from (r, c), facing up. Returns the positions the guard walks through, and the obstacles
+    placed to turn it."""
+    route = {(r, c)}
+    obstacles = set()
+    dr, dc = -1, 0
+    runs = [rng.randint(1, 3), rng.randint(1, 3)]
+    while True:
+        for _ in range(runs[-2]):
+            r, c = r + dr, c + dc
+            if not (0 <= r < size and 0 <= c < size):
+                return route, obstacles
+            route.add((r, c))
+        if 0 <= r + dr < size and 0 <= c + dc < size:
+            obstacles.add((r + dr, c + dc))
+        dr, dc = dc, -dr
+        runs.append(runs[-2] + rng.randint(2, 3))
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    size = max(size, 4)
+    guard_r, guard_c = rng.randrange(size // 3, size - size // 3), rng.randrange(size // 3, size - size // 3)
+    route, obstacles = lay_route(size, rng, guard_r, guard_c)
+    assert not route & obstacles
+
+    blocked = [[(r, c) in obstacles or ((r, c) not in route and rng.random() < OBSTACLE_DENSITY) for c in range(size)]
+               for r in range(size)]
+    assert guard_leaves(blocked, guard_r, guard_c)
+
+    rows = [["#" if b else "." for b in row] for row in blocked]
+    rows[guard_r][guard_c] = "^"
+    return "".join("".join(row) + "\n" for row in rows)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with size calibration equations.
+
+import random
+
+DEFAULT_SIZE = 850
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(size):
+        numbers = [rng.randint(1, 999) if rng.random() < 0.3 else rng.randint(1, 99) for _ in range(rng.randint(2, 12))]
+        # Combine the numbers with random operators, so that most equations can be made true.
+        test_value = numbers[0]
+        for n in numbers[1:]:
+            test_value = rng.choice([test_value + n, test_value * n, int(f"{test_value}{n}")])
+        if rng.random() < 0.3:
+            test_value += rng.randint(1, 9)
+        lines.append(f"{test_value}: {' '.join(map(str, numbers))}\n")
+    return "".join(lines)
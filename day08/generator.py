@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with a map of size x size positions.
+
+import random
+import string
+
+DEFAULT_SIZE = 50
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    rows = [["."] * size for _ in range(size)]
+    # About 4 antennas of each frequency, with about one antenna per 12 positions.
+    frequencies = (string.digits + string.ascii_letters)[:max(1, min(62, size * size // 48))]
+    for _ in range(size * size // 12):
+        rows[rng.randrange(size)][rng.randrange(size)] = rng.choice(frequencies)
+    return "".join("".join(row) + "\n" for row in rows)
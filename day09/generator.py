@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with a disk map of size digits.
+
+import random
+
+DEFAULT_SIZE = 19999
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    # Alternate file lengths (never 0) and free space lengths, ending with a file.
+    size = max(size, 1) | 1
+    return "".join(str(rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9)) for i in range(size)) + "\n"
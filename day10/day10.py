@@ -2,49 +2,44 @@
 
 from pathlib import Path
 
-# Use None to signify impassable tiles.
-InputType = list[list[int | None]]
+from common.grid import Grid, translation
+
+# Cells hold each tile's height, or IMPASSABLE.
+IMPASSABLE = 255
+InputType = Grid
 ResultType = int
 
 
 def load(input_path: Path) -> InputType:
-    with open(input_path) as f:
-        return [[int(c) if c != "." else None for c in l.strip()] for l in f.readlines()]
+    return Grid.load(input_path, translation({".": IMPASSABLE} | {str(h): h for h in range(10)}))
 
 
 def part1(input_data: InputType) -> ResultType:
-    trailheads = [(row, col) for row, line in enumerate(input_data) for col, val in enumerate(line) if val == 0]
+    # Surround the map with impassable tiles, so trails never need bounds checks.
+    grid = input_data.padded(IMPASSABLE)
+    cells = grid.cells
+    offsets = grid.offsets
 
-    def trail_ends(row, col) -> set[tuple[int, int]]:
-        v = input_data[row][col]
-        if v is None:
-            return set()
+    def trail_ends(i: int) -> set[int]:
+        v = cells[i]
         if v == 9:
-            return {(row, col)}
+            return {i}
 
-        return set.union(set(), *[trail_ends(next_row, next_col) for next_row, next_col
-                    in [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]
-                    if 0 <= next_row < len(input_data)
-                    and 0 <= next_col < len(input_data[0])
-                    and input_data[next_row][next_col] == v + 1])
+        return set.union(set(), *[trail_ends(i + o) for o in offsets if cells[i + o] == v + 1])
 
-    return sum([len(trail_ends(*trailhead)) for trailhead in trailheads])
+    return sum([len(trail_ends(trailhead)) for trailhead in grid.find_all(0)])
 
 
 def part2(input_data: InputType) -> ResultType:
-    trailheads = [(row, col) for row, line in enumerate(input_data) for col, val in enumerate(line) if val == 0]
+    grid = input_data.padded(IMPASSABLE)
+    cells = grid.cells
+    offsets = grid.offsets
 
-    def trail_rating(row, col) -> int:
-        v = input_data[row][col]
-        if v is None:
-            return 0
+    def trail_rating(i: int) -> int:
+        v = cells[i]
         if v == 9:
             return 1
 
-        return sum([trail_rating(next_row, next_col) for next_row, next_col
-                    in [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]
-                    if 0 <= next_row < len(input_data)
-                    and 0 <= next_col < len(input_data[0])
-                    and input_data[next_row][next_col] == v + 1])
+        return sum([trail_rating(i + o) for o in offsets if cells[i + o] == v + 1])
 
-    return sum([trail_rating(*trailhead) for trailhead in trailheads])
+    return sum([trail_rating(trailhead) for trailhead in grid.find_all(0)])
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with a topographic map of size x size positions.
+
+from collections import deque
+import random
+
+DEFAULT_SIZE = 50
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    # Scatter peaks of height 9, with the land sloping down away from each, so trails lead from height 0 to the peaks.
+    height = [[-1] * size for _ in range(size)]
+    to_visit = deque()
+    for _ in range(max(1, size * size // 60)):
+        r, c = rng.randrange(size), rng.randrange(size)
+        if height[r][c] == -1:
+            height[r][c] = 9
+            to_visit.append((r, c))
+    while to_visit:
+        r, c = to_visit.popleft()
+        for nr, nc in [(r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)]:
+            if 0 <= nr < size and 0 <= nc < size and height[nr][nc] == -1:
+                height[nr][nc] = max(height[r][c] - 1, 0)
+                to_visit.append((nr, nc))
+
+    # Add some noise, so not every slope forms a trail.
+    for row in height:
+        for c in range(size):
+            if rng.random() < 0.05:
+                row[c] = rng.randint(0, 9)
+    return "".join("".join(map(str, row)) + "\n" for row in height)
@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
 
+from collections import Counter
 import math
 from pathlib import Path
 
+from common.engines import engine
+from common.memo import memoize, session
+
 InputType = list[int]
 ResultType = int
 
+# A stone's value and a number of blinks are packed into a single int memo key, with the blinks in the low BLINK_BITS
+# bits. Int keys take much less memory than (value, blinks) tuples (see common/memo.py).
+BLINK_BITS = 8
+BLINK_MASK = (1 << BLINK_BITS) - 1
+# Enough for any real input's distinct (value, blinks) pairs, while bounding the memo when it persists between solves.
+MEMO_ENTRIES = 1 << 18
+
 
 def load(input_path: Path) -> InputType:
     with open(input_path) as f:
@@ -14,37 +25,57 @@ def load(input_path: Path) -> InputType:
         return [int(n) for n in lines[0].strip().split()]
 
 
+@memoize("day11.stones", maxsize=MEMO_ENTRIES, persistent=True)
+def total_stones(key: int) -> int:
+    """Number of stones that a stone of value key >> BLINK_BITS becomes after key & BLINK_MASK blinks."""
+    b = key & BLINK_MASK
+    if b == 0:
+        return 1
+    v = key >> BLINK_BITS
+
+    if v == 0:
+        return total_stones(1 << BLINK_BITS | (b - 1))
+    num_digits = math.ceil(math.log10(v + 1))
+    if num_digits % 2 == 0:
+        m = 10 ** (num_digits // 2)
+        return total_stones((v // m) << BLINK_BITS | (b - 1)) + total_stones((v % m) << BLINK_BITS | (b - 1))
+    return total_stones((v * 2024) << BLINK_BITS | (b - 1))
+
+
 def part1(input_data: InputType, blinks: int = 25) -> ResultType:
-    # Memo of (stone value, blinks) -> number of stones.
-    memo: dict[tuple[int, int], int] = {}
-    def total_stones(v: int, b: int) -> int:
-        """
-        v: value of current stone.
-        b: number of blinks to simulate.
-        """
-        nonlocal memo
+    assert blinks <= BLINK_MASK
+    with session(total_stones):
+        return sum([total_stones(stone << BLINK_BITS | blinks) for stone in input_data])
 
-        if b == 0:
-            return 1
 
-        if (v, b) in memo:
-            return memo[(v, b)]
+def part2(input_data: InputType, blinks: int = 75) -> ResultType:
+    return part1(input_data, blinks)
 
-        if v == 0:
-            result = total_stones(1, b - 1)
-        else:
-            num_digits = math.ceil(math.log10(v + 1))
-            if num_digits % 2 == 0:
-                m = 10 ** (num_digits // 2)
-                result = total_stones(v // m, b - 1) + total_stones(v % m, b - 1)
-            else:
-                result = total_stones(v * 2024, b - 1)
-        memo[(v, b)] = result
-        return result
 
+def blink(stone: int) -> list[int]:
+    if stone == 0:
+        return [1]
+    num_digits = math.ceil(math.log10(stone + 1))
+    if num_digits % 2 == 0:
+        m = 10 ** (num_digits // 2)
+        return [stone // m, stone % m]
+    return [stone * 2024]
 
-    return sum([total_stones(stone, blinks) for stone in input_data])
 
+@engine("part1", "counts")
+def part1_counts(input_data: InputType, blinks: int = 25) -> ResultType:
+    """Count the stones of each value after each blink, instead of following each stone. Only a few thousand distinct
+    values appear, so this needs no memo, and works for any number of blinks."""
+    counts = Counter(input_data)
+    for _ in range(blinks):
+        next_counts = Counter()
+        for stone, count in counts.items():
+            for new_stone in blink(stone):
+                next_counts[new_stone] += count
+        counts = next_counts
+    return counts.total()
 
-def part2(input_data: InputType, blinks: int = 75) -> ResultType:
-    return part1(input_data, blinks)
+
+@engine("part2", "counts")
+def part2_counts(input_data: InputType, blinks: int = 75) -> ResultType:
+    return part1_counts(input_data, blinks)
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with size stones.
+
+import random
+
+DEFAULT_SIZE = 8
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    return " ".join(str(rng.choice([rng.randint(0, 9), rng.randint(0, 9999), rng.randint(0, 9999999)]))
+                    for _ in range(size)) + "\n"
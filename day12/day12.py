@@ -2,45 +2,43 @@
 
 from pathlib import Path
 
-InputType = list[str]
+from common.grid import Grid
+
+InputType = Grid
 ResultType = int
+# Cell value of the border added around the garden, which doesn't match any plant.
+BORDER = 0
 
 
 def load(input_path: Path) -> InputType:
-    with open(input_path) as f:
-        return [l.strip() for l in f.readlines()]
+    return Grid.load(input_path)
 
 
-def expand_region(input_data: InputType, start: tuple[int, int]) -> set[tuple[int, int]]:
-    width = len(input_data[0])
-    height = len(input_data)
+def expand_region(grid: Grid, start: int) -> set[int]:
+    cells = grid.cells
+    offsets = grid.offsets
 
-    to_check: set[tuple[int, int]] = {start}
-    checked: set[tuple[int, int]] = set()
-    result: set[tuple[int, int]] = set()
-    c = input_data[start[0]][start[1]]
+    to_check: list[int] = [start]
+    result: set[int] = {start}
+    c = cells[start]
 
     while to_check:
         p = to_check.pop()
-        if input_data[p[0]][p[1]] == c:
-            result.add(p)
-            for next_p in [(p[0] - 1, p[1]), (p[0] + 1, p[1]), (p[0], p[1] - 1), (p[0], p[1] + 1)]:
-                if 0 <= next_p[0] < height and 0 <= next_p[1] < width and next_p not in checked:
-                    to_check.add(next_p)
-        checked.add(p)
+        for next_p in [p + o for o in offsets]:
+            if cells[next_p] == c and next_p not in result:
+                result.add(next_p)
+                to_check.append(next_p)
 
     return result
 
-def find_regions(input_data: InputType) -> list[set[tuple[int, int]]]:
-    width = len(input_data[0])
-    height = len(input_data)
-
-    to_check = {(r, c) for r in range(height) for c in range(width)}
+def find_regions(grid: Grid) -> list[set[int]]:
+    """Regions of the given padded grid, as sets of cell ids."""
+    to_check = set(range(len(grid))) - set(grid.find_all(BORDER))
     regions = []
 
     while to_check:
         p = to_check.pop()
-        r = expand_region(input_data, p)
+        r = expand_region(grid, p)
         to_check -= r
         regions.append(r)
 
@@ -48,35 +46,43 @@ def find_regions(input_data: InputType) -> list[set[tuple[int, int]]]:
 
 
 def part1(input_data: InputType) -> ResultType:
-    def perimeter(r: set[tuple[int, int]]) -> int:
-        return sum([1 for p in r for adjacent
-                    in [(p[0] - 1, p[1]), (p[0] + 1, p[1]), (p[0], p[1] - 1), (p[0], p[1] + 1)]
-                    if adjacent not in r])
+    grid = input_data.padded(BORDER)
+    cells = grid.cells
+    offsets = grid.offsets
 
-    return sum([perimeter(r) * len(r) for r in find_regions(input_data)])
+    def perimeter(r: set[int]) -> int:
+        # Regions are maximal, so any adjacent tile with the same plant is in the region.
+        return sum([1 for p in r for o in offsets if cells[p + o] != cells[p]])
+
+    return sum([perimeter(r) * len(r) for r in find_regions(grid)])
 
 
 def part2(input_data: InputType) -> ResultType:
-    def count_sides(r: set[tuple[int, int]]) -> int:
+    grid = input_data.padded(BORDER)
+    offsets = grid.offsets
+
+    def count_sides(r: set[int]) -> int:
         result = 0
-        # Check top, bottom, left, and right edges.
-        for d in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+        # Check top, right, bottom, and left edges.
+        for d, o in enumerate(offsets):
             edges = set()
             for p in r:
                 # A tile in r forms part of an edge in a given direction, if the adjacent
                 # tile in that direction is not in r.
-                if (p[0] + d[0], p[1] + d[1]) not in r:
+                if p + o not in r:
                     edges.add(p)
+            # An edge tile is counted if it is at a specific end of the edge: the end reached by turning clockwise
+            # from the edge's direction.
+            # e.g. for top edges, if the tile to the right of the current edge tile isn't in edges,
+            # then the current tile is counted.
+            # For top edges, count only the right-most.
+            # For right edges, count only the lower-most.
+            # For bottom edges, count only the left-most.
+            # For left edges, count only the upper-most.
+            clockwise = offsets[(d + 1) % 4]
             for p in edges:
-                # An edge tile is counted if it is at a specific end of the edge.
-                # e.g. for top edges, if the tile to the right of the current edge tile isn't in edges,
-                # then the current tile is counted.
-                # For top edges, count only the right-most.
-                # For bottom edges, count only the left-most.
-                # For left edges, count only the upper-most.
-                # For right edges, count only the lower-most.
-                if (p[0] + d[1], p[1] - d[0]) not in edges:
+                if p + clockwise not in edges:
                     result += 1
         return result
 
-    return sum([count_sides(r) * len(r) for r in find_regions(input_data)])
+    return sum([count_sides(r) * len(r) for r in find_regions(grid)])
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with a garden of size x size plots.
+
+import random
+import string
+
+DEFAULT_SIZE = 140
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    # Copy plants from the plots to the left and above, so plants form regions of varied shape and size.
+    rows: list[list[str]] = []
+    for r in range(size):
+        row = []
+        for c in range(size):
+            plant = rng.choice(string.ascii_uppercase)
+            if c > 0 and rng.random() < 0.7:
+                plant = row[c - 1]
+            if r > 0 and rng.random() < 0.5:
+                plant = rows[r - 1][c]
+            row.append(plant)
+        rows.append(row)
+    return "".join("".join(row) + "\n" for row in rows)
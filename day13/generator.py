@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with size claw machines.
+
+import random
+
+DEFAULT_SIZE = 320
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    machines = []
+    for _ in range(size):
+        while True:
+            a = (rng.randint(10, 99), rng.randint(10, 99))
+            b = (rng.randint(10, 99), rng.randint(10, 99))
+            # Buttons moving the claw in the same direction would allow many ways to win.
+            if a[0] * b[1] != a[1] * b[0]:
+                break
+        if rng.random() < 0.6:
+            # A prize the claw can reach.
+            a_presses, b_presses = rng.randint(0, 100), rng.randint(0, 100)
+            prize = (a[0] * a_presses + b[0] * b_presses, a[1] * a_presses + b[1] * b_presses)
+        else:
+            prize = (rng.randint(1000, 20000), rng.randint(1000, 20000))
+        machines.append(f"Button A: X+{a[0]}, Y+{a[1]}\n"
+                        f"Button B: X+{b[0]}, Y+{b[1]}\n"
+                        f"Prize: X={prize[0]}, Y={prize[1]}\n")
+    return "\n".join(machines)
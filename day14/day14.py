@@ -28,11 +28,11 @@ def load(input_path: Path) -> InputType:
 
 def part1(input_data: InputType, area_width: int = 101, area_height: int = 103) -> ResultType:
     t = 100
-    for r in input_data:
-        r.pos = ((r.pos[0] + r.vel[0] * t) % area_width, (r.pos[1] + r.vel[1] * t) % area_height)
+    positions = [((r.pos[0] + r.vel[0] * t) % area_width, (r.pos[1] + r.vel[1] * t) % area_height)
+                 for r in input_data]
     assert area_width % 2 == 1 and area_height % 2 == 1
-    quadrants = [(r.pos[0] < area_width // 2, r.pos[1] < area_height // 2) for r in input_data
-                 if r.pos[0] != area_width // 2 and r.pos[1] != area_height // 2]
+    quadrants = [(x < area_width // 2, y < area_height // 2) for x, y in positions
+                 if x != area_width // 2 and y != area_height // 2]
     return math.prod([quadrants.count(q) for q in [(False, False), (False, True), (True, False), (True, True)]])
 
 
@@ -53,6 +53,9 @@ def part2(input_data: InputType, area_width: int = 101, area_height: int = 103)
     # In both the example and the puzzle input, all robots have the same period, which is therefore the overall period.
     # But we calculate the LCM, so that this will still work for sets of robots with different periods.
 
+    # Current position of each robot, in the same order as input_data.
+    positions = [r.pos for r in input_data]
+
     def closeness_rating() -> float:
         """Return the average 'closeness' of robots to each other.
 
@@ -68,7 +71,7 @@ def part2(input_data: InputType, area_width: int = 101, area_height: int = 103)
         Can be used as a measure of approximately how 'clumped together' the robots are."""
 
         # Set of all tiles occupied by at least one robot.
-        filled_cells = set([r.pos for r in input_data])
+        filled_cells = set(positions)
 
         # A list of the neighbourhoods of all filled cells.
         neighbourhoods = [[(nx, ny) for nx, ny in [(x-1, y-1), (x, y-1), (x+1, y-1),
@@ -93,10 +96,10 @@ def part2(input_data: InputType, area_width: int = 101, area_height: int = 103)
             best_closeness_t = t
 
             # Display robot layout:
-            #print("\n" + "\n".join(["".join(["*" if (x, y) in [r.pos for r in input_data] else "."
+            #print("\n" + "\n".join(["".join(["*" if (x, y) in positions else "."
             #                                 for x in range(area_width)]) for y in range(area_height)]))
 
-        for robot in input_data:
-            robot.pos = ((robot.pos[0] + robot.vel[0]) % area_width, (robot.pos[1] + robot.vel[1]) % area_height)
+        positions = [((x + robot.vel[0]) % area_width, (y + robot.vel[1]) % area_height)
+                     for (x, y), robot in zip(positions, input_data)]
 
     return best_closeness_t
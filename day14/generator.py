@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with size robots in the default 101 x 103 area.
+
+import random
+
+DEFAULT_SIZE = 500
+AREA_WIDTH = 101
+AREA_HEIGHT = 103
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    # Choose where each robot will be at a secret time, with a third of them packed into a square so that part 2 has a
+    # picture to find, then work backwards to their starting positions.
+    picture_time = rng.randrange(AREA_WIDTH * AREA_HEIGHT)
+    picture_side = max(1, int((size / 3) ** 0.5))
+    picture_x, picture_y = rng.randrange(AREA_WIDTH - picture_side), rng.randrange(AREA_HEIGHT - picture_side)
+    lines = []
+    for i in range(size):
+        if i < picture_side * picture_side:
+            x, y = picture_x + i % picture_side, picture_y + i // picture_side
+        else:
+            x, y = rng.randrange(AREA_WIDTH), rng.randrange(AREA_HEIGHT)
+        # Velocities must be non-zero in each direction, so every robot returns to its start after the same time.
+        vx = rng.choice([v for v in range(-AREA_WIDTH + 1, AREA_WIDTH) if v % AREA_WIDTH != 0])
+        vy = rng.choice([v for v in range(-AREA_HEIGHT + 1, AREA_HEIGHT) if v % AREA_HEIGHT != 0])
+        lines.append(f"p={(x - vx * picture_time) % AREA_WIDTH},{(y - vy * picture_time) % AREA_HEIGHT} v={vx},{vy}\n")
+    rng.shuffle(lines)
+    return "".join(lines)
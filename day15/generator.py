@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with a warehouse of size x size positions.
+
+import random
+
+DEFAULT_SIZE = 50
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    size = max(size, 3)
+    rows = [["#" if r in (0, size - 1) or c in (0, size - 1) else
+             rng.choices("#O.", weights=[5, 40, 55])[0] for c in range(size)] for r in range(size)]
+    rows[size // 2][size // 2] = "@"
+    # Move the robot about 8 times per position, as in the real input.
+    moves = "".join(rng.choice("<>^v") for _ in range(8 * size * size))
+    return ("".join("".join(row) + "\n" for row in rows) + "\n"
+            + "".join(moves[i:i + 1000] + "\n" for i in range(0, len(moves), 1000)))
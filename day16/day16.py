@@ -1,136 +1,94 @@
 #!/usr/bin/env python3
 
-from enum import Enum
+from collections.abc import Iterator
+from enum import IntEnum
 from pathlib import Path
 
-class Tile(Enum):
-    EMPTY = 0
-    WALL = 1
-    START = 2
-    END = 3
+from common.grid import Grid, RIGHT
+from common.search import dag_nodes, dijkstra
 
-InputType = list[list[Tile]]
+class Tile(IntEnum):
+    # Each tile's value is the character representing it in the input, so the map can be loaded without translation.
+    EMPTY = ord(".")
+    WALL = ord("#")
+    START = ord("S")
+    END = ord("E")
+
+InputType = Grid
 ResultType = int
 
 
 def load(input_path: Path) -> InputType:
-    with open(input_path) as f:
-        return [[{".": Tile.EMPTY,
-                  "#": Tile.WALL,
-                  "S": Tile.START,
-                  "E": Tile.END
-                  }[c] for c in line.strip()] for line in f.readlines()]
+    grid = Grid.load(input_path)
+    assert grid.only_contains(Tile)
+    return grid
 
 
 def part1(input_data: InputType) -> ResultType:
-    start_r, start_c = [(r, c) for r, row in enumerate(input_data) for c, tile in enumerate(row) if tile == Tile.START][0]
-    start_dr, start_dc = (0, 1)
-
-    # A node is (r, c, dr, dc).
-    NodeType = tuple[int, int, int, int]
-    # Node -> cost dictionary.
-    to_visit: dict[NodeType, int] = {(start_r, start_c, start_dr, start_dc): 0}
-    visited: set[NodeType] = set()
-
-    # Simple Dijkstra's Algorithm implementation.
-    # Could use A*, as using `cost to reach end tile, ignoring walls` is an admissible and consistent heuristic,
-    # but this simpler implementation is already sufficiently fast.
-    while to_visit:
-        current_node = min(to_visit, key=to_visit.get)
-        current_cost = to_visit[current_node]
-        del to_visit[current_node]
-        r, c, dr, dc = current_node
-        if input_data[r][c] == Tile.END:
-            return current_cost
-        visited.add(current_node)
-
+    cells = input_data.cells
+    offsets = input_data.offsets
+    end_r, end_c = input_data.row_col(input_data.find(Tile.END))
+
+    # A node is a cell id and a direction (an index into offsets), packed as cell * 4 + direction.
+    # The map is surrounded by walls, so moving between cells never needs bounds checks.
+    def neighbours(node: int) -> Iterator[tuple[int, int]]:
+        i, d = divmod(node, 4)
         # Move straight ahead.
-        if input_data[r + dr][c + dc] != Tile.WALL:
-            next_r = r + dr
-            next_c = c + dc
-            while (input_data[next_r - dc][next_c + dr] == Tile.WALL
-                   and input_data[next_r + dc][next_c - dr] == Tile.WALL
-                   and input_data[next_r + dr][next_c + dc] != Tile.WALL):
+        o = offsets[d]
+        if cells[i + o] != Tile.WALL:
+            left = offsets[(d + 3) % 4]
+            right = offsets[(d + 1) % 4]
+            next_i = i + o
+            dist = 1
+            while (cells[next_i + left] == Tile.WALL
+                   and cells[next_i + right] == Tile.WALL
+                   and cells[next_i + o] != Tile.WALL):
                 # If moving down a corridor, move all the way to the next junction / corner / dead end.
-                next_r += dr
-                next_c += dc
-            dist = abs((r - next_r) + (c - next_c))
-            next_node = (next_r, next_c, dr, dc)
-            next_cost = current_cost + dist
-            if next_node not in visited:
-                if next_node not in to_visit or to_visit[next_node] > next_cost:
-                    to_visit[next_node] = next_cost
-
+                next_i += o
+                dist += 1
+            yield next_i * 4 + d, dist
         # Turn left.
-        next_node = (r, c, -dc, dr)
-        if next_node not in visited:
-            if next_node not in to_visit or to_visit[next_node] > current_cost + 1000:
-                to_visit[next_node] = current_cost + 1000
+        yield i * 4 + (d + 3) % 4, 1000
         # Turn right.
-        next_node = (r, c, dc, -dr)
-        if next_node not in visited:
-            if next_node not in to_visit or to_visit[next_node] > current_cost + 1000:
-                to_visit[next_node] = current_cost + 1000
+        yield i * 4 + (d + 1) % 4, 1000
+
+    def distance_to_end(node: int) -> int:
+        # Cost to reach the end tile ignoring walls and turns, an admissible and consistent heuristic.
+        r, c = input_data.row_col(node // 4)
+        return abs(r - end_r) + abs(c - end_c)
 
-    assert False
+    result = dijkstra([input_data.find(Tile.START) * 4 + RIGHT], neighbours,
+                      is_target=lambda node: cells[node // 4] == Tile.END, heuristic=distance_to_end)
+    assert result.targets
+    return result.dist[result.targets[0]]
 
 def part2(input_data: InputType) -> ResultType:
     # Use the same approach as part 1, but for each node, track the set of nodes that precede it in any optimal paths.
-    start_r, start_c = [(r, c) for r, row in enumerate(input_data) for c, tile in enumerate(row) if tile == Tile.START][0]
-    start_dr, start_dc = (0, 1)
-
-    # A node is (r, c, dr, dc).
-    NodeType = tuple[int, int, int, int]
-    # Node -> cost, set of nodes that lead to this node in any optimal path.
-    to_visit: dict[NodeType, tuple[int, set[NodeType]]] = {(start_r, start_c, start_dr, start_dc): (0, set())}
-    # Node -> set of nodes that lead to this node in any optimal path.
-    visited: dict[NodeType, set[NodeType]] = {}
-
-    def add_to_visit(node: NodeType, cost: int, source: NodeType):
-        if node not in visited:
-            if node in to_visit:
-                if to_visit[node][0] == cost:
-                    to_visit[node][1].add(source)
-                elif to_visit[node][0] > cost:
-                    to_visit[node] = (cost, {source})
-            else:
-                to_visit[node] = (cost, {source})
-
-    def count_path_cells(end_r: int, end_c: int) -> int:
-        to_check: set[NodeType] = {end_node for end_node in visited if end_node[0] == end_r and end_node[1] == end_c}
-        checked: set[NodeType] = set()
-        while to_check:
-            check_node = to_check.pop()
-            checked.add(check_node)
-            for check_predecessor in visited[check_node]:
-                if check_predecessor not in checked:
-                    to_check.add(check_predecessor)
-
-        path_nodes = {(c_r, c_c) for c_r, c_c, _, _ in checked}
-        # Print the best paths through the map.
-        # print("\n".join(["".join(["#" if tile == Tile.WALL else "O" if (r, c) in path_nodes else "."
-        #                           for c, tile in enumerate(row)]) for r, row in enumerate(input_data)]))
-        return len(path_nodes)
-
-    while to_visit:
-        current_node = min(to_visit, key=lambda x: to_visit[x][0])
-        current_cost, source_nodes = to_visit[current_node]
-        del to_visit[current_node]
-        r, c, dr, dc = current_node
-        visited[current_node] = source_nodes
-
-        if (input_data[r][c] == Tile.END
-                and Tile.END not in [input_data[pending_node[0]][pending_node[1]] for pending_node in to_visit.keys()]):
-            return count_path_cells(r, c)
+    cells = input_data.cells
+    offsets = input_data.offsets
 
+    # A node is a cell id and a direction, packed as in part 1.
+    def neighbours(node: int) -> Iterator[tuple[int, int]]:
+        i, d = divmod(node, 4)
         # Move straight ahead.
-        # Only move one tile, as we want all the path tiles to appear in visited, so the final count is correct.
-        if input_data[r + dr][c + dc] != Tile.WALL:
-            add_to_visit((r + dr, c + dc, dr, dc), current_cost + 1, current_node)
-
+        # Only move one tile, as we want all the path tiles to appear in the predecessors, so the final count is
+        # correct.
+        if cells[i + offsets[d]] != Tile.WALL:
+            yield (i + offsets[d]) * 4 + d, 1
         # Turn left.
-        add_to_visit((r, c, -dc, dr), current_cost + 1000, current_node)
+        yield i * 4 + (d + 3) % 4, 1000
         # Turn right.
-        add_to_visit((r, c, dc, -dr), current_cost + 1000, current_node)
-
-    assert False
+        yield i * 4 + (d + 1) % 4, 1000
+
+    # The search continues until all nodes costing no more than the first end node reached are found, so targets
+    # holds the end tile in each direction it can be optimally reached from.
+    result = dijkstra([input_data.find(Tile.START) * 4 + RIGHT], neighbours,
+                      is_target=lambda node: cells[node // 4] == Tile.END, predecessors=True)
+    assert result.targets
+    path_cells = {node // 4 for node in dag_nodes(result.predecessors, result.targets)}
+    # Print the best paths through the map.
+    # path_map = input_data.copy()
+    # for i in path_cells:
+    #     path_map[i] = ord("O")
+    # print(b"\n".join(path_map.rows()).decode())
+    return len(path_cells)
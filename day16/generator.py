@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with a maze of size x size tiles.
+
+import random
+
+DEFAULT_SIZE = 141
+
+
+def maze(size: int, rng: random.Random, loop_chance: float) -> list[list[str]]:
+    """A maze with walls around its edges and one tile thick walls between corridors, which is a tree, apart from
+    removing each wall that separates two corridors with probability loop_chance.
+    size is rounded up to an odd number."""
+    size = max(size, 5) | 1
+    rows = [["#"] * size for _ in range(size)]
+    # Carve the maze with a randomised depth-first search over the tiles with odd coordinates.
+    rows[1][1] = "."
+    stack = [(1, 1)]
+    while stack:
+        r, c = stack[-1]
+        unvisited = [(r + dr, c + dc) for dr, dc in [(-2, 0), (2, 0), (0, -2), (0, 2)]
+                     if 0 < r + dr < size - 1 and 0 < c + dc < size - 1 and rows[r + dr][c + dc] == "#"]
+        if not unvisited:
+            stack.pop()
+            continue
+        nr, nc = rng.choice(unvisited)
+        rows[(r + nr) // 2][(c + nc) // 2] = "."
+        rows[nr][nc] = "."
+        stack.append((nr, nc))
+
+    for r in range(1, size - 1):
+        for c in range(1, size - 1):
+            if (rows[r][c] == "#" and rng.random() < loop_chance
+                    and (rows[r - 1][c] == rows[r + 1][c] == "." or rows[r][c - 1] == rows[r][c + 1] == ".")):
+                rows[r][c] = "."
+    return rows
+
+
+def generate(size: int, seed: int) -> str:
+    rows = maze(size, random.Random(seed), 0.1)
+    rows[-2][1] = "S"
+    rows[1][-2] = "E"
+    return "".join("".join(row) + "\n" for row in rows)
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with register A holding a size bit number, so part 1 runs the program's loop
+# size / 3 times.
+# Part 2 only supports the program in the real input, so every input uses that program, and part 2 doesn't depend on
+# size.
+
+import random
+
+DEFAULT_SIZE = 48
+PROGRAM = [2, 4, 1, 5, 7, 5, 1, 6, 0, 3, 4, 3, 5, 5, 3, 0]
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    register_a = rng.getrandbits(max(size, 1)) | (1 << (max(size, 1) - 1))
+    return (f"Register A: {register_a}\n"
+            f"Register B: 0\n"
+            f"Register C: 0\n"
+            f"\n"
+            f"Program: {','.join(map(str, PROGRAM))}\n")
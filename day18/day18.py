@@ -2,6 +2,12 @@
 
 from pathlib import Path
 
+from common.grid import Grid
+from common.search import bfs
+
+# Cell values of the memory space.
+SAFE = 0
+CORRUPTED = 1
 InputType = list[tuple[int, int]]
 ResultType1 = int
 ResultType2 = str
@@ -15,36 +21,23 @@ def load(input_path: Path) -> InputType:
 def length_to_exit(corrupted_bytes: InputType, coord_max: int) -> int | None:
     # Return the length of the path to the exit after the given simulated bytes have been corrupted, or None if no
     # path is possible.
-    mem: list[list[bool]] = [[False for _ in range(coord_max + 1)] for _ in range(coord_max + 1)]
+    # Surround the memory space with corrupted cells, so moving between cells never needs bounds checks.
+    mem = Grid(coord_max + 1, coord_max + 1, fill=SAFE).padded(CORRUPTED)
     # Simulate memory corruption.
     for x, y in corrupted_bytes:
-        mem[y][x] = True
+        mem[mem.id(y + 1, x + 1)] = CORRUPTED
 
     # Print memory state.
-    # print("\n".join(["".join("#" if x else "." for x in line) for line in mem]))
-
-    # Find length of shortest path to exit using Dijkstra's Algorithm.
-    # {(x, y): cost}.
-    to_visit: dict[tuple[int, int], int] = {(0, 0): 0}
-    # {(x, y)}.
-    visited: set[tuple[int, int]] = set()
-    while to_visit:
-        x, y = min(to_visit, key=to_visit.get)
-        cost = to_visit[(x, y)]
-        del to_visit[(x, y)]
-        if (x, y) == (coord_max, coord_max):
-            return cost
-        visited.add((x, y))
-        for next_x, next_y in [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]:
-            if (0 <= next_x <= coord_max
-                    and 0 <= next_y <= coord_max
-                    and (next_x, next_y) not in visited
-                    and not mem[next_y][next_x]):
-                if (next_x, next_y) not in to_visit or to_visit[(next_x, next_y)] > cost + 1:
-                    to_visit[(next_x, next_y)] = cost + 1
-
-    # If this is reached, no path exists to the exit.
-    return None
+    # print("\n".join(["".join("#" if x else "." for x in line) for line in mem.rows()]))
+
+    start = mem.id(1, 1)
+    end = mem.id(coord_max + 1, coord_max + 1)
+    cells = mem.cells
+    offsets = mem.offsets
+    # Find length of shortest path to exit using a breadth-first search, as every step costs 1.
+    result = bfs([start], lambda i: (i + o for o in offsets if cells[i + o] == SAFE), is_target=end.__eq__)
+    # If the exit wasn't reached, no path exists to the exit.
+    return result.dist.get(end)
 
 
 def part1(input_data: InputType, coord_max: int = 70, simulated_bytes: int = 1024) -> ResultType1:
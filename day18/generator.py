@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with bytes falling into a memory space of size x size positions.
+# Solve with the extra arguments given by extra_args.
+
+import random
+
+DEFAULT_SIZE = 71
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    size = max(size, 2)
+    positions = [(x, y) for y in range(size) for x in range(size) if (x, y) not in [(0, 0), (size - 1, size - 1)]]
+    # After the number of bytes simulated in part 1, the exit must still be reachable.
+    while True:
+        rng.shuffle(positions)
+        if exit_reachable(size, set(positions[:extra_args(size, 1)["simulated_bytes"]])):
+            break
+    # Corrupting 65% of the memory space is almost certain to block the exit, as part 2 requires.
+    return "".join(f"{x},{y}\n" for x, y in positions[:len(positions) * 65 // 100])
+
+
+def exit_reachable(size: int, corrupted: set[tuple[int, int]]) -> bool:
+    to_visit = [(0, 0)]
+    reached = {(0, 0)}
+    while to_visit:
+        x, y = to_visit.pop()
+        for next_pos in [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]:
+            if (0 <= next_pos[0] < size and 0 <= next_pos[1] < size
+                    and next_pos not in corrupted and next_pos not in reached):
+                reached.add(next_pos)
+                to_visit.append(next_pos)
+    return (size - 1, size - 1) in reached
+
+
+def extra_args(size: int, part: int) -> dict[str, int | str]:
+    """Extra arguments for solving the given part of a generated input. Part 1 simulates 20% of the memory space
+    being corrupted."""
+    size = max(size, 2)
+    return {"coord_max": size - 1} | ({"simulated_bytes": (size * size - 2) // 5} if part == 1 else {})
@@ -2,9 +2,14 @@
 
 from pathlib import Path
 
+from common.memo import memoize, session
+
 InputType = tuple[list[str], list[str]]
 ResultType = int
 
+# Each pattern only needs its own suffixes memoised, so evicting other patterns' suffixes just costs some repeated work.
+MEMO_ENTRIES = 1 << 16
+
 
 def load(input_path: Path) -> InputType:
     with open(input_path) as f:
@@ -16,36 +21,24 @@ def load(input_path: Path) -> InputType:
 def part1(input_data: InputType) -> ResultType:
     towels, patterns = input_data
 
-    memo: dict[str, bool] = {}
+    @memoize("day19.possible", maxsize=MEMO_ENTRIES)
     def pattern_possible(p: str) -> bool:
-        nonlocal memo
         if not p:
             return True
+        return any([pattern_possible(p[len(t):]) for t in towels if p.startswith(t)])
 
-        if p in memo:
-            return memo[p]
-
-        result = any([pattern_possible(p[len(t):]) for t in towels if p.startswith(t)])
-        memo[p] = result
-        return result
-
-    return sum([1 for pattern in patterns if pattern_possible(pattern)])
+    with session(pattern_possible):
+        return sum([1 for pattern in patterns if pattern_possible(pattern)])
 
 
 def part2(input_data: InputType) -> ResultType:
     towels, patterns = input_data
 
-    memo: dict[str, int] = {}
+    @memoize("day19.ways", maxsize=MEMO_ENTRIES)
     def ways_to_make(p: str) -> int:
-        nonlocal memo
         if not p:
             return 1
+        return sum([ways_to_make(p[len(t):]) for t in towels if p.startswith(t)])
 
-        if p in memo:
-            return memo[p]
-
-        result = sum([ways_to_make(p[len(t):]) for t in towels if p.startswith(t)])
-        memo[p] = result
-        return result
-
-    return sum([ways_to_make(pattern) for pattern in patterns])
+    with session(ways_to_make):
+        return sum([ways_to_make(pattern) for pattern in patterns])
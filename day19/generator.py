@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with size designs.
+
+import random
+
+DEFAULT_SIZE = 400
+COLOURS = "wubrg"
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    towels = sorted({"".join(rng.choice(COLOURS) for _ in range(rng.randint(1, 8))) for _ in range(450)})
+    # Leave out one single stripe towel, so not every design is possible.
+    towels = [t for t in towels if t != "b"]
+    designs = []
+    for _ in range(size):
+        design = ""
+        while len(design) < rng.randint(20, 60):
+            design += rng.choice(towels)
+        if rng.random() < 0.3:
+            # Possibly impossible.
+            design += "b" * rng.randint(1, 3)
+        designs.append(design)
+    return ", ".join(towels) + "\n\n" + "".join(design + "\n" for design in designs)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with a racetrack on a map of size x size positions.
+
+from collections import deque
+import random
+
+from day16.generator import maze
+
+DEFAULT_SIZE = 141
+
+
+def generate(size: int, seed: int) -> str:
+    # A maze without loops has a single path between any two positions. Keep only the path from start to end as the
+    # track, leaving thin walls between its parts to cheat through.
+    rows = maze(size, random.Random(seed), 0)
+    size = len(rows)
+    start, end = (size - 2, 1), (1, size - 2)
+    previous = {start: None}
+    to_visit = deque([start])
+    while to_visit:
+        r, c = to_visit.popleft()
+        for next_pos in [(r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)]:
+            if rows[next_pos[0]][next_pos[1]] == "." and next_pos not in previous:
+                previous[next_pos] = (r, c)
+                to_visit.append(next_pos)
+
+    track = [["#"] * size for _ in range(size)]
+    pos = end
+    while pos is not None:
+        track[pos[0]][pos[1]] = "."
+        pos = previous[pos]
+    track[start[0]][start[1]] = "S"
+    track[end[0]][end[1]] = "E"
+    return "".join("".join(row) + "\n" for row in track)
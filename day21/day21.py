@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from enum import Enum
 import itertools
 from pathlib import Path
 
+from common.memo import memoize, session
+from common.search import dijkstra
+
 InputType = list[str]
 ResultType = int
 
@@ -104,65 +107,53 @@ def calculate_table[
     SearchState = tuple[DirKey, KeyType]
     assert (robot_index == 0) == (prev_table is None)
 
+    def neighbours(state: SearchState) -> Iterator[tuple[SearchState, int]]:
+        previous_robot_key, current_key = state
+        # Try actuating the previous robot's key, to move the current robot.
+        if previous_robot_key is not DirKey.A and next_key_function(current_key, previous_robot_key) is not None:
+            yield (previous_robot_key, next_key_function(current_key, previous_robot_key)), 1
+
+        # Try moving the previous robot to another key.
+        for target_prev_robot_key in DirKey:
+            if target_prev_robot_key == previous_robot_key:
+                continue
+            if robot_index == 0:
+                # If this is the first robot, the 'previous robot' is the manually actuated directional pad,
+                # which can press any key without the cost of moving between them.
+                yield (target_prev_robot_key, current_key), 0
+            else:
+                yield (target_prev_robot_key, current_key), prev_table[(previous_robot_key, target_prev_robot_key)]
+
     for start_key in key_possibilities:
-        end_keys_pending = {key for key in key_possibilities}
-        # {search_state: cost_to_reach}
-        to_visit: dict[SearchState, int] = {(DirKey.A, start_key): 0}
-        # {search_state}
-        visited: set[SearchState] = set()
-
-        while end_keys_pending and to_visit:
-            previous_robot_key, current_key = min(to_visit, key=lambda k: to_visit[k])
-            current_cost = to_visit[(previous_robot_key, current_key)]
-            del to_visit[(previous_robot_key, current_key)]
-            visited.add((previous_robot_key, current_key))
-            if previous_robot_key == DirKey.A and current_key in end_keys_pending:
-                result[(start_key, current_key)] = current_cost
-                end_keys_pending.remove(current_key)
-
-            # Try actuating the previous robot's key, to move the current robot.
-            if previous_robot_key is not DirKey.A and next_key_function(current_key, previous_robot_key) is not None:
-                next_state = (previous_robot_key, next_key_function(current_key, previous_robot_key))
-                next_cost = current_cost + 1
-                if next_state not in visited and (next_state not in to_visit or to_visit[next_state] > next_cost):
-                    to_visit[next_state] = next_cost
-
-            # Try moving the previous robot to another key.
-            for target_prev_robot_key in DirKey:
-                if target_prev_robot_key == previous_robot_key:
-                    continue
-                next_state = (target_prev_robot_key, current_key)
-                if robot_index == 0:
-                    # If this is the first robot, the 'previous robot' is the manually actuated directional pad,
-                    # which can press any key without the cost of moving between them.
-                    next_cost = current_cost
-                else:
-                    next_cost = current_cost + prev_table[(previous_robot_key, target_prev_robot_key)]
-                if next_state not in visited and (next_state not in to_visit or to_visit[next_state] > next_cost):
-                    to_visit[next_state] = next_cost
-
-        assert not end_keys_pending
+        # The search space is small, so search it all rather than stopping once every end key is reached.
+        dist = dijkstra([(DirKey.A, start_key)], neighbours).dist
+        for end_key in key_possibilities:
+            result[(start_key, end_key)] = dist[(DirKey.A, end_key)]
 
     # Cost of transitioning between any two keys should have been calculated.
     assert len(result) == len(key_possibilities) ** 2
     return result
 
 
-def calculate_dir_pad_table(prev_table: DirPadTable, robot_index: int) -> DirPadTable:
+@memoize("day21.dir_pad_table", persistent=True)
+def dir_pad_table(robot_index: int) -> DirPadTable:
+    """Costs of moving the directional pad robot at robot_index in the chain. Each robot's table is built from the
+    previous robot's, so part 2's chain of robots reuses part 1's, and every code reuses the same tables."""
+    prev_table = dir_pad_table(robot_index - 1) if robot_index > 0 else None
     return calculate_table(next_dir_key, set(DirKey), prev_table, robot_index)
 
 
-def calculate_num_pad_table(prev_table: DirPadTable, robot_index: int) -> NumPadTable:
-    return calculate_table(next_num_key, set(range(10)) | {AKey}, prev_table, robot_index)
+@memoize("day21.num_pad_table", persistent=True)
+def num_pad_table(dir_pad_robot_count: int) -> NumPadTable:
+    """Costs of moving the number pad robot, controlled by a chain of dir_pad_robot_count directional pad robots."""
+    prev_table = dir_pad_table(dir_pad_robot_count - 1) if dir_pad_robot_count > 0 else None
+    return calculate_table(next_num_key, set(range(10)) | {AKey}, prev_table, dir_pad_robot_count)
 
 
 def shortest_sequence(code: str, dir_pad_robot_count: int) -> int:
     """Find the length of the shortest sequence of manual button presses to input the required code into the numeric
     keypad."""
-    robot_movement_table = None
-    for i in range(dir_pad_robot_count):
-        robot_movement_table = calculate_dir_pad_table(robot_movement_table, i)
-    robot_movement_table = calculate_num_pad_table(robot_movement_table, dir_pad_robot_count)
+    robot_movement_table = num_pad_table(dir_pad_robot_count)
 
     # Add up the cost of transitioning to each next numpad key, and the cost of pressing each key.
     return sum(
@@ -174,9 +165,11 @@ def shortest_sequence(code: str, dir_pad_robot_count: int) -> int:
 
 def part1(input_data: InputType) -> ResultType:
     assert all([x.endswith("A") and x[:-1].isnumeric() for x in input_data])
-    return sum([int(x[:-1]) * shortest_sequence(x, 2) for x in input_data])
+    with session(dir_pad_table, num_pad_table):
+        return sum([int(x[:-1]) * shortest_sequence(x, 2) for x in input_data])
 
 
 def part2(input_data: InputType) -> ResultType:
     assert all([x.endswith("A") and x[:-1].isnumeric() for x in input_data])
-    return sum([int(x[:-1]) * shortest_sequence(x, 25) for x in input_data])
+    with session(dir_pad_table, num_pad_table):
+        return sum([int(x[:-1]) * shortest_sequence(x, 25) for x in input_data])
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with size door codes.
+
+import random
+
+DEFAULT_SIZE = 5
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    return "".join(f"{rng.randrange(1000):03}A\n" for _ in range(size))
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with size buyers' initial secret numbers.
+
+import random
+
+DEFAULT_SIZE = 2000
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    return "".join(f"{rng.randrange(1, 1 << 24)}\n" for _ in range(size))
@@ -4,6 +4,8 @@ import collections
 import itertools
 from pathlib import Path
 
+from common import checkpoint
+
 InputType = list[tuple[str, str]]
 ResultType1 = int
 ResultType2 = str
@@ -31,23 +33,39 @@ def part1(input_data: InputType) -> ResultType1:
 
 
 def largest_complete_subgraph(graph: dict[str: set[str]], assumed_in_subgraph: set[str]) -> set[str]:
-    if len(assumed_in_subgraph) == len(graph):
-        assert set(graph.keys()) == assumed_in_subgraph
-        return assumed_in_subgraph
-
-    # Choose any node not yet assumed to be in the subgraph, and find the largest subgraphs if we assume n is
-    # included / excluded respectively.
-    n = next(iter(set(graph.keys()) - assumed_in_subgraph))
-    subgraph_with_n = largest_complete_subgraph({k: {n2 for n2 in v if n in graph[n2]}
-                                                 for k, v in graph.items()
-                                                 if k == n or n in graph[k]},
-                                                assumed_in_subgraph | {n})
-    subgraph_without_n = largest_complete_subgraph({k: v - {n}
-                                                    for k, v in graph.items()
-                                                    if k != n},
-                                                   assumed_in_subgraph)
-
-    return max(subgraph_with_n, subgraph_without_n, key=len)
+    # Depth first search over the subgraphs found by choosing a node not yet assumed to be in the subgraph, and assuming
+    # it is included / excluded respectively, with the frontier kept in an explicit stack so a large graph doesn't
+    # exceed the recursion limit, and the search can be checkpointed.
+    # Each entry is (graph, assumed_in_subgraph, excluded_node). If excluded_node isn't None, the entry stands for
+    # graph without that node, which is only built once the entry is reached, to keep the frontier small.
+    # The first largest subgraph found is kept, as the included branch is searched first.
+    frontier: list[tuple[dict[str: set[str]], set[str], str | None]] = [(graph, assumed_in_subgraph, None)]
+    largest: set[str] | None = None
+    # Resume the search from an earlier run's frontier, if it saved a checkpoint.
+    if (saved := checkpoint.load()) is not None:
+        frontier, largest = saved
+
+    while frontier:
+        graph, assumed_in_subgraph, excluded_node = frontier.pop()
+        if excluded_node is not None:
+            graph = {k: v - {excluded_node} for k, v in graph.items() if k != excluded_node}
+
+        if len(assumed_in_subgraph) == len(graph):
+            assert set(graph.keys()) == assumed_in_subgraph
+            if largest is None or len(assumed_in_subgraph) > len(largest):
+                largest = assumed_in_subgraph
+        else:
+            n = next(iter(set(graph.keys()) - assumed_in_subgraph))
+            frontier.append((graph, assumed_in_subgraph, n))
+            frontier.append(({k: {n2 for n2 in v if n in graph[n2]}
+                              for k, v in graph.items()
+                              if k == n or n in graph[k]},
+                             assumed_in_subgraph | {n}, None))
+
+        if checkpoint.due():
+            checkpoint.save((frontier, largest))
+
+    return largest
 
 
 def part2(input_data: InputType) -> ResultType2:
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with a network of size computers.
+
+import itertools
+import math
+import random
+import string
+
+DEFAULT_SIZE = 520
+DEGREE = 13
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    size = max(size, DEGREE + 1)
+    # Names are two letters, as in the real input, or longer if there are too many computers for that.
+    name_length = max(2, math.ceil(math.log(size, 26)))
+    names = ["".join(letters) for letters in rng.sample(list(itertools.product(string.ascii_lowercase,
+                                                                               repeat=name_length)), size)]
+
+    # Random connections between computers, and a LAN party where all computers are connected to each other, which is
+    # far larger than any group of computers connected at random.
+    connections = set()
+    while len(connections) < size * (DEGREE - 1) // 2:
+        a, b = rng.sample(names, 2)
+        connections.add((min(a, b), max(a, b)))
+    connections |= set(itertools.combinations(sorted(rng.sample(names, DEGREE)), 2))
+
+    connections = [(a, b) if rng.random() < 0.5 else (b, a) for a, b in sorted(connections)]
+    rng.shuffle(connections)
+    return "".join(f"{a}-{b}\n" for a, b in connections)
@@ -6,6 +6,8 @@ from pathlib import Path
 import re
 from typing import Generator
 
+from common import checkpoint, counters
+
 
 class Gate(Enum):
     AND = 0
@@ -196,9 +198,11 @@ def part2(input_data: InputType, num_gate_swaps = 4, expected_result ="sum") ->
             # Count number of incorrect wires still not accounted for.
             remaining_swapped_wires = num_gate_swaps * 2 - len(incorrect_wires)
             # Find all possible results that include incorrect_wires.
+            # Candidates are generated in sorted order, not set order, which varies between processes, so a checkpoint
+            # of how many have been tested can be resumed by another process.
             swapped_wire_possibilities = (incorrect_wires | set(test_incorrect_set) for test_incorrect_set in
                                           itertools.combinations(
-                                              (o for _, _, _, o in gates if o not in incorrect_wires),
+                                              sorted(o for _, _, _, o in gates if o not in incorrect_wires),
                                               remaining_swapped_wires))
 
             def all_possible_pairs(xs: set[str]) -> Generator[set[tuple[str, str]], None, None]:
@@ -211,8 +215,8 @@ def part2(input_data: InputType, num_gate_swaps = 4, expected_result ="sum") ->
                 """
                 assert len(xs) % 2 == 0
                 if len(xs) > 0:
-                    a = next(iter(xs))
-                    for b in (xs - {a}):
+                    a = min(xs)
+                    for b in sorted(xs - {a}):
                         for other_pairs in all_possible_pairs(xs - {a, b}):
                             yield {(a, b)} | other_pairs
                 else:
@@ -256,12 +260,19 @@ def part2(input_data: InputType, num_gate_swaps = 4, expected_result ="sum") ->
 
                 return True
 
-            for swapped_wires_under_test in swapped_wire_possibilities:
-                for swapped_pairs_under_test in all_possible_pairs(swapped_wires_under_test):
-                    swaps = {a: b for x, y in swapped_pairs_under_test for a, b in ((x, y), (y, x))}
-                    swapped_gates = {(g, i1, i2, swaps[o]) if o in swaps else (g, i1, i2, o) for g, i1, i2, o in gates}
-                    if test_swapped_circuit(swapped_gates):
-                        return ",".join(sorted(swapped_wires_under_test))
+            swap_sets = ((swapped_wires, swapped_pairs) for swapped_wires in swapped_wire_possibilities
+                         for swapped_pairs in all_possible_pairs(swapped_wires))
+            # Resume after the swap sets tested by an earlier run, if it saved a checkpoint.
+            tested = checkpoint.load() or 0
+            for swapped_wires_under_test, swapped_pairs_under_test in itertools.islice(swap_sets, tested, None):
+                swaps = {a: b for x, y in swapped_pairs_under_test for a, b in ((x, y), (y, x))}
+                swapped_gates = {(g, i1, i2, swaps[o]) if o in swaps else (g, i1, i2, o) for g, i1, i2, o in gates}
+                tested += 1
+                if test_swapped_circuit(swapped_gates):
+                    counters.add("day24.swap_sets_tested", tested)
+                    return ",".join(sorted(swapped_wires_under_test))
+                if checkpoint.due():
+                    checkpoint.save(tested)
 
             # One of the above swapped_wires_under_test should have worked.
             assert False
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with a circuit adding two size bit numbers, which has had four pairs of gate outputs
+# swapped.
+
+import itertools
+import random
+import string
+
+DEFAULT_SIZE = 45
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    bits = max(size, 6)
+    # Names for the internal wires, which mustn't start with x, y or z.
+    names = iter(rng.sample(["".join(letters) for letters in itertools.product(string.ascii_lowercase[:23], repeat=3)],
+                            5 * bits))
+
+    # A ripple carry adder, as in the real input: a half adder for bit 0, and a full adder for each other bit.
+    # Full adder gates are (xor_in, and_in, xor_out, and_carry, or_carry), each a list of
+    # [gate, input1, input2, output].
+    half_adder = [["XOR", "x00", "y00", "z00"], ["AND", "x00", "y00", next(names)]]
+    full_adders = []
+    carry = half_adder[1][3]
+    for bit in range(1, bits):
+        xor_in = ["XOR", f"x{bit:02}", f"y{bit:02}", next(names)]
+        and_in = ["AND", f"x{bit:02}", f"y{bit:02}", next(names)]
+        xor_out = ["XOR", xor_in[3], carry, f"z{bit:02}"]
+        and_carry = ["AND", xor_in[3], carry, next(names)]
+        or_carry = ["OR", and_in[3], and_carry[3], f"z{bits:02}" if bit == bits - 1 else next(names)]
+        full_adders.append((xor_in, and_in, xor_out, and_carry, or_carry))
+        carry = or_carry[3]
+
+    # Swap outputs within the full adders of four different bits, in the ways the real input does.
+    # Swapping the outputs of the two input gates is the hardest to detect, so happens at most once.
+    kinds = ["inputs"] + [rng.choice(["and_carry", "or_carry"]) for _ in range(3)]
+    for bit, kind in zip(rng.sample(range(1, bits - 1), 4), kinds):
+        xor_in, and_in, xor_out, and_carry, or_carry = full_adders[bit - 1]
+        a, b = {"inputs": (xor_in, and_in), "and_carry": (xor_out, and_carry), "or_carry": (xor_out, or_carry)}[kind]
+        a[3], b[3] = b[3], a[3]
+
+    gates = half_adder + [gate for full_adder in full_adders for gate in full_adder]
+    lines = [f"{i1} {g} {i2} -> {o}\n" if rng.random() < 0.5 else f"{i2} {g} {i1} -> {o}\n" for g, i1, i2, o in gates]
+    rng.shuffle(lines)
+    return ("".join(f"x{bit:02}: {rng.randint(0, 1)}\n" for bit in range(bits))
+            + "".join(f"y{bit:02}: {rng.randint(0, 1)}\n" for bit in range(bits))
+            + "\n" + "".join(lines))
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+
+# Generate inputs for benchmarking, with size lock and key schematics.
+
+import random
+
+DEFAULT_SIZE = 500
+
+
+def generate(size: int, seed: int) -> str:
+    rng = random.Random(seed)
+    schematics = []
+    for _ in range(size):
+        heights = [rng.randint(0, 5) for _ in range(5)]
+        is_lock = rng.random() < 0.5
+        rows = ["".join("#" if (row <= heights[c] if is_lock else 6 - row <= heights[c]) else "." for c in range(5))
+                for row in range(1, 6)]
+        schematics.append("\n".join(["#####" if is_lock else "....."] + rows
+                                    + ["....." if is_lock else "#####"]) + "\n")
+    return "\n".join(schematics)
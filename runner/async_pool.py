@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+# Solve puzzle cases from asyncio code, without blocking the event loop.
+# Each case is solved in a worker process (see runner/pool.py), dispatched through loop.run_in_executor, with at most
+# max_concurrency cases submitted at a time. Results are yielded as each case finishes.
+# Cancelling the task iterating over run_puzzles, or leaving the loop early, cancels the cases that haven't started.
+# Cases already running in a worker process can't be interrupted, so finish in the background and their results are
+# discarded; enable time limits (see runner/limits.py) to bound how long that can take.
+# Usage:
+#     async for case, result, timings in run_puzzles(aoc2024.find_cases([6, 16]), max_concurrency=4):
+#         print(case.name, result)
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+import os
+from typing import AsyncIterator, Iterable
+
+import aoc2024
+from runner import pool
+
+
+async def run_puzzles(jobs: Iterable[aoc2024.PuzzleCase], max_concurrency: int | None = None,
+                      executor: Executor | None = None) -> AsyncIterator[pool.CaseResult]:
+    """Solve each job, yielding (job, result, timings) as each finishes. As in runner/pool.py, result is the exception
+    raised if the job failed, and timings is None if the job failed or its answer came from the answer cache.
+
+    max_concurrency -- Maximum number of jobs submitted to the executor at once (default: number of CPUs).
+    executor -- Executor to solve the jobs in. By default, a process pool of max_concurrency workers is started, and
+        shut down once all jobs have finished or the iteration is stopped.
+    """
+    loop = asyncio.get_running_loop()
+    max_concurrency = max_concurrency or os.cpu_count() or 1
+    own_executor = executor is None
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=max_concurrency)
+    jobs = iter(jobs)
+    running: set[asyncio.Future[pool.CaseResult]] = set()
+    try:
+        while True:
+            # Keep up to max_concurrency jobs submitted, taking further jobs only as earlier ones finish.
+            while len(running) < max_concurrency and (job := next(jobs, None)) is not None:
+                running.add(loop.run_in_executor(executor, pool.solve_case, job))
+            if not running:
+                break
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        for future in running:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
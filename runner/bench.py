@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+# Benchmark puzzle solutions, timing the input load and the puzzle solve separately.
+# Usage:
+#     python3 aoc2024.py bench                 # Both parts of all days, with main puzzle input.
+#     python3 aoc2024.py bench 6 16 -2 -n 10   # Part 2 of days 6 and 16, 10 timed repeats each.
+#     python3 aoc2024.py bench 11 -i sample1 -e blinks=6 --json bench.json
+#     python3 aoc2024.py bench --save          # Also store the timings, for use with `aoc2024.py compare`.
+#     python3 aoc2024.py bench --metrics runs.jsonl   # Also export a record of every run, including warmups.
+#     python3 aoc2024.py bench 11 --engine reference --engine counts  # Compare implementations of the same parts.
+
+import argparse
+import json
+from pathlib import Path
+import statistics
+import sys
+from typing import NamedTuple
+
+import aoc2024
+from common import engines
+from runner import history, metrics, profiling
+
+PHASES = ["load", "solve", "total"]
+
+
+class BenchResult(NamedTuple):
+    day: int
+    part: int
+    input_path: Path
+    answer: int | str
+    samples: list[aoc2024.PuzzleTimings]
+    engine: str = engines.REFERENCE
+
+    def phase_samples(self, phase: str) -> list[float]:
+        if phase == "total":
+            return [t.load.wall + t.solve.wall for t in self.samples]
+        return [getattr(t, phase).wall for t in self.samples]
+
+
+def summarise(values: list[float]) -> dict[str, float]:
+    """Return the minimum, median, and 95th percentile of a list of timing samples."""
+    p95 = statistics.quantiles(values, n=20, method="inclusive")[18] if len(values) > 1 else values[0]
+    return {"min": min(values), "median": statistics.median(values), "p95": p95}
+
+
+def bench_puzzle(day: int, input_path: Path, part1: bool, repeats: int, warmup: int = 1,
+                 engine: str = engines.REFERENCE, **kwargs) -> BenchResult:
+    """Run a puzzle part warmup + repeats times with the given engine, keeping the timings of the last repeats runs.
+    Every run loads the input as well as solving the part, so each sample times both phases."""
+    samples = []
+    answer = None
+    with engines.selection(engine):
+        for i in range(warmup + repeats):
+            answer, timings = aoc2024.run_puzzle_timed(day, input_path, part1, **kwargs)
+            if i >= warmup:
+                samples.append(timings)
+    return BenchResult(day, 1 if part1 else 2, input_path, answer, samples, engine)
+
+
+def results_json(results: list[BenchResult]) -> list[dict]:
+    return [{"day": r.day,
+             "part": r.part,
+             "input": str(r.input_path),
+             "engine": r.engine,
+             "answer": r.answer,
+             "repeats": len(r.samples),
+             **{phase: summarise(r.phase_samples(phase)) for phase in PHASES}}
+            for r in results]
+
+
+def format_table(results: list[BenchResult]) -> str:
+    """Format benchmark results as a text table, one row per puzzle part and phase, with a column for the engine if
+    any part wasn't run with the reference. Times are in milliseconds."""
+    show_engines = any(r.engine != engines.REFERENCE for r in results)
+    width = max([len("engine")] + [len(r.engine) for r in results])
+    engine_header = f" {'engine':<{width}}" if show_engines else ""
+    header = f"{'day':>3} {'part':>4}{engine_header} {'phase':<5} {'min':>10} {'median':>10} {'p95':>10}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        engine_column = f" {r.engine:<{width}}" if show_engines else ""
+        for phase in PHASES:
+            s = summarise(r.phase_samples(phase))
+            lines.append(f"{r.day:>3} {r.part:>4}{engine_column} {phase:<5} "
+                         f"{s['min'] * 1000:>10.3f} {s['median'] * 1000:>10.3f} {s['p95'] * 1000:>10.3f}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="aoc2024.py bench",
+                                     description="Time the load and solve phases of puzzle solutions.")
+    parser.add_argument("days", type=int, nargs="*",
+                        help="Days to benchmark. Defaults to all days that have the chosen input file.")
+    parser.add_argument("-1", "--part1", action="store_true", help="Only benchmark part 1")
+    parser.add_argument("-2", "--part2", action="store_true", help="Only benchmark part 2")
+    parser.add_argument("-i", "--input-name", type=str, default="input",
+                        help="Name of the input file in each day's data directory (default: input)")
+    parser.add_argument("-n", "--repeats", type=int, default=5, help="Number of timed runs of each part")
+    parser.add_argument("-w", "--warmup", type=int, default=1,
+                        help="Number of untimed runs of each part, before the timed runs")
+    parser.add_argument("--engine", type=str, metavar="NAME", action="append", default=[],
+                        help="Benchmark the engine called NAME (see common/engines.py), for the parts that have one. "
+                             f"Can be given several times to compare engines. (default: {engines.REFERENCE})")
+    parser.add_argument("-e", "--extra-arg", type=str,
+                        help="An extra argument for the puzzles, in the form arg_name=value",
+                        action="append", default=[])
+    parser.add_argument("--json", type=str, metavar="PATH",
+                        help="Also write results as JSON to PATH, or to stdout instead of the table if PATH is '-'")
+    parser.add_argument("--save", action="store_true",
+                        help="Add the timings to the benchmark history, for comparison with `aoc2024.py compare`")
+    parser.add_argument("--history", type=Path, default=history.default_history_path(),
+                        help="History file used by --save (default: bench_history/<hostname>.jsonl)")
+    parser.add_argument("--profile", type=Path, metavar="DIR",
+                        help="Profile each phase with cProfile, writing .prof files for the last run of each part to "
+                             "DIR. Profiling slows the runs down, so timings are inflated.")
+    parser.add_argument("--profile-top", type=int, default=0, metavar="N",
+                        help="Number of functions to print in a summary of each profile (default: 0, no summary)")
+    parser.add_argument("--metrics", type=Path, metavar="PATH",
+                        help="Append a record of every run, including warmup runs, to PATH as JSON lines, or if PATH "
+                             "ends in .prom, update a Prometheus textfile with the latest measurements")
+    args = parser.parse_args(argv)
+
+    if args.repeats < 1:
+        sys.exit("--repeats must be at least 1.")
+    extra_args = aoc2024.parse_extra_args(args.extra_arg)
+    if args.profile is not None:
+        profiling.enable(args.profile, args.profile_top)
+    if args.metrics is not None:
+        metrics.enable(args.metrics)
+    parts = [1, 2] if args.part1 == args.part2 else [1] if args.part1 else [2]
+    engine_names = args.engine or [engines.REFERENCE]
+
+    results = []
+    for day in args.days or aoc2024.puzzle_days():
+        input_path = aoc2024.day_input_path(day, args.input_name)
+        if not input_path.exists():
+            print(f"Skipping day {day:02}: {input_path} not found.", file=sys.stderr)
+            continue
+        for part in parts:
+            available = engines.implementations(aoc2024.import_day(day), part == 1)
+            answers = {}
+            for engine in engine_names:
+                if engine not in available:
+                    continue
+                try:
+                    result = bench_puzzle(day, input_path, part == 1, args.repeats, args.warmup, engine, **extra_args)
+                except Exception as e:
+                    print(f"Day {day:02} part {part} failed with the {engine} engine: {e!r}", file=sys.stderr)
+                    continue
+                results.append(result)
+                answers[engine] = result.answer
+            if len(set(map(str, answers.values()))) > 1:
+                print(f"Day {day:02} part {part} engines disagree: "
+                      + ", ".join(f"{engine} answered {answer!r}" for engine, answer in answers.items()),
+                      file=sys.stderr)
+
+    if args.save:
+        run_id = history.record_results(results, args.history)
+        print(f"Saved run {run_id} to {args.history}.", file=sys.stderr)
+
+    if args.json == "-":
+        print(json.dumps(results_json(results), indent=2))
+        return
+    print(format_table(results))
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(results_json(results), f, indent=2)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+# Content-addressed on-disk caches of puzzle answers, and of parsed puzzle inputs.
+# An answer is stored under a key made from the day, the part, the extra arguments, a hash of the input file's
+# contents, and a hash of the day's solution source (including the shared code in common/), so a cached answer is only
+# reused while none of those change.
+# A parsed input is stored as a pickle of the value returned by the day's load function, keyed in the same way but
+# without the part and extra arguments.
+# Both caches are opt-in: the answer cache is used when the AOC2024_CACHE environment variable names a cache
+# directory, which the --cache option of aoc2024.py sets (default: .aoc_cache), and the input cache when
+# AOC2024_INPUT_CACHE does, which the --cache-inputs option sets (default: .aoc_input_cache). Each has its own size
+# limit, as parsed inputs are much larger than answers. They may share a directory, but then also share the answer
+# cache's smaller limit, so large parsed inputs may evict answers.
+# Only point these at directories you trust, as unpickling a cached input can run arbitrary code.
+# Long-running processes can also keep parsed inputs in memory, in front of the on-disk input cache, by calling
+# enable_memory_inputs (see runner/serve.py and test_aoc2024.py).
+# Usage:
+#     python3 aoc2024.py 06 -2 day06/data/input --cache   # Solve, or reuse the stored answer.
+#     python3 aoc2024.py 24 -2 day24/data/input --cache-inputs
+#     AOC2024_CACHE=.aoc_cache pytest                      # Tests skip solving unchanged puzzles.
+#     python3 aoc2024.py cache --stats
+#     python3 aoc2024.py cache --prune --max-age 7 --max-size 10
+#     python3 aoc2024.py cache --dir .aoc_input_cache --stats
+
+import argparse
+from collections import OrderedDict
+import contextlib
+import hashlib
+import json
+import operator
+import os
+from pathlib import Path
+import pickle
+import sys
+import time
+from typing import Any, Iterator
+
+# This module is imported by aoc2024, so can't import it in turn.
+TOP_DIR = Path(__file__).resolve().parent.parent
+CACHE_ENV_VAR = "AOC2024_CACHE"
+INPUT_CACHE_ENV_VAR = "AOC2024_INPUT_CACHE"
+DEFAULT_CACHE_DIR = TOP_DIR / ".aoc_cache"
+DEFAULT_INPUT_CACHE_DIR = TOP_DIR / ".aoc_input_cache"
+# Default eviction limits.
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60  # Seconds.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_INPUT_MAX_BYTES = 512 * 1024 * 1024
+
+# Estimated total size of each cache directory's entries: the size found by its last eviction in this process, plus
+# the size of the entries written since. Writes only evict, which scans the whole directory, when this may exceed the
+# size limit, or on the first write to the directory in this process.
+_estimated_bytes: dict[Path, int] = {}
+
+
+class DiskCache:
+    """A directory of files, each holding the value stored under one key.
+    Entries are evicted once they haven't been used for longer than max_age seconds, and least recently used entries
+    are evicted whenever the cache grows larger than max_bytes."""
+
+    def __init__(self, directory: Path, max_age: float | None = DEFAULT_MAX_AGE,
+                 max_bytes: int | None = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = f.read()
+        except FileNotFoundError:
+            return None
+        # Record the use, for least-recently-used eviction.
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since it was read.
+            pass
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file then rename, so concurrent readers never see a partially written entry.
+        temp_path = path.with_name(f"{key}.{os.getpid()}.tmp")
+        with open(temp_path, "wb") as f:
+            f.write(value)
+        temp_path.replace(path)
+        estimate = _estimated_bytes.get(self.directory)
+        if estimate is None or (self.max_bytes is not None and estimate + len(value) > self.max_bytes):
+            self.evict()
+        else:
+            _estimated_bytes[self.directory] = estimate + len(value)
+
+    def entries(self) -> list[tuple[Path, os.stat_result]]:
+        if not self.directory.exists():
+            return []
+        result = []
+        for p in self.directory.glob("*/*"):
+            if p.name.endswith(".tmp"):
+                continue
+            try:
+                result.append((p, p.stat()))
+            except FileNotFoundError:
+                # Evicted by another process since the directory was listed.
+                pass
+        return result
+
+    def evict(self) -> int:
+        """Remove expired entries, then the least recently used entries until the cache fits in max_bytes.
+        Return the number of entries removed."""
+        now = time.time()
+        entries = sorted(self.entries(), key=lambda e: e[1].st_mtime, reverse=True)
+        total_bytes = 0
+        removed = 0
+        for path, stat in entries:
+            total_bytes += stat.st_size
+            if ((self.max_age is not None and now - stat.st_mtime > self.max_age)
+                    or (self.max_bytes is not None and total_bytes > self.max_bytes)):
+                path.unlink(missing_ok=True)
+                total_bytes -= stat.st_size
+                removed += 1
+        _estimated_bytes[self.directory] = total_bytes
+        return removed
+
+    def clear(self) -> int:
+        entries = self.entries()
+        for path, _ in entries:
+            path.unlink(missing_ok=True)
+        return len(entries)
+
+
+def file_hash(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def source_hash(day: int) -> str:
+    """Hash of all Python source files in the day's solution directory, except its input generator, and the shared
+    solution code in common/."""
+    h = hashlib.sha256()
+    for path in sorted((TOP_DIR / f"day{day:02}").glob("*.py")) + sorted((TOP_DIR / "common").glob("*.py")):
+        if path.name == "generator.py":
+            continue
+        h.update(str(path.relative_to(TOP_DIR)).encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def cache_key(kind: str, day: int, input_path: Path, *extra: Any) -> str:
+    """Key for a cached value of the given kind, derived from the day's source and input file, and any further
+    JSON-serialisable values the cached value depends on."""
+    return hashlib.sha256(json.dumps([kind, day, source_hash(day), file_hash(input_path), *extra],
+                                     sort_keys=True).encode()).hexdigest()
+
+
+def from_environment(env_var: str = CACHE_ENV_VAR) -> DiskCache | None:
+    """Return the cache selected by the given environment variable, or None if that cache is disabled."""
+    directory = os.environ.get(env_var)
+    max_bytes = DEFAULT_INPUT_MAX_BYTES if env_var == INPUT_CACHE_ENV_VAR else DEFAULT_MAX_BYTES
+    return DiskCache(Path(directory), max_bytes=max_bytes) if directory else None
+
+
+def enable(env_var: str = CACHE_ENV_VAR, directory: Path | None = None) -> None:
+    """Enable a cache for this process, and any worker processes it starts, unless the environment already selects
+    a directory for it. The directory defaults to that cache's default directory."""
+    if directory is None:
+        directory = DEFAULT_INPUT_CACHE_DIR if env_var == INPUT_CACHE_ENV_VAR else DEFAULT_CACHE_DIR
+    if not os.environ.get(env_var):
+        os.environ[env_var] = str(directory)
+
+
+def answer_key(day: int, input_path: Path, part1: bool, kwargs: dict[str, int | str], engine: str) -> str:
+    """Key of a stored answer. Each engine (see common/engines.py) has its own answers, so a stored answer never stands
+    in for running an engine that hasn't been run."""
+    return cache_key("answer", day, input_path, 1 if part1 else 2, kwargs, engine)
+
+
+def get_answer(cache: DiskCache, key: str) -> tuple[bool, int | str | None]:
+    """Return (True, answer) if an answer is stored under key, otherwise (False, None)."""
+    value = cache.get(key)
+    if value is None:
+        return False, None
+    return True, json.loads(value)["answer"]
+
+
+def put_answer(cache: DiskCache, key: str, answer: int | str | None) -> None:
+    if not isinstance(answer, int | str | None):
+        # Some solutions return integer-like types, such as sympy's Integer.
+        try:
+            answer = operator.index(answer)
+        except TypeError:
+            # Can't be stored as JSON, so don't cache the answer.
+            return
+    cache.put(key, json.dumps({"answer": answer}).encode())
+
+
+def input_key(day: int, input_path: Path) -> str:
+    return cache_key("input", day, input_path, pickle.HIGHEST_PROTOCOL, sys.version_info[:2])
+
+
+def checkpoint_key(day: int, input_path: Path, part1: bool, kwargs: dict[str, int | str], engine: str) -> str:
+    """Key naming a solve's checkpoint file (see common/checkpoint.py). Engines save different state, so each has its
+    own."""
+    return cache_key("checkpoint", day, input_path, 1 if part1 else 2, kwargs, engine, pickle.HIGHEST_PROTOCOL)
+
+
+def get_input(cache: DiskCache, key: str) -> tuple[bool, Any]:
+    """Return (True, parsed_input) if a parsed input is stored under key, otherwise (False, None)."""
+    value = cache.get(key)
+    if value is None:
+        return False, None
+    try:
+        return True, pickle.loads(value)
+    except Exception:
+        # e.g. a shared module the pickled classes come from has changed. Treat as a miss, so it will be replaced.
+        return False, None
+
+
+def put_input(cache: DiskCache, key: str, parsed_input: Any) -> None:
+    try:
+        value = pickle.dumps(parsed_input, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        # Some parsed inputs may not be picklable; just don't cache them.
+        return
+    cache.put(key, value)
+
+
+class MemoryCache:
+    """An in-process cache holding at most max_entries values, evicting the least recently used."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[Any, Any] = OrderedDict()
+
+    def get(self, key: Any) -> tuple[bool, Any]:
+        """Return (True, value) if a value is stored under key, otherwise (False, None)."""
+        if key not in self.entries:
+            return False, None
+        self.entries.move_to_end(key)
+        return True, self.entries[key]
+
+    def put(self, key: Any, value: Any) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+_memory_input_cache: MemoryCache | None = None
+
+
+def enable_memory_inputs(max_entries: int) -> None:
+    """Keep up to max_entries parsed inputs in memory for the rest of this process. Unlike the other caches, this isn't
+    inherited by worker processes."""
+    global _memory_input_cache
+    _memory_input_cache = MemoryCache(max_entries)
+
+
+def disable_memory_inputs() -> None:
+    global _memory_input_cache
+    _memory_input_cache = None
+
+
+def memory_input_cache() -> MemoryCache | None:
+    return _memory_input_cache
+
+
+@contextlib.contextmanager
+def memory_inputs_suspended() -> Iterator[None]:
+    """Bypass the in-memory input cache within the block, so inputs are parsed afresh, e.g. to measure loading them."""
+    global _memory_input_cache
+    suspended = _memory_input_cache
+    _memory_input_cache = None
+    try:
+        yield
+    finally:
+        _memory_input_cache = suspended
+
+
+def memory_input_key(day: int, input_path: Path) -> tuple:
+    """Key for a parsed input in the in-memory cache. This uses the input file's modification time and size rather
+    than hashing its contents, as it must be cheap enough to check before every solve. Day modules aren't reloaded
+    within a process, so their source doesn't need to be part of the key."""
+    stat = input_path.stat()
+    return day, str(input_path.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="aoc2024.py cache", description="Inspect or prune the on-disk cache.")
+    parser.add_argument("--dir", type=Path, default=Path(os.environ.get(CACHE_ENV_VAR) or DEFAULT_CACHE_DIR),
+                        help="Cache directory (default: $AOC2024_CACHE, or .aoc_cache)")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--stats", action="store_true", help="Show the number and total size of entries (default)")
+    action.add_argument("--prune", action="store_true", help="Evict expired entries, and entries over the size limit")
+    action.add_argument("--clear", action="store_true", help="Remove all entries")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_MAX_AGE / (24 * 60 * 60),
+                        help="With --prune, the age in days after which unused entries are evicted (default: 30)")
+    parser.add_argument("--max-size", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help="With --prune, the total size in MiB to shrink the cache to (default: 64)")
+    args = parser.parse_args(argv)
+
+    cache = DiskCache(args.dir, args.max_age * 24 * 60 * 60, int(args.max_size * 1024 * 1024))
+    if args.prune:
+        print(f"Evicted {cache.evict()} entries.")
+    elif args.clear:
+        print(f"Removed {cache.clear()} entries.")
+    else:
+        entries = cache.entries()
+        print(f"{len(entries)} entries, {sum(stat.st_size for _, stat in entries) / 1024:.1f} KiB in {args.dir}")
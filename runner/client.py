@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# Send puzzles to a running puzzle server (see runner/serve.py), and print the answers.
+# Usage:
+#     python3 aoc2024.py client 16 -2 day16/data/input
+#     python3 aoc2024.py client 11 -1 day11/data/sample2 -e blinks=6 --timings
+#     python3 aoc2024.py client --stats
+#     python3 aoc2024.py client --shutdown
+
+import argparse
+import json
+from pathlib import Path
+import socket
+import sys
+
+import aoc2024
+from runner import serve
+
+
+class ServerError(Exception):
+    pass
+
+
+def request(message: dict, socket_path: Path = serve.DEFAULT_SOCKET) -> dict:
+    """Send one request to the server, and return its response. Raises ServerError if the request failed."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(str(socket_path))
+        s.sendall(json.dumps(message).encode() + b"\n")
+        with s.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ServerError("server closed the connection without responding")
+    response = json.loads(line)
+    if "error" in response:
+        raise ServerError(response["error"])
+    return response
+
+
+def solve(day: int, input_path: Path, part1: bool, socket_path: Path = serve.DEFAULT_SOCKET,
+          **kwargs) -> tuple[int | str, dict | None]:
+    """Solve a puzzle part on the server. Return the answer, and the timings of each phase as in runner/serve.py, or
+    None if the answer came from the answer cache."""
+    response = request({"day": day, "part": 1 if part1 else 2, "input": str(input_path.resolve()), "kwargs": kwargs},
+                       socket_path)
+    return response["answer"], response["timings"]
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="aoc2024.py client",
+                                     description="Solve a puzzle using a server started by 'aoc2024.py serve'.")
+    parser.add_argument("-1", "--part1", action="store_true")
+    parser.add_argument("-2", "--part2", action="store_true")
+    parser.add_argument("day", type=int, nargs="?",
+                        help="A number from 1-25 indicating the day of the puzzle to run")
+    parser.add_argument("input", type=Path, nargs="?", help="Path to the file containing puzzle input")
+    parser.add_argument("-e", "--extra-arg", type=str,
+                        help="An extra argument for the puzzle, in the form arg_name=value",
+                        action="append", default=[])
+    parser.add_argument("--socket", type=Path, default=serve.DEFAULT_SOCKET,
+                        help="Path of the server's socket (default: .aoc_serve.sock)")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print the time the server took to load the input and solve the part to stderr")
+    command = parser.add_mutually_exclusive_group()
+    command.add_argument("--ping", action="store_true", help="Check that the server is running")
+    command.add_argument("--stats", action="store_true", help="Show the server's statistics")
+    command.add_argument("--shutdown", action="store_true", help="Stop the server")
+    args = parser.parse_intermixed_args(argv)
+
+    try:
+        if args.ping or args.stats or args.shutdown:
+            response = request({"command": "ping" if args.ping else "stats" if args.stats else "shutdown"},
+                               args.socket)
+            print(json.dumps(response))
+            return
+
+        if args.day is None or args.input is None:
+            parser.error("the following arguments are required: day, input")
+        if args.part1 == args.part2:
+            sys.exit("Exactly one of --part1 or --part2 must be specified.")
+        answer, timings = solve(args.day, args.input, args.part1, args.socket,
+                                **aoc2024.parse_extra_args(args.extra_arg))
+    except (FileNotFoundError, ConnectionRefusedError):
+        sys.exit(f"No server is listening on {args.socket}. Start one with 'aoc2024.py serve'.")
+    except ServerError as e:
+        sys.exit(str(e))
+
+    print(answer)
+    if args.timings:
+        if timings is None:
+            print("Answer from cache.", file=sys.stderr)
+        else:
+            for phase, stats in timings.items():
+                print(f"{phase}: {stats['wall'] * 1000:.3f} ms wall, {stats['cpu'] * 1000:.3f} ms CPU", file=sys.stderr)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+# Generate synthetic puzzle inputs, to find out how solutions behave on inputs much larger than the real ones.
+# Each day's generator is in dayNN/generator.py, providing:
+# - generate(size, seed), returning the text of an input. What size measures depends on the day, e.g. the number of
+#   lines, or the width of a grid. The same size and seed always give the same input.
+# - DEFAULT_SIZE, a size similar to the real input.
+# - Optionally extra_args(size, part), giving any extra arguments needed to solve a part of a generated input.
+# Usage:
+#     python3 aoc2024.py gen 22 --size 1000000 > big22.txt
+#     python3 aoc2024.py gen 18 --size 500 --seed 3 -o day18/data/gen500
+#     python3 aoc2024.py 18 -2 day18/data/gen500 -e coord_max=499
+
+import argparse
+import importlib
+from pathlib import Path
+import sys
+from types import ModuleType
+
+import aoc2024
+
+
+def import_generator(day: int) -> ModuleType:
+    return importlib.import_module(f"day{day:02}.generator")
+
+
+def generate_input(day: int, size: int | None = None, seed: int = 0) -> str:
+    generator = import_generator(day)
+    return generator.generate(generator.DEFAULT_SIZE if size is None else size, seed)
+
+
+def generated_extra_args(day: int, size: int | None, part: int) -> dict[str, int | str]:
+    """Extra arguments needed to solve the given part of an input generated with the given size."""
+    generator = import_generator(day)
+    if not hasattr(generator, "extra_args"):
+        return {}
+    return generator.extra_args(generator.DEFAULT_SIZE if size is None else size, part)
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="aoc2024.py gen", description="Generate a synthetic puzzle input.")
+    parser.add_argument("day", type=int, help="A number from 1-25 indicating the day of the puzzle")
+    parser.add_argument("-s", "--size", type=int,
+                        help="Size of the input, in units depending on the day (default: similar to the real input)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("-o", "--output", type=Path, help="File to write the input to (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.day not in aoc2024.puzzle_days():
+        sys.exit(f"No solution directory for day {args.day}.")
+    text = generate_input(args.day, args.size, args.seed)
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text)
+
+    for part in [1, 2]:
+        extra_args = generated_extra_args(args.day, args.size, part)
+        if extra_args:
+            print(f"Solve part {part} with: " + " ".join(f"-e {k}={v}" for k, v in extra_args.items()),
+                  file=sys.stderr)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+
+# Store benchmark timings, and compare timings between stored runs.
+# Each machine has its own history file of JSON lines, one line per benchmarked puzzle part, tagged with the git
+# revision of the solutions and a run id shared by all parts benchmarked by the same `bench --save` invocation.
+# Usage:
+#     python3 aoc2024.py bench --save          # Benchmark, and add results to this machine's history.
+#     python3 aoc2024.py compare --list        # List stored runs.
+#     python3 aoc2024.py compare               # Compare the latest run against the one before it.
+#     python3 aoc2024.py compare 1a2b3c HEAD   # Compare the latest runs of two git revisions.
+#     python3 aoc2024.py compare main HEAD~1   # Revisions can be anything git rev-parse accepts.
+
+import argparse
+import datetime
+import json
+import math
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+from typing import Iterable, NamedTuple, TYPE_CHECKING
+
+import aoc2024
+from common import engines
+
+if TYPE_CHECKING:
+    from runner.bench import BenchResult
+
+DEFAULT_HISTORY_DIR = aoc2024.TOP_DIR / "bench_history"
+
+
+class Comparison(NamedTuple):
+    day: int
+    part: int
+    engine: str
+    base_median: float
+    new_median: float
+    p_value: float
+    base_samples: int
+    new_samples: int
+
+    @property
+    def change(self) -> float:
+        """Fractional change in median time, e.g. 0.1 for 10% slower, -0.5 for twice as fast."""
+        return self.new_median / self.base_median - 1.0 if self.base_median > 0 else 0.0
+
+
+def default_history_path() -> Path:
+    return DEFAULT_HISTORY_DIR / f"{platform.node() or 'unknown'}.jsonl"
+
+
+def git(*args: str) -> str:
+    return subprocess.run(["git", *args], cwd=aoc2024.TOP_DIR, capture_output=True, text=True,
+                          check=True).stdout.strip()
+
+
+def current_revision() -> str:
+    """Return the git commit hash of the working tree, suffixed with '-dirty' if there are uncommitted changes."""
+    try:
+        revision = git("rev-parse", "HEAD")
+        if git("status", "--porcelain", "--untracked-files=no"):
+            revision += "-dirty"
+        return revision
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def record_results(results: Iterable["BenchResult"], path: Path) -> str:
+    """Append benchmark results to the history file at path, and return the id of the new run."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    revision = current_revision()
+    run_id = f"{now:%Y%m%dT%H%M%S.%f}-{revision[:12]}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for r in results:
+            f.write(json.dumps({"run": run_id,
+                                "revision": revision,
+                                "time": now.isoformat(timespec="seconds"),
+                                "python": platform.python_version(),
+                                "day": r.day,
+                                "part": r.part,
+                                "input": str(r.input_path.relative_to(aoc2024.TOP_DIR)
+                                             if r.input_path.is_relative_to(aoc2024.TOP_DIR) else r.input_path),
+                                "engine": r.engine,
+                                "answer": r.answer,
+                                "load": r.phase_samples("load"),
+                                "solve": r.phase_samples("solve")}) + "\n")
+    return run_id
+
+
+def load_history(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def group_runs(records: list[dict]) -> dict[str, list[dict]]:
+    """Group history records by run id, in the order the runs were recorded."""
+    runs: dict[str, list[dict]] = {}
+    for record in records:
+        runs.setdefault(record["run"], []).append(record)
+    return runs
+
+
+def select_run(runs: dict[str, list[dict]], ref: str) -> str:
+    """Find the run matching ref, which may be a run id, or anything git rev-parse resolves to a commit, such as a
+    branch, tag, HEAD~1 or a prefix of a commit hash. HEAD only matches runs with uncommitted changes if the working
+    tree has them too. A ref git can't resolve, e.g. a commit since removed, is matched as a prefix of run revisions.
+    If several runs match a revision, the latest is chosen."""
+    if ref in runs:
+        return ref
+    if ref == "HEAD":
+        ref = current_revision()
+    else:
+        try:
+            ref = git("rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+        except (OSError, subprocess.CalledProcessError):
+            pass
+    matches = [run_id for run_id, records in runs.items() if records[0]["revision"].startswith(ref)]
+    if not matches:
+        raise KeyError(f"No stored run matches '{ref}'.")
+    return matches[-1]
+
+
+def phase_samples(record: dict, phase: str) -> list[float]:
+    if phase == "total":
+        return [a + b for a, b in zip(record["load"], record["solve"])]
+    return record[phase]
+
+
+def mann_whitney_p(a: list[float], b: list[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test that samples a and b come from the same distribution.
+    Uses the normal approximation with a tie correction, which is adequate for the handful of samples a benchmark
+    collects, and doesn't assume timings are normally distributed."""
+    n_a, n_b = len(a), len(b)
+    if n_a == 0 or n_b == 0:
+        return 1.0
+    # Rank all samples together, giving tied values the average of their ranks.
+    combined = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    u = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0) - n_a * (n_a + 1) / 2
+    n = n_a + n_b
+    variance = n_a * n_b / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0.0
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n_a * n_b / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def smallest_p(n_a: int, n_b: int) -> float:
+    """Smallest p-value mann_whitney_p can give for samples of sizes n_a and n_b, when they don't overlap at all.
+    With only a few samples, this may be too large for any change to count as significant."""
+    return mann_whitney_p(list(range(n_a)), list(range(n_a, n_a + n_b)))
+
+
+def compare_runs(base: list[dict], new: list[dict], phase: str = "total") -> list[Comparison]:
+    """Compare the puzzle parts present in both runs, run with the same engine. Records from before engines were
+    recorded were run with the reference."""
+    def part_key(r: dict) -> tuple:
+        return r["day"], r["part"], r["input"], r.get("engine", engines.REFERENCE)
+
+    base_by_part = {part_key(r): r for r in base}
+    result = []
+    for r in new:
+        if (b := base_by_part.get(part_key(r))) is not None:
+            base_samples = phase_samples(b, phase)
+            new_samples = phase_samples(r, phase)
+            result.append(Comparison(r["day"], r["part"], part_key(r)[3], statistics.median(base_samples),
+                                     statistics.median(new_samples), mann_whitney_p(base_samples, new_samples),
+                                     len(base_samples), len(new_samples)))
+    return sorted(result, key=lambda c: (c.day, c.part, c.engine))
+
+
+def verdict(c: Comparison, threshold: float, alpha: float) -> str:
+    if c.p_value >= alpha or abs(c.change) <= threshold:
+        return ""
+    return "REGRESSION" if c.change > 0 else "faster"
+
+
+def format_comparison(comparisons: list[Comparison], threshold: float, alpha: float) -> str:
+    """Format comparisons as a text table, with a column for the engine if any part wasn't run with the reference."""
+    show_engines = any(c.engine != engines.REFERENCE for c in comparisons)
+    width = max([len("engine")] + [len(c.engine) for c in comparisons])
+    engine_header = f" {'engine':<{width}}" if show_engines else ""
+    header = f"{'day':>3} {'part':>4}{engine_header} {'base ms':>10} {'new ms':>10} {'change':>8} {'p':>6}"
+    lines = [header, "-" * len(header)]
+    for c in comparisons:
+        engine_column = f" {c.engine:<{width}}" if show_engines else ""
+        lines.append(f"{c.day:>3} {c.part:>4}{engine_column} {c.base_median * 1000:>10.3f} "
+                     f"{c.new_median * 1000:>10.3f} {c.change:>+8.1%} {c.p_value:>6.3f} "
+                     f"{verdict(c, threshold, alpha)}".rstrip())
+    return "\n".join(lines)
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="aoc2024.py compare",
+                                     description="Compare the benchmark timings of two stored runs. "
+                                                 "Exits with status 1 if any puzzle part has regressed, or 2 if the "
+                                                 "runs have too few samples to tell.")
+    parser.add_argument("base", type=str, nargs="?",
+                        help="Run id or git revision of the baseline run (default: the second latest run)")
+    parser.add_argument("new", type=str, nargs="?",
+                        help="Run id or git revision of the run to check (default: the latest run)")
+    parser.add_argument("--history", type=Path, default=default_history_path(),
+                        help="History file to read (default: bench_history/<hostname>.jsonl)")
+    parser.add_argument("--phase", choices=["load", "solve", "total"], default="total",
+                        help="Which phase of each puzzle part to compare (default: total)")
+    parser.add_argument("-t", "--threshold", type=float, default=0.05,
+                        help="Fractional slowdown tolerated before a change counts as a regression (default: 0.05)")
+    parser.add_argument("-a", "--alpha", type=float, default=0.05,
+                        help="Significance level a change must reach to count (default: 0.05)")
+    parser.add_argument("--list", action="store_true", help="List the stored runs, then exit")
+    args = parser.parse_args(argv)
+
+    runs = group_runs(load_history(args.history))
+    if args.list:
+        for run_id, records in runs.items():
+            print(f"{run_id}  {records[0]['time']}  {len(records)} parts")
+        return
+
+    run_order = list(runs)
+    if not run_order:
+        sys.exit(f"No runs stored in {args.history}.")
+    try:
+        new_run = select_run(runs, args.new) if args.new is not None else run_order[-1]
+        base_run = select_run(runs, args.base) if args.base is not None else None
+    except KeyError as e:
+        sys.exit(e.args[0])
+    if base_run is None:
+        if run_order.index(new_run) == 0:
+            sys.exit(f"No run stored before {new_run} to compare it with.")
+        base_run = run_order[run_order.index(new_run) - 1]
+
+    comparisons = compare_runs(runs[base_run], runs[new_run], args.phase)
+    # Otherwise too few samples would always report no significant change, however much slower the new run is.
+    unresolvable = [c for c in comparisons if smallest_p(c.base_samples, c.new_samples) >= args.alpha]
+    if unresolvable:
+        c = unresolvable[0]
+        print(f"Day {c.day} part {c.part} has {c.base_samples} base and {c.new_samples} new samples, too few for any "
+              f"change to be significant at --alpha {args.alpha:g}. Benchmark with more repeats.", file=sys.stderr)
+        sys.exit(2)
+    print(f"base: {base_run}\nnew:  {new_run}")
+    print(format_comparison(comparisons, args.threshold, args.alpha))
+    if any(verdict(c, args.threshold, args.alpha) == "REGRESSION" for c in comparisons):
+        sys.exit(1)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+# Run each puzzle in a child process with a wall-clock time limit and a memory limit, so a runaway solve is killed
+# instead of hanging the whole run.
+# Limits are enabled when the AOC2024_TIME_LIMIT or AOC2024_MEMORY_LIMIT environment variable is set, which the
+# --time-limit and --memory-limit options of aoc2024.py do, so they also apply to --all and batch worker processes, and
+# to tests run by pytest with the variables set.
+# A puzzle that runs out of time, or of memory, fails with LimitExceeded. The memory limit caps the child process's
+# whole address space (RLIMIT_AS), including the interpreter itself, so unlike a memory budget (see runner/memory.py) it
+# needs no tracing, but must allow for the memory Python uses before solving starts.
+# Usage:
+#     python3 aoc2024.py 24 -2 day24/data/input --time-limit 60
+#     python3 aoc2024.py --all --time-limit 30 --memory-limit 2048
+#     AOC2024_TIME_LIMIT=10 pytest
+
+import multiprocessing
+import multiprocessing.connection
+import os
+import resource
+import time
+from typing import Any, Callable
+
+TIME_LIMIT_ENV_VAR = "AOC2024_TIME_LIMIT"
+MEMORY_LIMIT_ENV_VAR = "AOC2024_MEMORY_LIMIT"
+MIB = 1024 * 1024
+# Seconds to wait for a child to exit after asking it to, before killing it.
+TERMINATE_GRACE = 1
+
+
+class LimitExceeded(Exception):
+    """A puzzle run was stopped for exceeding a limit.
+
+    label -- The run that was stopped, e.g. day24_input_part2.
+    kind -- "time" or "memory".
+    limit -- The limit exceeded, in seconds or bytes.
+    elapsed -- Seconds the run took before it was stopped.
+    """
+
+    def __init__(self, label: str, kind: str, limit: float, elapsed: float):
+        self.label = label
+        self.kind = kind
+        self.limit = limit
+        self.elapsed = elapsed
+        limit_text = f"{limit:g} s" if kind == "time" else f"{limit / MIB:.1f} MiB"
+        super().__init__(f"{label} exceeded the {limit_text} {kind} limit, and was stopped after {elapsed:.1f} s.")
+
+    def __reduce__(self):
+        return LimitExceeded, (self.label, self.kind, self.limit, self.elapsed)
+
+
+def enable(time_limit: float | None = None, memory_limit: int | None = None) -> None:
+    """Enable limits for this process, and any worker processes it starts.
+    time_limit is in seconds and memory_limit in bytes, or None for no limit."""
+    if time_limit is not None:
+        os.environ[TIME_LIMIT_ENV_VAR] = str(time_limit)
+    if memory_limit is not None:
+        os.environ[MEMORY_LIMIT_ENV_VAR] = str(memory_limit)
+
+
+def disable() -> None:
+    os.environ.pop(TIME_LIMIT_ENV_VAR, None)
+    os.environ.pop(MEMORY_LIMIT_ENV_VAR, None)
+
+
+def time_limit() -> float | None:
+    value = os.environ.get(TIME_LIMIT_ENV_VAR)
+    return float(value) if value else None
+
+
+def memory_limit() -> int | None:
+    value = os.environ.get(MEMORY_LIMIT_ENV_VAR)
+    return int(value) if value else None
+
+
+def enabled() -> bool:
+    return time_limit() is not None or memory_limit() is not None
+
+
+def _run_child(connection: multiprocessing.connection.Connection, max_memory: int | None, function: Callable,
+               args: tuple, kwargs: dict) -> None:
+    # Whatever function does runs within this process's limits, so shouldn't start further limited children.
+    disable()
+    if max_memory is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory, max_memory))
+    try:
+        response = ("result", function(*args, **kwargs))
+    except MemoryError:
+        response = ("memory", None)
+    except Exception as e:
+        response = ("exception", e)
+    try:
+        connection.send(response)
+    except Exception as e:
+        # The result or exception couldn't be pickled.
+        connection.send(("exception", RuntimeError(f"{response[1]!r} could not be returned: {e!r}")))
+
+
+def run_limited(label: str, function: Callable, *args, **kwargs) -> Any:
+    """Call function in a child process within the enabled limits, and return its result or raise the exception it
+    raised. Raises LimitExceeded if the child ran out of time or memory, or ChildProcessError if it died without
+    returning anything.
+    label identifies the run in errors, e.g. day24_input_part2."""
+    max_time = time_limit()
+    max_memory = memory_limit()
+    # Forking lets the child reuse the modules this process has already imported.
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_child, args=(sender, max_memory, function, args, kwargs))
+    start = time.perf_counter()
+    process.start()
+    sender.close()
+    returned = False
+    try:
+        if not receiver.poll(max_time):
+            raise LimitExceeded(label, "time", max_time, time.perf_counter() - start)
+        try:
+            kind, value = receiver.recv()
+            returned = True
+        except EOFError:
+            process.join()
+            raise ChildProcessError(f"{label} exited with code {process.exitcode} without returning a result.")
+    finally:
+        receiver.close()
+        # A child that returned a result is about to exit by itself; any other child is stopped.
+        process.join(TERMINATE_GRACE if returned else 0)
+        if process.is_alive():
+            process.terminate()
+            process.join(TERMINATE_GRACE)
+            if process.is_alive():
+                process.kill()
+        process.join()
+
+    if kind == "memory":
+        raise LimitExceeded(label, "memory", max_memory, time.perf_counter() - start)
+    if kind == "exception":
+        raise value
+    return value
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+# Measure the peak memory used by each phase of a puzzle run (loading the input, and solving a part).
+# Two measures are taken:
+# - The peak size of Python allocations made during the phase, above the size at its start, traced by tracemalloc.
+#   This only counts memory used by the phase itself, so doesn't depend on what else the process has done.
+# - The peak resident set size of the whole process during the phase. On Linux the peak is reset at the start of each
+#   phase; elsewhere it is the peak over the process lifetime so far.
+# Measurement is enabled when the AOC2024_MEMORY environment variable is set, which the --memory option of aoc2024.py
+# does, so it also applies to --all worker processes. A memory budget can also be set, in which case a phase whose
+# traced peak exceeds the budget fails with MemoryBudgetExceeded.
+# tracemalloc slows down allocation-heavy code considerably, so don't benchmark with memory measurement enabled.
+# Usage:
+#     python3 aoc2024.py 22 -2 day22/data/input --memory
+#     python3 aoc2024.py --all --memory-budget 500
+
+import os
+from pathlib import Path
+import resource
+import sys
+import tracemalloc
+from typing import Any, Callable, NamedTuple
+
+MEMORY_ENV_VAR = "AOC2024_MEMORY"
+MEMORY_BUDGET_ENV_VAR = "AOC2024_MEMORY_BUDGET"
+MIB = 1024 * 1024
+
+
+class MemoryStats(NamedTuple):
+    """Peak memory used during a phase, in bytes."""
+    traced_peak: int
+    rss_peak: int
+
+    def __str__(self) -> str:
+        return f"{self.traced_peak / MIB:.1f} MiB traced peak, {self.rss_peak / MIB:.1f} MiB RSS peak"
+
+
+class MemoryBudgetExceeded(Exception):
+    pass
+
+
+def enable(budget: int | None = None) -> None:
+    """Enable memory measurement for this process, and any worker processes it starts.
+    budget is the maximum traced peak in bytes allowed for any phase, or None for no limit."""
+    os.environ[MEMORY_ENV_VAR] = "1"
+    if budget is not None:
+        os.environ[MEMORY_BUDGET_ENV_VAR] = str(budget)
+
+
+def disable() -> None:
+    os.environ.pop(MEMORY_ENV_VAR, None)
+    os.environ.pop(MEMORY_BUDGET_ENV_VAR, None)
+
+
+def enabled() -> bool:
+    return bool(os.environ.get(MEMORY_ENV_VAR))
+
+
+def budget() -> int | None:
+    value = os.environ.get(MEMORY_BUDGET_ENV_VAR)
+    return int(value) if value else None
+
+
+_PROC_STATUS = Path("/proc/self/status")
+_PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+def reset_rss_peak() -> None:
+    """Reset the process's peak RSS to its current RSS, where the OS supports it (Linux only)."""
+    try:
+        # Writing 5 to clear_refs resets the peak RSS (VmHWM) counter.
+        _PROC_CLEAR_REFS.write_text("5")
+    except OSError:
+        pass
+
+
+def rss_peak() -> int:
+    """Peak resident set size of this process in bytes, since it started or since the last reset_rss_peak."""
+    try:
+        for line in _PROC_STATUS.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux, but bytes on macOS.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def run_measured(function: Callable, *args, **kwargs) -> tuple[Any, MemoryStats]:
+    """Call function, and return its result and the peak memory used by the call."""
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start_traced = tracemalloc.get_traced_memory()[0]
+    reset_rss_peak()
+    try:
+        result = function(*args, **kwargs)
+        return result, MemoryStats(max(tracemalloc.get_traced_memory()[1] - start_traced, 0), rss_peak())
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def check_budget(label: str, stats: MemoryStats) -> None:
+    """Raise MemoryBudgetExceeded if the phase identified by label used more memory than the budget allows."""
+    limit = budget()
+    if limit is not None and stats.traced_peak > limit:
+        raise MemoryBudgetExceeded(f"{label} used {stats.traced_peak / MIB:.1f} MiB, "
+                                   f"over the budget of {limit / MIB:.1f} MiB.")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+# Export a machine-readable record of every puzzle run.
+# Exporting is enabled when the AOC2024_METRICS environment variable names an output file, which the --metrics option
+# of aoc2024.py and of `aoc2024.py bench` sets, so it also applies to --all worker processes.
+# If the file name ends in .prom, it is kept up to date as a Prometheus textfile (for node_exporter's textfile
+# collector) holding the measurements of the most recent run of each puzzle phase. Otherwise a JSON object is appended
+# to it for each run, e.g.:
+#     {"time": "2024-12-25T05:00:00+00:00", "day": 16, "part": 2, "input": "day16/data/input",
+#      "input_sha256": "...", "kwargs": {}, "answer": 123, "python": "3.12.1",
+#      "phases": {"load": {"wall": 0.001, "cpu": 0.001, "traced_peak": null, "rss_peak": null, "counters": null},
+#                 "solve": {"wall": 1.2, "cpu": 1.2, "traced_peak": null, "rss_peak": null, "counters": null}}}
+# Peak memory is null unless memory measurement is enabled (see runner/memory.py), and counters are null unless
+# counting is enabled (see common/counters.py).
+# Usage:
+#     python3 aoc2024.py --all --metrics runs.jsonl
+#     python3 aoc2024.py --all --memory --metrics /var/lib/node_exporter/aoc2024.prom
+
+import datetime
+import fcntl
+import json
+import operator
+import os
+from pathlib import Path
+import platform
+import re
+from typing import Any
+
+from runner import cache
+
+METRICS_ENV_VAR = "AOC2024_METRICS"
+TOP_DIR = cache.TOP_DIR
+
+# Prometheus metric name -> (help text, function extracting the value from a phase record).
+PROMETHEUS_PHASE_METRICS = {
+    "aoc2024_phase_wall_seconds": ("Wall-clock time of the latest run of a puzzle phase.", lambda p: p["wall"]),
+    "aoc2024_phase_cpu_seconds": ("Process CPU time of the latest run of a puzzle phase.", lambda p: p["cpu"]),
+    "aoc2024_phase_traced_peak_bytes": ("Peak Python allocations traced during the latest run of a puzzle phase.",
+                                        lambda p: p["traced_peak"]),
+    "aoc2024_phase_rss_peak_bytes": ("Peak process resident set size during the latest run of a puzzle phase.",
+                                     lambda p: p["rss_peak"]),
+}
+# Each count a solution added during a phase is a sample of this metric, labelled with the counter's name.
+PROMETHEUS_COUNTER_METRIC = "aoc2024_phase_counter"
+PROMETHEUS_COUNTER_HELP = "Count of work done by the solution during the latest run of a puzzle phase."
+PROMETHEUS_RUN_METRICS = {
+    "aoc2024_run_timestamp_seconds": "Time the latest run of a puzzle part finished, as a Unix timestamp.",
+    "aoc2024_run_info": "Details of the latest run of a puzzle part, in its labels. Always 1.",
+}
+
+
+def enable(path: Path) -> None:
+    """Enable exporting for this process, and any worker processes it starts."""
+    os.environ[METRICS_ENV_VAR] = str(path.resolve())
+
+
+def output_path() -> Path | None:
+    path = os.environ.get(METRICS_ENV_VAR)
+    return Path(path) if path else None
+
+
+def make_record(day: int, part: int, input_path: Path, kwargs: dict[str, int | str], answer: Any,
+                phases: dict[str, Any]) -> dict:
+    """Build the record of a run. phases maps each phase name to its aoc2024.PhaseStats."""
+    if not isinstance(answer, int | str | None):
+        # e.g. sympy's Integer.
+        try:
+            answer = operator.index(answer)
+        except TypeError:
+            answer = str(answer)
+    return {"time": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "day": day,
+            "part": part,
+            "input": str(input_path.resolve().relative_to(TOP_DIR)
+                         if input_path.resolve().is_relative_to(TOP_DIR) else input_path),
+            "input_sha256": cache.file_hash(input_path),
+            "kwargs": kwargs,
+            "answer": answer,
+            "python": platform.python_version(),
+            "phases": {phase: {"wall": stats.wall,
+                               "cpu": stats.cpu,
+                               "traced_peak": stats.memory.traced_peak if stats.memory is not None else None,
+                               "rss_peak": stats.memory.rss_peak if stats.memory is not None else None,
+                               "counters": stats.counters}
+                       for phase, stats in phases.items()}}
+
+
+# Labels of aoc2024_run_info which describe a run, rather than identify the puzzle part it ran.
+PROMETHEUS_INFO_LABELS = ("input_sha256", "answer", "python")
+
+
+def prometheus_labels(labels: dict[str, Any]) -> str:
+    def escape(value: Any) -> str:
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def prometheus_samples(record: dict) -> dict[tuple[str, str], str]:
+    """Prometheus samples for a record, as a map from (metric name, labels identifying the sample) to the sample
+    line."""
+    run_labels = {"day": record["day"],
+                  "part": record["part"],
+                  "input": record["input"],
+                  "kwargs": ",".join(f"{k}={v}" for k, v in record["kwargs"].items())}
+    samples = {}
+    for phase, phase_record in record["phases"].items():
+        for name, (_, value) in PROMETHEUS_PHASE_METRICS.items():
+            if value(phase_record) is not None:
+                labels = prometheus_labels(run_labels | {"phase": phase})
+                samples[(name, labels)] = f"{name}{labels} {value(phase_record)!r}"
+        for counter, count in (phase_record.get("counters") or {}).items():
+            labels = prometheus_labels(run_labels | {"phase": phase, "counter": counter})
+            samples[(PROMETHEUS_COUNTER_METRIC, labels)] = f"{PROMETHEUS_COUNTER_METRIC}{labels} {count}"
+    labels = prometheus_labels(run_labels)
+    timestamp = datetime.datetime.fromisoformat(record["time"]).timestamp()
+    samples[("aoc2024_run_timestamp_seconds", labels)] = f"aoc2024_run_timestamp_seconds{labels} {timestamp!r}"
+    info_labels = prometheus_labels(run_labels | {k: record[k] for k in PROMETHEUS_INFO_LABELS})
+    samples[("aoc2024_run_info", labels)] = f"aoc2024_run_info{info_labels} 1"
+    return samples
+
+
+def parse_prometheus_samples(text: str) -> dict[tuple[str, str], str]:
+    """Parse the sample lines of a textfile written by update_prometheus_textfile, keyed as by prometheus_samples."""
+    samples = {}
+    for line in text.splitlines():
+        if m := re.fullmatch(r"(?P<name>\w+)(?P<labels>\{.*\}) \S+", line):
+            labels = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', m.group("labels")))
+            # Labels are already escaped, so join them directly rather than with prometheus_labels.
+            key_labels = "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()
+                                        if k not in PROMETHEUS_INFO_LABELS) + "}"
+            samples[(m.group("name"), key_labels)] = line
+    return samples
+
+
+def update_prometheus_textfile(path: Path, record: dict) -> None:
+    """Merge the samples for record into the textfile at path, replacing older samples for the same puzzle phases.
+    The caller must hold a lock, as this reads then rewrites the file."""
+    samples = parse_prometheus_samples(path.read_text()) if path.exists() else {}
+    samples |= prometheus_samples(record)
+
+    lines = []
+    help_texts = {name: help_text for name, (help_text, _) in PROMETHEUS_PHASE_METRICS.items()} | \
+        {PROMETHEUS_COUNTER_METRIC: PROMETHEUS_COUNTER_HELP} | PROMETHEUS_RUN_METRICS
+    for name, help_text in help_texts.items():
+        metric_lines = sorted(line for (sample_name, _), line in samples.items() if sample_name == name)
+        if metric_lines:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", *metric_lines]
+
+    # Write to a temporary file then rename, so the collector never reads a partially written file.
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text("\n".join(lines) + "\n")
+    temp_path.replace(path)
+
+
+def emit(day: int, part: int, input_path: Path, kwargs: dict[str, int | str], answer: Any,
+         phases: dict[str, Any]) -> None:
+    """Export the record of a run, if exporting is enabled."""
+    path = output_path()
+    if path is None:
+        return
+    record = make_record(day, part, input_path, kwargs, answer, phases)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Several worker processes may be exporting at once, so serialise access to the file.
+    with open(path.with_name(f"{path.name}.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if path.suffix == ".prom":
+            update_prometheus_textfile(path, record)
+        else:
+            with open(path, "a") as f:
+                f.write(json.dumps(record) + "\n")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+# Solve many puzzle cases in parallel, using a pool of worker processes.
+# Each worker imports a day module at most once, however many cases it solves for that day.
+# Usage:
+#     python3 aoc2024.py --all             # Both parts of every day, with main puzzle input.
+#     python3 aoc2024.py --all --samples   # Also solve the sample inputs that have answer files.
+#     python3 aoc2024.py --all -2 -j 4     # Only part 2 of every day, using 4 worker processes.
+#     python3 aoc2024.py 16 -2 'inputs/day16_*'              # Part 2 of day 16 for every matching input file.
+#     python3 aoc2024.py 18 -b gen18/ --completion-order     # Print results as they finish, not in input order.
+
+from concurrent.futures import as_completed, Future, ProcessPoolExecutor
+import glob
+from multiprocessing.context import BaseContext
+from pathlib import Path
+import re
+import statistics
+import sys
+from typing import Iterable, Iterator, NamedTuple
+
+import aoc2024
+from common import engines
+from runner import history
+
+
+class CaseResult(NamedTuple):
+    case: aoc2024.PuzzleCase
+    # The answer produced, or the exception raised while trying to solve the case.
+    result: int | str | None | BaseException
+    # None if the case failed, or its answer was taken from the answer cache.
+    timings: aoc2024.PuzzleTimings | None
+
+    @property
+    def correct(self) -> bool | None:
+        """Whether the case was solved with the expected answer, or None if the expected answer isn't known."""
+        if isinstance(self.result, BaseException):
+            return False
+        if self.case.answer is None:
+            return None
+        return self.result == self.case.answer
+
+
+def solve_case(case: aoc2024.PuzzleCase) -> CaseResult:
+    try:
+        result, timings = aoc2024.run_puzzle_cached(case.day, case.input_path, case.part1, **case.extra_args)
+        return CaseResult(case, result, timings)
+    except Exception as e:
+        return CaseResult(case, e, None)
+
+
+def estimated_durations(history_path: Path) -> dict[tuple[int, int, str, str], float]:
+    """Median total time of each (day, part, input, engine) in the latest stored benchmark run that includes it.
+    Records from before engines were recorded were run with the reference."""
+    durations = {}
+    for record in history.load_history(history_path):
+        durations[(record["day"], record["part"], record["input"], record.get("engine", engines.REFERENCE))] = \
+            statistics.median(history.phase_samples(record, "total"))
+    return durations
+
+
+def longest_first(cases: Iterable[aoc2024.PuzzleCase], history_path: Path) -> list[aoc2024.PuzzleCase]:
+    """Order cases by decreasing expected duration, so the slowest cases aren't left until the end.
+    Cases are estimated by the timings of the selected engine, or the reference's if it has none, as parts without an
+    engine of that name are solved with the reference. Cases without past timings are assumed to be slow, and are
+    scheduled first."""
+    durations = estimated_durations(history_path)
+    engine = engines.requested()
+
+    def key(case: aoc2024.PuzzleCase) -> float:
+        input_name = str(case.input_path.relative_to(aoc2024.TOP_DIR)
+                         if case.input_path.is_relative_to(aoc2024.TOP_DIR) else case.input_path)
+        part = (case.day, case.part, input_name)
+        return -durations.get((*part, engine), durations.get((*part, engines.REFERENCE), float("inf")))
+
+    return sorted(cases, key=key)
+
+
+def solve_all(cases: Iterable[aoc2024.PuzzleCase], workers: int | None = None,
+              history_path: Path | None = None, mp_context: BaseContext | None = None) -> Iterator[CaseResult]:
+    """Solve all cases across a pool of worker processes, yielding results as each case finishes.
+    Cases are started longest first, according to the timings stored in history_path. mp_context is the
+    multiprocessing context the workers are started with (default: the platform's default)."""
+    cases = longest_first(cases, history_path if history_path is not None else history.default_history_path())
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        futures: list[Future[CaseResult]] = [executor.submit(solve_case, case) for case in cases]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def batch_inputs(pattern: str) -> list[Path]:
+    """Input files for a batch: the files in pattern if it is a directory, or else the files matching pattern as a glob,
+    except answer files and hidden files. Sorted by path."""
+    paths = Path(pattern).iterdir() if Path(pattern).is_dir() else map(Path, glob.glob(pattern))
+    answer_regex = re.compile(r".+\.answer\d+")
+    return sorted(p for p in paths
+                  if p.is_file() and not p.name.startswith(".") and not answer_regex.fullmatch(p.name))
+
+
+def is_batch(input_arg: str) -> bool:
+    """Whether an input argument names a batch of inputs, rather than a single input file."""
+    return Path(input_arg).is_dir() or glob.has_magic(input_arg)
+
+
+def solve_batch(day: int, cases: list[aoc2024.PuzzleCase], workers: int | None = None,
+                in_order: bool = True) -> Iterator[CaseResult]:
+    """Solve cases for a single day across a pool of worker processes, each of which imports the day's module once
+    when it starts. Yield results in the order of cases if in_order, otherwise as each case finishes."""
+    with ProcessPoolExecutor(max_workers=workers, initializer=aoc2024.import_day, initargs=(day,)) as executor:
+        futures: list[Future[CaseResult]] = [executor.submit(solve_case, case) for case in cases]
+        for future in futures if in_order else as_completed(futures):
+            yield future.result()
+
+
+def format_case_result(r: CaseResult) -> str:
+    mark = {True: "✔", False: "✘", None: " "}[r.correct]
+    if isinstance(r.result, BaseException):
+        return f"{mark} {r.case.name}: failed with {r.result!r}"
+    if r.timings is None:
+        return f"{mark} {r.case.name}: {r.result}  (cached)"
+    phases = r.timings._asdict().items()
+    details = [f"{phase} {stats.memory}" for phase, stats in phases if stats.memory is not None] + \
+        [f"{phase} " + " ".join(f"{name}={count}" for name, count in sorted(stats.counters.items()))
+         for phase, stats in phases if stats.counters]
+    return f"{mark} {r.case.name}: {r.result}  ({r.timings.load.wall + r.timings.solve.wall:.3f} s" + \
+        "".join(f"; {detail}" for detail in details) + ")"
+
+
+def main_all(parts: list[int], include_samples: bool, workers: int | None) -> int:
+    """Solve every day's puzzle parts, printing each result as it finishes. Return the exit status: 1 if any case
+    failed or gave an answer other than the one in its answer file, otherwise 0."""
+    cases = [case for case in aoc2024.find_cases(require_answers=False)
+             if case.part in parts and (include_samples or case.input_path.name == "input")]
+    if not cases:
+        print("No puzzle inputs found.", file=sys.stderr)
+        return 1
+
+    status = 0
+    for r in solve_all(cases, workers):
+        print(format_case_result(r), flush=True)
+        if r.correct is False:
+            status = 1
+    return status
+
+
+def main_batch(day: int, pattern: str, parts: list[int], extra_args: dict[str, int | str], workers: int | None,
+               in_order: bool) -> int:
+    """Solve the given parts of a day for every input in a batch (see batch_inputs), printing one result per line.
+    Extra arguments are only passed to the parts that accept them. Return the exit status: 1 if any case failed,
+    otherwise 0."""
+    input_paths = batch_inputs(pattern)
+    if not input_paths:
+        print(f"No input files match {pattern}.", file=sys.stderr)
+        return 1
+    day_module = aoc2024.import_day(day)
+    part_kwargs = {part: aoc2024.accepted_kwargs(aoc2024.part_function(day_module, part == 1), extra_args)
+                   if len(parts) > 1 else extra_args for part in parts}
+    cases = [aoc2024.PuzzleCase(day, input_path, part == 1, None, part_kwargs[part])
+             for input_path in input_paths for part in parts]
+
+    status = 0
+    for r in solve_batch(day, cases, workers, in_order):
+        print(format_case_result(r), flush=True)
+        if r.correct is False:
+            status = 1
+    return status
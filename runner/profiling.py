@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+# Profile each phase of a puzzle run (loading the input, and solving a part) separately with cProfile.
+# Profiling is enabled when the AOC2024_PROFILE environment variable names an output directory, which the --profile
+# option of aoc2024.py and of `aoc2024.py bench` sets, so it also applies to --all worker processes.
+# A .prof file is written for each phase, named like day16_input_part2.prof, and a summary of the functions with the
+# highest cumulative time is printed to stderr.
+# Usage:
+#     python3 aoc2024.py 16 -2 day16/data/input --profile out/
+#     python3 aoc2024.py 16 -2 day16/data/input --profile out/ --profile-top 30
+#     python3 -m pstats out/day16_input_part2.prof    # Explore a profile interactively.
+#
+# cProfile's per-call overhead distorts the timings of code making many small or recursive calls, so phases can instead
+# be profiled by sampling: a background thread records the phase's call stack at a fixed interval, and the counts of
+# each distinct stack are written in the collapsed stack format read by flame graph tools, one "f1;f2;f3 count" line
+# per stack, outermost call first. Sampling is enabled when the AOC2024_SAMPLE environment variable names an output
+# directory, which the --sample option of aoc2024.py sets, and writes a .folded file for each phase.
+# Usage:
+#     python3 aoc2024.py 19 -2 day19/data/input --sample out/ --sample-interval 2
+#     flamegraph.pl out/day19_input_part2.folded > day19.svg     # Or load the file in speedscope.
+
+import collections
+import cProfile
+import os
+from pathlib import Path
+import pstats
+import sys
+import threading
+from types import CodeType, FrameType
+from typing import Any, Callable
+
+PROFILE_ENV_VAR = "AOC2024_PROFILE"
+PROFILE_TOP_ENV_VAR = "AOC2024_PROFILE_TOP"
+DEFAULT_TOP = 20
+SAMPLE_ENV_VAR = "AOC2024_SAMPLE"
+SAMPLE_INTERVAL_ENV_VAR = "AOC2024_SAMPLE_INTERVAL"
+# Milliseconds. Python only switches between threads every 5 ms by default (see sys.getswitchinterval), so the sampler
+# can't usually sample more often than that while a phase is running pure Python code.
+DEFAULT_SAMPLE_INTERVAL = 5
+TOP_DIR = Path(__file__).resolve().parent.parent
+
+
+def enable(directory: Path, top: int = DEFAULT_TOP) -> None:
+    """Enable profiling for this process, and any worker processes it starts."""
+    os.environ[PROFILE_ENV_VAR] = str(directory)
+    os.environ[PROFILE_TOP_ENV_VAR] = str(top)
+
+
+def output_dir() -> Path | None:
+    """Directory to write profiles to, or None if profiling is disabled."""
+    directory = os.environ.get(PROFILE_ENV_VAR)
+    return Path(directory) if directory else None
+
+
+def run_profiled(output_path: Path, function: Callable, *args, **kwargs) -> Any:
+    """Call function under cProfile, write the profile to output_path, and print a summary to stderr."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(function, *args, **kwargs)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(output_path)
+
+    top = int(os.environ.get(PROFILE_TOP_ENV_VAR, DEFAULT_TOP))
+    if top > 0:
+        print(f"Profile of {output_path.stem}, written to {output_path}:", file=sys.stderr)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    return result
+
+
+def enable_sampling(directory: Path, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+    """Enable sampling profiling for this process, and any worker processes it starts. interval is in milliseconds."""
+    os.environ[SAMPLE_ENV_VAR] = str(directory)
+    os.environ[SAMPLE_INTERVAL_ENV_VAR] = str(interval)
+
+
+def sample_output_dir() -> Path | None:
+    """Directory to write sampled stacks to, or None if sampling is disabled."""
+    directory = os.environ.get(SAMPLE_ENV_VAR)
+    return Path(directory) if directory else None
+
+
+def frame_name(code: CodeType) -> str:
+    path = Path(code.co_filename)
+    if path.is_relative_to(TOP_DIR):
+        path = path.relative_to(TOP_DIR)
+    # Semicolons separate frames in the collapsed format. The count follows the last space, so others are allowed.
+    return f"{code.co_qualname} ({path}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler(threading.Thread):
+    """A background thread counting the distinct call stacks of another thread, sampled every interval seconds.
+    Only frames called from a frame running root_code are recorded, and only while there is one."""
+
+    def __init__(self, thread_id: int, interval: float, root_code: CodeType):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root_code = root_code
+        self.stacks: collections.Counter[tuple[CodeType, ...]] = collections.Counter()
+        self.stopping = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopping.wait(self.interval):
+            frame: FrameType | None = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame.f_code is not self.root_code:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            if frame is not None and stack:
+                # Store code objects rather than names, so each sample costs little; names are only made once per
+                # distinct stack.
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def collapsed(self) -> list[str]:
+        return [f"{';'.join(frame_name(code) for code in stack)} {count}" for stack, count in self.stacks.items()]
+
+    def top_self(self, n: int) -> list[tuple[str, int]]:
+        """The n functions found running most often, and the number of samples in which each was running."""
+        self_counts: collections.Counter[CodeType] = collections.Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+        return [(frame_name(code), count) for code, count in self_counts.most_common(n)]
+
+
+def _call_sampled(function: Callable, args: tuple, kwargs: dict) -> Any:
+    # The root of the stacks recorded by run_sampled.
+    return function(*args, **kwargs)
+
+
+def run_sampled(output_path: Path, function: Callable, *args, **kwargs) -> Any:
+    """Call function while sampling its call stack, write the collapsed stacks to output_path, and print a summary to
+    stderr."""
+    interval = float(os.environ.get(SAMPLE_INTERVAL_ENV_VAR, DEFAULT_SAMPLE_INTERVAL)) / 1000
+    sampler = StackSampler(threading.get_ident(), interval, _call_sampled.__code__)
+    sampler.start()
+    try:
+        return _call_sampled(function, args, kwargs)
+    finally:
+        sampler.stopping.set()
+        sampler.join()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text("".join(line + "\n" for line in sampler.collapsed()))
+
+        total = sum(sampler.stacks.values())
+        top = int(os.environ.get(PROFILE_TOP_ENV_VAR, DEFAULT_TOP))
+        print(f"Sampled {total} stacks of {output_path.stem}, written to {output_path}", file=sys.stderr)
+        for name, count in sampler.top_self(top):
+            print(f"{count / total:>7.1%} {name}", file=sys.stderr)
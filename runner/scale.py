@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+# Measure how puzzle solutions scale with the size of their input.
+# Each part is run on a geometric series of generated inputs (see runner/gen.py), and its time and memory use are
+# fitted against the input length n (in bytes) as c * n^k, by a least squares fit of log(measure) against log(n).
+# A part whose estimated time or memory exponent k is over the threshold is flagged as superlinear.
+# Usage:
+#     python3 aoc2024.py scale                          # All days, both parts.
+#     python3 aoc2024.py scale 1 5 9 -2 --memory        # Also fit the peak memory used while solving.
+#     python3 aoc2024.py scale 22 --start 100 --factor 4 --steps 5 --max-time 30
+
+import argparse
+import json
+import math
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+from typing import NamedTuple
+
+import aoc2024
+from runner import gen, memory
+
+
+class ScalePoint(NamedTuple):
+    size: int
+    # Length of the generated input in bytes.
+    n: int
+    answer: int | str | None
+    # Minimum over the repeats, in seconds.
+    load_time: float
+    solve_time: float
+    # Traced peak of the solve phase in bytes, if memory was measured.
+    solve_memory: int | None
+
+
+class ScaleResult(NamedTuple):
+    day: int
+    part: int
+    points: list[ScalePoint]
+    time_exponent: float | None
+    memory_exponent: float | None
+    # Why measurement stopped before the largest size, if it did.
+    stopped: str | None
+
+
+def fit_exponent(ns: list[int], values: list[float], min_value: float) -> float | None:
+    """Estimate k such that values are proportional to ns^k. Values below min_value are too small to measure
+    reliably, so are left out of the fit. Return None if fewer than two points remain."""
+    points = [(math.log(n), math.log(v)) for n, v in zip(ns, values) if v >= min_value]
+    if len(points) < 2 or len({x for x, _ in points}) < 2:
+        return None
+    return statistics.linear_regression(*zip(*points)).slope
+
+
+def scale_sizes(day: int, start: int | None, factor: float, steps: int) -> list[int]:
+    if start is None:
+        start = max(1, gen.import_generator(day).DEFAULT_SIZE // 4)
+    return sorted({max(1, round(start * factor ** i)) for i in range(steps)})
+
+
+def measure_part(day: int, part: int, sizes: list[int], seed: int, repeats: int, measure_memory: bool,
+                 max_time: float, min_time: float, extra_args: dict[str, int | str]) -> ScaleResult:
+    points: list[ScalePoint] = []
+    stopped = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in sizes:
+            input_path = Path(temp_dir) / f"gen{size}"
+            input_path.write_text(gen.generate_input(day, size, seed))
+            n = input_path.stat().st_size
+            if points and n <= points[-1].n:
+                # Generators have minimum sizes, so small sizes may all give the same input.
+                continue
+            kwargs = gen.generated_extra_args(day, size, part) | extra_args
+            try:
+                runs = [aoc2024.run_puzzle_timed(day, input_path, part == 1, **kwargs)]
+                if runs[0][1].load.wall + runs[0][1].solve.wall <= max_time:
+                    runs += [aoc2024.run_puzzle_timed(day, input_path, part == 1, **kwargs) for _ in range(repeats - 1)]
+                solve_memory = None
+                if measure_memory:
+                    # Measure memory in a separate run, as tracing allocations slows the solution down.
+                    memory.enable()
+                    try:
+                        solve_memory = aoc2024.run_puzzle_timed(day, input_path, part == 1,
+                                                                **kwargs)[1].solve.memory.traced_peak
+                    finally:
+                        memory.disable()
+            except Exception as e:
+                stopped = f"size {size} failed with {e!r}"
+                break
+            points.append(ScalePoint(size, n, runs[0][0], min(t.load.wall for _, t in runs),
+                                     min(t.solve.wall for _, t in runs), solve_memory))
+            if points[-1].load_time + points[-1].solve_time > max_time:
+                if size != sizes[-1]:
+                    stopped = f"size {size} took longer than {max_time} s"
+                break
+
+    ns = [p.n for p in points]
+    time_exponent = fit_exponent(ns, [p.load_time + p.solve_time for p in points], min_time)
+    # Allocations of under 64 KiB are dominated by constant overheads.
+    memory_exponent = fit_exponent(ns, [p.solve_memory for p in points], 64 * 1024) if measure_memory else None
+    return ScaleResult(day, part, points, time_exponent, memory_exponent, stopped)
+
+
+def superlinear(r: ScaleResult, threshold: float) -> bool:
+    return any(k is not None and k > threshold for k in [r.time_exponent, r.memory_exponent])
+
+
+def format_result(r: ScaleResult, threshold: float) -> str:
+    lines = [f"day{r.day:02} part{r.part}:",
+             f"  {'size':>9} {'n (bytes)':>11} {'load ms':>10} {'solve ms':>10} {'solve MiB':>10}"]
+    for p in r.points:
+        solve_memory = f"{p.solve_memory / memory.MIB:>10.2f}" if p.solve_memory is not None else f"{'-':>10}"
+        lines.append(f"  {p.size:>9} {p.n:>11} {p.load_time * 1000:>10.3f} {p.solve_time * 1000:>10.3f} "
+                     f"{solve_memory}")
+    if r.stopped:
+        lines.append(f"  Stopped: {r.stopped}.")
+
+    def format_exponent(k: float | None) -> str:
+        return "too fast to fit" if k is None else f"n^{k:.2f}"
+    summary = f"  Time ~ {format_exponent(r.time_exponent)}"
+    if r.memory_exponent is not None or any(p.solve_memory is not None for p in r.points):
+        summary += f", memory ~ {format_exponent(r.memory_exponent)}"
+    if superlinear(r, threshold):
+        summary += f"  SUPERLINEAR (exponent over {threshold})"
+    lines.append(summary)
+    return "\n".join(lines)
+
+
+def result_json(r: ScaleResult) -> dict:
+    return {"day": r.day,
+            "part": r.part,
+            "time_exponent": r.time_exponent,
+            "memory_exponent": r.memory_exponent,
+            "stopped": r.stopped,
+            "points": [p._asdict() for p in r.points]}
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="aoc2024.py scale",
+                                     description="Estimate how the time and memory used by puzzle solutions grow with "
+                                                 "input size, using generated inputs.")
+    parser.add_argument("days", type=int, nargs="*", help="Days to measure. Defaults to all days.")
+    parser.add_argument("-1", "--part1", action="store_true", help="Only measure part 1")
+    parser.add_argument("-2", "--part2", action="store_true", help="Only measure part 2")
+    parser.add_argument("--start", type=int,
+                        help="Smallest generator size (default: a quarter of the size of the real input)")
+    parser.add_argument("--factor", type=float, default=2, help="Ratio between successive sizes (default: 2)")
+    parser.add_argument("--steps", type=int, default=6, help="Number of sizes (default: 6)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the generators (default: 0)")
+    parser.add_argument("-n", "--repeats", type=int, default=3,
+                        help="Number of timed runs at each size, of which the fastest is used (default: 3)")
+    parser.add_argument("--memory", action="store_true",
+                        help="Also measure and fit the peak memory used solving, in an extra run at each size")
+    parser.add_argument("--max-time", type=float, default=10,
+                        help="Don't try larger sizes after a run takes longer than this many seconds (default: 10)")
+    parser.add_argument("--min-time", type=float, default=0.001,
+                        help="Leave runs faster than this many seconds out of the fit, as they are dominated by noise "
+                             "(default: 0.001)")
+    parser.add_argument("-t", "--threshold", type=float, default=1.3,
+                        help="Flag parts whose time or memory exponent is over this (default: 1.3)")
+    parser.add_argument("-e", "--extra-arg", type=str,
+                        help="An extra argument for the puzzles, in the form arg_name=value",
+                        action="append", default=[])
+    parser.add_argument("--json", type=str, metavar="PATH",
+                        help="Also write results as JSON to PATH, or to stdout instead of the report if PATH is '-'")
+    args = parser.parse_args(argv)
+
+    if args.repeats < 1 or args.steps < 1 or args.factor <= 1:
+        sys.exit("--repeats and --steps must be at least 1, and --factor more than 1.")
+    extra_args = aoc2024.parse_extra_args(args.extra_arg)
+    parts = [1, 2] if args.part1 == args.part2 else [1] if args.part1 else [2]
+
+    results = []
+    for day in args.days or aoc2024.puzzle_days():
+        sizes = scale_sizes(day, args.start, args.factor, args.steps)
+        for part in parts:
+            r = measure_part(day, part, sizes, args.seed, args.repeats, args.memory, args.max_time, args.min_time,
+                             extra_args)
+            results.append(r)
+            if args.json != "-":
+                print(format_result(r, args.threshold), flush=True)
+
+    if args.json is not None:
+        # default=str converts integer-like answers, such as sympy's Integer.
+        text = json.dumps([result_json(r) for r in results], indent=2, default=str)
+        if args.json == "-":
+            print(text)
+        else:
+            with open(args.json, "w") as f:
+                f.write(text)
+
+    flagged = [r for r in results if superlinear(r, args.threshold)]
+    if flagged and args.json != "-":
+        print("Superlinear: " + ", ".join(f"day{r.day:02} part{r.part}" for r in flagged))
+    sys.exit(1 if flagged else 0)
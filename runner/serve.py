@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+# A long-running puzzle server, so repeated runs don't pay for starting Python and importing solutions each time.
+# The server imports every day's solution at startup, then answers requests from clients (see runner/client.py) over a
+# Unix socket. With --keep-inputs it also keeps recently parsed inputs in memory, reparsing an input file only once it
+# changes, so a repeated request costs little more than the solve itself.
+# Requests are handled one at a time, so timings aren't disturbed by other solves.
+# The protocol is one JSON object per line in each direction. A request is either
+#     {"day": 16, "part": 2, "input": "/absolute/path/to/input", "kwargs": {}}
+# answered by {"answer": ..., "timings": {"load": {"wall": ..., "cpu": ..., "memory": ..., "counters": ...},
+#               "solve": {...}}}, or
+#     {"command": "ping" | "stats" | "shutdown"}
+# Any request that fails is answered by {"error": "description"}.
+# Usage:
+#     python3 aoc2024.py serve --keep-inputs &
+#     python3 aoc2024.py client 16 -2 day16/data/input --timings
+#     python3 aoc2024.py client --shutdown
+
+import argparse
+import json
+import operator
+import os
+from pathlib import Path
+import signal
+import socket
+import socketserver
+import sys
+import time
+from typing import Any
+
+import aoc2024
+from common import counters, memo
+from runner import cache, memory, metrics
+
+DEFAULT_SOCKET = aoc2024.TOP_DIR / ".aoc_serve.sock"
+DEFAULT_MAX_INPUTS = 32
+
+
+def timings_json(timings: aoc2024.PuzzleTimings | None) -> dict | None:
+    if timings is None:
+        return None
+    return {phase: {"wall": stats.wall,
+                    "cpu": stats.cpu,
+                    "memory": stats.memory._asdict() if stats.memory is not None else None,
+                    "counters": stats.counters}
+            for phase, stats in timings._asdict().items()}
+
+
+def answer_json(answer: Any) -> int | str | None:
+    if isinstance(answer, int | str | None):
+        return answer
+    # Some solutions return integer-like types, such as sympy's Integer.
+    try:
+        return operator.index(answer)
+    except TypeError:
+        return str(answer)
+
+
+class PuzzleServer(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: Path):
+        super().__init__(str(socket_path), PuzzleRequestHandler)
+        self.socket_path = socket_path
+        self.start_time = time.time()
+        self.solved = 0
+        self.stopping = False
+
+    def solve(self, request: dict) -> dict:
+        day = int(request["day"])
+        part = int(request["part"])
+        input_path = Path(request["input"])
+        if day not in aoc2024.puzzle_days():
+            raise ValueError(f"no solution directory for day {day}")
+        if part not in (1, 2):
+            raise ValueError(f"part must be 1 or 2, not {part}")
+        if not input_path.is_absolute():
+            raise ValueError("input path must be absolute, as the server may have a different working directory")
+        answer, timings = aoc2024.run_puzzle_cached(day, input_path, part == 1, **request.get("kwargs", {}))
+        self.solved += 1
+        return {"answer": answer_json(answer), "timings": timings_json(timings)}
+
+    def respond(self, request: dict) -> dict:
+        match request.get("command"):
+            case None:
+                return self.solve(request)
+            case "ping":
+                return {"pid": os.getpid()}
+            case "stats":
+                input_cache = cache.memory_input_cache()
+                return {"pid": os.getpid(),
+                        "uptime": time.time() - self.start_time,
+                        "solved": self.solved,
+                        "cached_inputs": len(input_cache.entries) if input_cache is not None else None}
+            case "shutdown":
+                self.stopping = True
+                return {"pid": os.getpid()}
+            case command:
+                raise ValueError(f"unknown command {command!r}")
+
+
+class PuzzleRequestHandler(socketserver.StreamRequestHandler):
+    server: PuzzleServer
+
+    def handle(self) -> None:
+        # A client may send several requests over one connection, each answered before the next is read.
+        for line in self.rfile:
+            try:
+                response = self.server.respond(json.loads(line))
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+            if self.server.stopping:
+                return
+
+
+def remove_stale_socket(socket_path: Path) -> None:
+    """Remove a socket file left behind by a server that is no longer running. Exits if a server is still using it."""
+    if not socket_path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(str(socket_path))
+        except ConnectionRefusedError:
+            socket_path.unlink()
+            return
+    sys.exit(f"A server is already listening on {socket_path}.")
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="aoc2024.py serve",
+                                     description="Keep solutions imported, and solve puzzles sent by "
+                                                 "'aoc2024.py client' over a Unix socket.")
+    parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET,
+                        help="Path of the socket to listen on (default: .aoc_serve.sock)")
+    parser.add_argument("--keep-inputs", action="store_true",
+                        help="Keep parsed inputs in memory, only parsing an input file again once it changes")
+    parser.add_argument("--max-inputs", type=int, default=DEFAULT_MAX_INPUTS,
+                        help="With --keep-inputs, the number of parsed inputs to keep, evicting the least recently "
+                             f"used (default: {DEFAULT_MAX_INPUTS})")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse answers stored in the answer cache, and store new answers in it")
+    parser.add_argument("--memory", action="store_true",
+                        help="Measure the peak memory used loading the input and solving each part")
+    parser.add_argument("--counters", action="store_true",
+                        help="Count the work solutions do while loading the input and solving each part")
+    parser.add_argument("--persist-memos", action="store_true",
+                        help="Keep solutions' persistent memos between requests, so repeated solves reuse their work")
+    parser.add_argument("--metrics", type=Path, metavar="PATH",
+                        help="Record each puzzle run to PATH, as with 'aoc2024.py --metrics'")
+    args = parser.parse_args(argv)
+
+    if args.keep_inputs:
+        cache.enable_memory_inputs(args.max_inputs)
+    if args.cache:
+        cache.enable(cache.CACHE_ENV_VAR)
+    if args.memory:
+        memory.enable()
+    if args.counters:
+        counters.enable()
+    if args.persist_memos:
+        memo.enable_persistence()
+    if args.metrics is not None:
+        metrics.enable(args.metrics)
+    for day in aoc2024.puzzle_days():
+        aoc2024.import_day(day)
+
+    remove_stale_socket(args.socket)
+    # Exit cleanly on SIGTERM too, so the socket file is removed.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit())
+    with PuzzleServer(args.socket) as server:
+        try:
+            print(f"Listening on {args.socket}", file=sys.stderr, flush=True)
+            while not server.stopping:
+                server.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            args.socket.unlink(missing_ok=True)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+# Watch the solution and data files, and re-run the puzzle cases affected by each change.
+# The dayNN/ and common/ directories are polled for modified files. After a change, each case's answer cache key (see
+# runner/cache.py), which hashes the day's solution source, the input file's contents, the part and the extra arguments,
+# is recomputed. Only cases whose key hasn't been run before are solved again, across a fresh pool of worker processes;
+# the rest reuse their earlier results. Workers are started with spawn rather than forked, so they import the current
+# source of the solutions and of common/, instead of inheriting modules the watcher imported before a change.
+# A change to an answer file just rechecks the cases it covers.
+# Each result of a case that was run is shown with the change in its time since the case last ran.
+# Usage:
+#     python3 aoc2024.py watch                 # Every day's samples with answer files, and main inputs.
+#     python3 aoc2024.py watch 16 20 -2        # Only part 2 of days 16 and 20.
+
+import argparse
+import multiprocessing
+from pathlib import Path
+import sys
+import time
+from typing import NamedTuple
+
+import aoc2024
+from common import engines
+from runner import cache, pool
+
+
+class WatchedResult(NamedTuple):
+    result: int | str | None | BaseException
+    # Total time of the load and solve phases, or None if the case failed or its answer came from the answer cache.
+    time: float | None
+
+
+def snapshot(days: list[int]) -> dict[Path, int]:
+    """Modification times of every file that could affect the given days' cases."""
+    paths = [p for day in days for p in (aoc2024.TOP_DIR / f"day{day:02}").rglob("*")] + \
+        list((aoc2024.TOP_DIR / "common").glob("*.py"))
+    result = {}
+    for path in paths:
+        try:
+            if path.is_file() and "__pycache__" not in path.parts:
+                result[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            # Removed since it was listed, e.g. an editor's temporary file.
+            pass
+    return result
+
+
+def case_key(case: aoc2024.PuzzleCase) -> str | None:
+    try:
+        # Day modules aren't imported here, so they are only ever imported from their current source, by workers. The
+        # requested engine is used whether or not the part has it, which only makes the key more specific.
+        return cache.answer_key(case.day, case.input_path, case.part1, case.extra_args, engines.requested())
+    except FileNotFoundError:
+        return None
+
+
+def format_time_change(new: float | None, old: float | None) -> str:
+    if new is None:
+        return ""
+    text = f"  ({new:.3f} s"
+    if old is not None and old > 0:
+        text += f", {new - old:+.3f} s, {(new - old) / old:+.1%}"
+    return text + ")"
+
+
+def format_result(case: aoc2024.PuzzleCase, r: WatchedResult, ran: bool, previous_time: float | None) -> str:
+    """Describe a case's result. If it wasn't just run, its result is one stored from an earlier run of the same
+    source and input."""
+    correct = pool.CaseResult(case, r.result, None).correct
+    mark = {True: "✔", False: "✘", None: " "}[correct]
+    if isinstance(r.result, BaseException):
+        return f"{mark} {case.name}: failed with {r.result!r}" + ("" if ran else "  (cached)")
+    if not ran:
+        return f"{mark} {case.name}: {r.result}  (cached)"
+    return f"{mark} {case.name}: {r.result}{format_time_change(r.time, previous_time)}"
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="aoc2024.py watch",
+                                     description="Re-run puzzle cases whenever their solution, input or answer "
+                                                 "files change.")
+    parser.add_argument("days", type=int, nargs="*", help="Days to watch. Defaults to all days.")
+    parser.add_argument("-1", "--part1", action="store_true", help="Only run part 1")
+    parser.add_argument("-2", "--part2", action="store_true", help="Only run part 2")
+    parser.add_argument("--interval", type=float, default=0.5,
+                        help="Seconds between checks for changed files (default: 0.5)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Number of worker processes (default: number of CPUs)")
+    args = parser.parse_args(argv)
+
+    days = args.days or aoc2024.puzzle_days()
+    parts = [1, 2] if args.part1 == args.part2 else [1] if args.part1 else [2]
+    # Results of each case key already run.
+    results: dict[str, WatchedResult] = {}
+    # The key and expected answer each case was last shown with, and the time of its last run.
+    shown: dict[str, tuple[str | None, int | str | None]] = {}
+    last_times: dict[str, float] = {}
+    last_snapshot = None
+
+    try:
+        while True:
+            current_snapshot = snapshot(days)
+            if current_snapshot == last_snapshot:
+                time.sleep(args.interval)
+                continue
+            last_snapshot = current_snapshot
+
+            cases = [case for case in aoc2024.find_cases(days, require_answers=False) if case.part in parts]
+            keys = {case.name: case_key(case) for case in cases}
+            affected = [case for case in cases if shown.get(case.name) != (keys[case.name], case.answer)]
+            if not affected:
+                continue
+            to_run = [case for case in affected if keys[case.name] is not None and keys[case.name] not in results]
+            print(f"[{time.strftime('%H:%M:%S')}] {len(affected)} affected, running {len(to_run)} of "
+                  f"{len(cases)} cases", flush=True)
+
+            start = time.perf_counter()
+            for r in pool.solve_all(to_run, args.jobs, mp_context=multiprocessing.get_context("spawn")):
+                results[keys[r.case.name]] = WatchedResult(
+                    r.result, r.timings.load.wall + r.timings.solve.wall if r.timings is not None else None)
+            for case in affected:
+                key = keys[case.name]
+                if key is None:
+                    continue
+                r = results[key]
+                ran = case in to_run
+                print(format_result(case, r, ran, last_times.get(case.name)), flush=True)
+                shown[case.name] = (key, case.answer)
+                if ran and r.time is not None:
+                    last_times[case.name] = r.time
+
+            failing = sum(pool.CaseResult(case, results[keys[case.name]].result, None).correct is False
+                          for case in cases if keys[case.name] in results)
+            print(f"{failing} of {len(cases)} cases failing. Took {time.perf_counter() - start:.3f} s.\n", flush=True)
+    except KeyboardInterrupt:
+        sys.exit()
@@ -7,57 +7,80 @@
 #     pytest -k day01             # Run all tests from day01
 #     pytest -k "day01 and part1" # Run tests for first part of day01
 #     pytest -k main              # Only run actual puzzles, not test inputs
+#     pytest -k test_engine       # Only check alternative engines (see common/engines.py) against the answers
 
 import aoc2024
+from common import engines
+from runner import cache, memory
 
 from pathlib import Path
-import re
 
-
-def try_convert_int(s: str) -> int | str:
-    """If s contains only digits, return the integer it represents, otherwise just return s."""
-    if s.isdigit():
-        return int(s)
-    return s
+import pytest
 
 
 def pytest_generate_tests(metafunc):
     if metafunc.function == test:
-        top_dir = Path(__file__).resolve().parent
-        day_regex = re.compile(r"day(\d{2})")
-        sample_regex = re.compile(r"sample\d+")
-
-        # Dictionary from test_identifier to tuple of test arguments.
-        tests: dict[str, tuple[int, Path, bool, int | str, dict[str, int | str]]] = {}
-
-        for day_dir in sorted(top_dir.iterdir()):
-            if day_match := day_regex.fullmatch(day_dir.name):
-                day = int(day_match.group(1))
-                data_dir = day_dir / "data"
-
-                test_inputs = sorted([p for p in data_dir.iterdir() if sample_regex.fullmatch(p.name)]) + \
-                    [data_dir / "input"]
-                for test_input in test_inputs:
-                    for part in [1, 2]:
-                        answer_file = test_input.parent / f"{test_input.name}.answer{part}"
-                        if answer_file.exists():
-                            input_name = "main" if test_input.name == "input" else test_input.name
-                            with open(answer_file) as f:
-                                for answer_line in f.readlines():
-                                    answer_line = answer_line.strip()
-                                    if ": " in answer_line:
-                                        extra_args = {extra_arg.split("=")[0]: try_convert_int(extra_arg.split("=")[1]) for extra_arg in answer_line.split(": ")[0].split(",")}
-                                        answer = answer_line.split(": ")[1]
-                                    else:
-                                        extra_args = {}
-                                        answer = answer_line
-                                    answer = try_convert_int(answer)
-                                    tests[f"day{day:02} part{part}: {input_name}" + (" " + str(extra_args) if extra_args else "")] = (day, test_input, part == 1, answer, extra_args)
-
-        arguments = tests.items()
-        metafunc.parametrize(["day", "input_path", "part1", "answer", "extra_args"], [arg[1] for arg in arguments],
-            ids=[arg[0] for arg in arguments])
-
-
-def test(day: int, input_path: Path, part1: bool, answer: int | str, extra_args: dict[str, int | str]) -> None:
-    assert aoc2024.run_puzzle(day, input_path, part1, **extra_args) == answer
+        cases = aoc2024.find_cases()
+        metafunc.parametrize(["day", "input_path", "part1", "answer", "extra_args", "budget"],
+                             [(case.day, case.input_path, case.part1, case.answer, case.extra_args, case.budget)
+                              for case in cases],
+                             ids=[case.name for case in cases])
+    if metafunc.function == test_engine:
+        params = []
+        for case in aoc2024.find_cases():
+            try:
+                day_module = aoc2024.import_day(case.day)
+            except ImportError as e:
+                # Only this day's tests should fail, which test reports, rather than the whole file failing to collect.
+                params.append(pytest.param(case.day, case.input_path, case.part1, case.answer, case.extra_args, None,
+                                           id=f"{case.name}, engines",
+                                           marks=pytest.mark.skip(reason=f"day {case.day} can't be imported: {e}")))
+                continue
+            params += [pytest.param(case.day, case.input_path, case.part1, case.answer, case.extra_args, engine,
+                                    id=f"{case.name}, {engine} engine")
+                       for engine in engines.implementations(day_module, case.part1) if engine != engines.REFERENCE]
+        metafunc.parametrize(["day", "input_path", "part1", "answer", "extra_args", "engine"], params)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def parse_inputs_once():
+    """Parse each input file only once per session, sharing the parsed input (and any precomputation shared through
+    common/precompute.py) between all tests of that input."""
+    cache.enable_memory_inputs(len({(case.day, case.input_path) for case in aoc2024.find_cases()}))
+    yield
+    cache.disable_memory_inputs()
+
+
+def test(day: int, input_path: Path, part1: bool, answer: int | str, extra_args: dict[str, int | str],
+         budget: aoc2024.Budget | None) -> None:
+    if budget is None:
+        assert aoc2024.run_puzzle(day, input_path, part1, **extra_args) == answer
+        return
+    result, problems = aoc2024.run_puzzle_budgeted(day, input_path, part1, budget, **extra_args)
+    assert result == answer
+    assert not problems, "; ".join(problems)
+
+
+def test_load_over_memory_budget(monkeypatch: pytest.MonkeyPatch) -> None:
+    # The load of a budgeted case is measured, even when an earlier test of the same input has already parsed it.
+    monkeypatch.delenv(cache.CACHE_ENV_VAR, raising=False)
+    input_path = aoc2024.day_input_path(1, "sample1")
+    aoc2024.run_puzzle(1, input_path, True)
+    day_module = aoc2024.import_day(1)
+    load = day_module.load
+
+    def wasteful_load(path: Path):
+        scratch = bytearray(4 * memory.MIB)
+        del scratch
+        return load(path)
+
+    monkeypatch.setattr(day_module, "load", wasteful_load)
+    _, problems = aoc2024.run_puzzle_budgeted(1, input_path, True, aoc2024.Budget(None, 2 * memory.MIB))
+    assert problems and "over its budget of 2 MiB" in problems[0]
+
+
+def test_engine(day: int, input_path: Path, part1: bool, answer: int | str, extra_args: dict[str, int | str],
+                engine: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Bypasses the answer cache, so the engine is always run, even if its answer is stored.
+    monkeypatch.setenv(engines.ENGINE_ENV_VAR, engine)
+    assert aoc2024.run_puzzle_timed(day, input_path, part1, **extra_args)[0] == answer